@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the export formats on synthetic scan results.
+
+Compares the streaming JSON exporter with NDJSON, plain and block-compressed,
+and the indexed SQLite export by write time and output size:
+
+    python dev-tools/benchmarks/export_formats.py --records 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.exporters import ZSTANDARD_AVAILABLE, create_writer
+from core.scan_session import FolderRecord
+
+
+def synthetic_records(count: int) -> list:
+    """Empty folders spread over parents of 50, with plausible metadata."""
+    now = time.time_ns()
+    return [
+        FolderRecord(
+            Path(f"/data/share/project_{number // 5000}/build_{number // 50}/output_{number}"),
+            3, now - number * 1_000_000_000, 1000, 1_000_000 + number
+        )
+        for number in range(count)
+    ]
+
+
+def benchmark(records: list, format_type: str, output_dir: Path) -> tuple:
+    """Write all records in one format; returns (seconds, bytes)."""
+    output_file = output_dir / f"results.{format_type}"
+    summary = {'empty_folders': len(records), 'total_folders': len(records) * 2}
+    
+    started = time.perf_counter()
+    writer = create_writer(str(output_file), format_type)
+    writer.open()
+    for record in records:
+        writer.write(record)
+    writer.close(summary)
+    elapsed = time.perf_counter() - started
+    
+    return elapsed, output_file.stat().st_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FolderPulse export formats")
+    parser.add_argument("--records", type=int, default=200_000, help="Number of synthetic results")
+    args = parser.parse_args()
+    
+    formats = ['json', 'ndjson', 'ndjson.gz', 'sqlite']
+    if ZSTANDARD_AVAILABLE:
+        formats.append('ndjson.zst')
+    
+    records = synthetic_records(args.records)
+    # Path caches its string form; render it up front so no format pays for it
+    for record in records:
+        str(record.path)
+    print(f"{args.records} records, {os.cpu_count()} CPU(s)\n")
+    print(f"{'format':<12} {'seconds':>8} {'records/s':>12} {'MB':>9} {'vs json':>8}")
+    
+    with tempfile.TemporaryDirectory(prefix="folderpulse_bench_") as output_dir:
+        baseline = None
+        for format_type in formats:
+            elapsed, size = benchmark(records, format_type, Path(output_dir))
+            baseline = baseline or elapsed
+            print(
+                f"{format_type:<12} {elapsed:>8.2f} {len(records) / elapsed:>12.0f} "
+                f"{size / 1e6:>9.1f} {elapsed / baseline:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
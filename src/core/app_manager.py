@@ -81,7 +81,28 @@ class AppManager:
                     "node_modules",
                     ".DS_Store",
                     "Thumbs.db"
-                ]
+                ],
+                "max_scan_time": None,
+                "max_directories": None,
+                "max_memory_mb": None,
+                "traversal_order": "breadth_first",
+                "max_frontier": 100000,
+                "engine": "auto",
+                "workers": None
+            },
+            "deletion": {
+                "workers": 8,
+                "max_attempts": 8,
+                "retry_base_delay": 1.0,
+                "retry_max_delay": 300.0
+            },
+            "io": {
+                "max_ops_per_second": None,
+                "max_concurrency": None,
+                "latency_target_ms": None
+            },
+            "paths": {
+                "cache_directory": "cache"
             }
         }
     
@@ -101,9 +122,24 @@ class AppManager:
     
     def init_components(self):
         """Initialize application components."""
-        # This is where you would initialize various app components
-        # like file monitors, data processors, web services, etc.
-        pass
+        from .io_governor import IOGovernor
+        from .deletion_queue import DeletionQueue
+        
+        cache_dir = Path(self.get_config("paths.cache_directory", "cache"))
+        
+        # One governor shared by everything that touches the filesystem
+        governor = IOGovernor.from_config(self.get_config("io"))
+        self.components['io_governor'] = governor
+        
+        self.components['deletion_queue'] = DeletionQueue(
+            str(cache_dir / "deletion_queue.ndjson"),
+            workers=self.get_config("deletion.workers", 8),
+            max_attempts=self.get_config("deletion.max_attempts", 8),
+            base_delay=self.get_config("deletion.retry_base_delay", 1.0),
+            max_delay=self.get_config("deletion.retry_max_delay", 300.0),
+            governor=governor,
+            journal_dir=str(cache_dir / "journal")
+        )
     
     def get_config(self, key: str, default: Any = None) -> Any:
         """Get configuration value."""
@@ -136,14 +172,17 @@ class AppManager:
         if not self.running:
             return
         
-        # Start any background processing here
-        pass
+        deletion_queue = self.components.get('deletion_queue')
+        if deletion_queue is not None:
+            deletion_queue.start()
     
     def stop_background_tasks(self):
         """Stop background tasks."""
         self.running = False
-        # Stop any background processing here
-        pass
+        
+        deletion_queue = self.components.get('deletion_queue')
+        if deletion_queue is not None:
+            deletion_queue.stop()
     
     def cleanup(self):
         """Cleanup resources."""
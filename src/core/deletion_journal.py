@@ -0,0 +1,266 @@
+"""
+Deletion Journal
+Append-only, group-committed record of deleted folders, with bulk undo.
+"""
+
+import os
+import json
+import logging
+import threading
+import time
+from json.encoder import encode_basestring_ascii
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = '.ndjson'
+UNDONE_SUFFIX = '.undone'
+DEFAULT_BATCH_SIZE = 1000
+
+# Journals this process is still appending to, by absolute path
+_open_journals: Set[str] = set()
+_open_journals_lock = threading.Lock()
+
+RECORD_FORMAT = (
+    '{"path": %s, "mode": %d, "uid": %d, "gid": %d, '
+    '"atime_ns": %d, "mtime_ns": %d, "deleted_at": %r}'
+)
+
+
+class DeletionJournal:
+    """
+    NDJSON journal of one deletion run.
+    
+    The first line is a header; every further line describes one removed
+    folder (path, permission bits, owner and timestamps). Records are
+    buffered and written in batches, each batch followed by a single fsync,
+    so the cost of durability is shared by many deletions.
+    """
+    
+    def __init__(self, journal_file: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Open a new journal.
+        
+        Args:
+            journal_file: File to append to (created with its directory)
+            batch_size: Records per group commit
+        """
+        self.logger = logging.getLogger(__name__)
+        self.journal_file = Path(journal_file)
+        self.batch_size = max(1, batch_size)
+        self.records_written = 0
+        self.commits = 0
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.journal_file, 'a', encoding='utf-8')
+        with _open_journals_lock:
+            _open_journals.add(os.path.abspath(self.journal_file))
+        self._write_lines([json.dumps({'journal': JOURNAL_VERSION, 'created': time.time()})])
+    
+    @classmethod
+    def create(cls, journal_dir: str, batch_size: int = DEFAULT_BATCH_SIZE) -> 'DeletionJournal':
+        """Start a journal with a fresh, time-ordered name inside journal_dir."""
+        name = f"deletions-{time.time_ns()}-{os.getpid()}{JOURNAL_SUFFIX}"
+        return cls(str(Path(journal_dir) / name), batch_size)
+    
+    def record(self, path: Path, stat_result: os.stat_result):
+        """
+        Record a deleted folder.
+        
+        Args:
+            path: Folder that was removed
+            stat_result: lstat of the folder taken just before removing it
+        """
+        # Formatted by hand: only the path needs JSON escaping (ASCII-escaped,
+        # so undecodable file names survive the round trip)
+        line = RECORD_FORMAT % (
+            encode_basestring_ascii(os.fspath(path)),
+            stat_result.st_mode & 0o7777,
+            stat_result.st_uid,
+            stat_result.st_gid,
+            stat_result.st_atime_ns,
+            stat_result.st_mtime_ns,
+            time.time()
+        )
+        
+        batch = None
+        with self._buffer_lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size:
+                batch, self._buffer = self._buffer, []
+        
+        if batch:
+            self._write_lines(batch)
+    
+    def flush(self):
+        """Commit all buffered records."""
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._write_lines(batch)
+    
+    def close(self):
+        """Commit remaining records and close the file."""
+        self.flush()
+        with self._write_lock:
+            if not self._file.closed:
+                self._file.close()
+        with _open_journals_lock:
+            _open_journals.discard(os.path.abspath(self.journal_file))
+    
+    def _write_lines(self, lines: List[str]):
+        """Append lines and make them durable with one fsync."""
+        with self._write_lock:
+            self._file.write('\n'.join(lines) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.commits += 1
+            self.records_written += len(lines)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def read_journal(journal_file: str) -> List[dict]:
+    """
+    Read the folder records of a journal.
+    
+    A torn last line (from a crash mid-write) is ignored.
+    
+    Returns:
+        List of record dictionaries, in journal order
+    """
+    records = []
+    with open(journal_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if 'path' in record:
+                records.append(record)
+    return records
+
+
+def latest_journal(journal_dir: str) -> Optional[Path]:
+    """
+    Find the most recent journal that has not been undone yet.
+    
+    Journals still open in this process (e.g. the deletion queue's) are
+    skipped, since their deletions may not be finished.
+    """
+    directory = Path(journal_dir)
+    if not directory.is_dir():
+        return None
+    with _open_journals_lock:
+        open_journals = set(_open_journals)
+    # Names embed a nanosecond timestamp, so they sort chronologically
+    journals = sorted(
+        journal for journal in directory.glob(f"deletions-*{JOURNAL_SUFFIX}")
+        if os.path.abspath(journal) not in open_journals
+    )
+    return journals[-1] if journals else None
+
+
+class JournalUndo:
+    """
+    Recreate the folders of a deletion journal.
+    
+    Folders are created top-down, one depth level at a time with each level
+    in parallel, so parents always exist before their children. Metadata is
+    applied afterwards bottom-up, so creating a child never disturbs the
+    timestamps just restored on its parent, and read-only parents are only
+    made read-only once their children exist.
+    """
+    
+    def __init__(self, workers: int = 8):
+        """
+        Initialize the undo.
+        
+        Args:
+            workers: Maximum parallel filesystem operations
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers)
+    
+    def undo(self, journal_file: str) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Recreate every folder recorded in a journal.
+        
+        When everything was restored the journal is renamed with an '.undone'
+        suffix, so the same run is not undone twice.
+        
+        Args:
+            journal_file: Journal to undo
+        
+        Returns:
+            Tuple of (restored_folders, failed_restorations_with_errors)
+        """
+        records = read_journal(journal_file)
+        levels: Dict[int, List[dict]] = {}
+        for record in records:
+            levels.setdefault(len(Path(record['path']).parts), []).append(record)
+        
+        restored: List[Path] = []
+        failed: List[Tuple[Path, str]] = []
+        created: List[dict] = []
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="folderpulse-undo") as executor:
+            for depth in sorted(levels):
+                for record, error in zip(levels[depth], executor.map(self._create, levels[depth])):
+                    if error:
+                        failed.append((Path(record['path']), error))
+                    else:
+                        created.append(record)
+            
+            by_depth: Dict[int, List[dict]] = {}
+            for record in created:
+                by_depth.setdefault(len(Path(record['path']).parts), []).append(record)
+            for depth in sorted(by_depth, reverse=True):
+                for record, error in zip(by_depth[depth], executor.map(self._apply_metadata, by_depth[depth])):
+                    if error:
+                        failed.append((Path(record['path']), error))
+                    else:
+                        restored.append(Path(record['path']))
+        
+        if not failed:
+            os.replace(journal_file, str(journal_file) + UNDONE_SUFFIX)
+        
+        self.logger.info(f"Restored {len(restored)} folders from {journal_file}, {len(failed)} failed")
+        return restored, failed
+    
+    def _create(self, record: dict) -> Optional[str]:
+        """Create one folder; returns an error message on failure."""
+        try:
+            os.mkdir(record['path'])
+        except FileExistsError:
+            pass
+        except OSError as e:
+            self.logger.error(f"Failed to restore {record['path']}: {e}")
+            return str(e)
+        return None
+    
+    def _apply_metadata(self, record: dict) -> Optional[str]:
+        """Restore owner, permission bits and timestamps of one folder."""
+        path = record['path']
+        try:
+            if hasattr(os, 'chown'):
+                try:
+                    os.chown(path, record['uid'], record['gid'])
+                except PermissionError:
+                    # Only privileged users may give folders away
+                    pass
+            os.chmod(path, record['mode'])
+            os.utime(path, ns=(record['atime_ns'], record['mtime_ns']))
+        except OSError as e:
+            self.logger.error(f"Failed to restore metadata of {path}: {e}")
+            return str(e)
+        return None
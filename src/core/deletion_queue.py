@@ -0,0 +1,406 @@
+"""
+Deletion Queue
+Persistent background deletion with retries for transient failures.
+"""
+
+import os
+import json
+import errno
+import heapq
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .deletion_journal import DeletionJournal
+from .folder_deleter import BulkDeleter, DEFAULT_DELETE_WORKERS
+from .io_governor import IOGovernor
+
+
+# Errors that usually clear up on their own (directory briefly in use,
+# briefly non-empty, locked by a scanner or antivirus, flaky share); anything
+# else (ENOTDIR, EROFS, EPERM, ...) is treated as permanent
+TRANSIENT_ERRNOS = {
+    errno.EBUSY, errno.EACCES, errno.ENOTEMPTY, errno.EEXIST, errno.EAGAIN,
+    errno.EINTR, errno.ETIMEDOUT, errno.EIO, errno.ESTALE
+}
+
+DEFAULT_MAX_ATTEMPTS = 8
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 300.0
+DEFAULT_BATCH_SIZE = 1000
+
+# Rewrite the queue file once it holds this many times more events than live entries
+COMPACT_RATIO = 4
+
+
+class DeletionQueue:
+    """
+    Delete folders in the background, retrying transient failures.
+    
+    Submitted folders are persisted in an append-only NDJSON event log and
+    deleted in batches by a worker thread using the parallel BulkDeleter.
+    Failures are classified by errno: transient ones are retried with
+    exponential backoff and jitter until max_attempts is reached, all others
+    fail immediately. The log is replayed on start, so pending work
+    survives restarts, and compacted when it grows too large.
+    """
+    
+    def __init__(
+        self,
+        queue_file: str,
+        workers: int = DEFAULT_DELETE_WORKERS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        governor: Optional[IOGovernor] = None,
+        journal_dir: Optional[str] = None
+    ):
+        """
+        Initialize the queue and replay its persisted state.
+        
+        Args:
+            queue_file: NDJSON event log of the queue
+            workers: Parallel deletions per batch
+            max_attempts: Attempts before a transient failure becomes permanent
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound of the backoff, in seconds
+            batch_size: Folders handed to the deleter at once
+            governor: I/O governor deletions go through
+            journal_dir: Where deletions are journaled for undo (None = not journaled)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.queue_file = Path(queue_file)
+        self.workers = workers
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.batch_size = max(1, batch_size)
+        self.governor = governor
+        self.journal_dir = journal_dir
+        
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._idle = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._journal: Optional[DeletionJournal] = None
+        self._journal_lock = threading.Lock()  # Held while a batch uses the journal
+        self._random = random.Random()
+        
+        self._inbox: List[str] = []
+        self._entries: Dict[str, dict] = {}  # path -> {'attempts', 'next', 'error', 'errno'}
+        self._schedule: List[Tuple[float, str]] = []  # heap of (next_attempt, path)
+        self._failed: Dict[str, dict] = {}
+        self._completed = 0
+        self._event_count = 0
+        self._log = None
+        
+        self._load()
+    
+    def submit(self, folders: List[Path]) -> int:
+        """
+        Hand folders over for deletion and return immediately.
+        
+        Args:
+            folders: Folders to delete
+        
+        Returns:
+            Number of folders accepted
+        """
+        paths = [str(Path(folder)) for folder in folders]
+        with self._lock:
+            self._inbox.extend(paths)
+            self._idle.clear()
+        self._wakeup.set()
+        return len(paths)
+    
+    def start(self):
+        """Start the background worker."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="folderpulse-deletion-queue", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Deletion queue started with {len(self._entries)} pending folders")
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background worker, keeping pending work for the next start."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            self._persist_inbox()
+            self._close_log()
+        self.rotate_journal()
+    
+    def rotate_journal(self):
+        """
+        Close the current journal so its deletions can be undone.
+        
+        Waits for a batch in progress; the next batch starts a new journal.
+        """
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+    
+    def cleanup(self):
+        """Stop the queue (component cleanup hook)."""
+        self.stop()
+    
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is due or inbound; retries scheduled later may remain."""
+        return self._idle.wait(timeout)
+    
+    def get_status(self) -> dict:
+        """
+        Get the state of the queue.
+        
+        Returns:
+            Dictionary with pending, retrying, completed and failed counts
+        """
+        with self._lock:
+            pending = len(self._entries) + len(self._inbox)
+            retrying = sum(1 for entry in self._entries.values() if entry['attempts'])
+            return {
+                'pending': pending,
+                'retrying': retrying,
+                'completed': self._completed,
+                'failed': len(self._failed),
+                'running': self._thread is not None and self._thread.is_alive()
+            }
+    
+    def get_failures(self) -> List[Tuple[Path, str]]:
+        """Get the folders the queue gave up on, with their last error."""
+        with self._lock:
+            return [(Path(path), f"{info['error']} ({info['reason']})") for path, info in self._failed.items()]
+    
+    def clear_failures(self):
+        """Forget permanent failures."""
+        with self._lock:
+            for path in self._failed:
+                self._append_event({'op': 'forget', 'path': path})
+            self._failed.clear()
+            self._flush_log()
+    
+    def _run(self):
+        """Worker loop: persist new work, delete what is due, then sleep until the next retry."""
+        while not self._stop.is_set():
+            with self._lock:
+                self._persist_inbox()
+                batch = self._due_batch()
+                if not batch and not self._inbox:
+                    delay = self._schedule[0][0] - time.time() if self._schedule else None
+                    self._idle.set()
+                else:
+                    delay = 0
+            
+            if batch:
+                self._delete_batch(batch)
+                continue
+            
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+    
+    def _due_batch(self) -> List[str]:
+        """Pop up to batch_size folders whose next attempt is due (lock held)."""
+        now = time.time()
+        batch = []
+        while self._schedule and len(batch) < self.batch_size and self._schedule[0][0] <= now:
+            next_attempt, path = heapq.heappop(self._schedule)
+            entry = self._entries.get(path)
+            if entry is not None and entry['next'] == next_attempt:
+                batch.append(path)
+        return batch
+    
+    def _delete_batch(self, batch: List[str]):
+        """Delete one batch and schedule, finish or fail each folder."""
+        with self._journal_lock:
+            if self.journal_dir is not None and self._journal is None:
+                self._journal = DeletionJournal.create(self.journal_dir)
+        
+            deleter = BulkDeleter(
+                workers=self.workers,
+                journal=self._journal,
+                governor=self.governor,
+                failure_log_level=logging.DEBUG  # Retries are expected; outcomes are logged per batch
+            )
+            deleted, failed = deleter.delete([Path(path) for path in batch], dry_run=False)
+            if self._journal is not None:
+                self._journal.flush()
+        
+        failures = {str(folder): error for folder, error in failed}
+        now = time.time()
+        retried = 0
+        
+        with self._lock:
+            for path in batch:
+                entry = self._entries[path]
+                if path not in failures:
+                    # Deleted, or already gone
+                    del self._entries[path]
+                    self._completed += 1
+                    self._append_event({'op': 'done', 'path': path})
+                    continue
+                
+                code = deleter.error_codes.get(Path(path))
+                entry['attempts'] += 1
+                entry['error'] = failures[path]
+                entry['errno'] = code
+                
+                if code not in TRANSIENT_ERRNOS or entry['attempts'] >= self.max_attempts:
+                    reason = 'retries exhausted' if code in TRANSIENT_ERRNOS else 'permanent'
+                    del self._entries[path]
+                    self._failed[path] = {
+                        'error': entry['error'], 'errno': code, 'reason': reason, 'attempts': entry['attempts']
+                    }
+                    self._append_event({
+                        'op': 'failed', 'path': path, 'error': entry['error'], 'errno': code, 'reason': reason,
+                        'attempts': entry['attempts']
+                    })
+                    self.logger.warning(f"Giving up on {path} ({reason}, {entry['attempts']} attempts): {entry['error']}")
+                else:
+                    entry['next'] = now + self._backoff(entry['attempts'])
+                    heapq.heappush(self._schedule, (entry['next'], path))
+                    self._append_event({
+                        'op': 'retry', 'path': path, 'attempts': entry['attempts'],
+                        'next': entry['next'], 'error': entry['error'], 'errno': code
+                    })
+                    retried += 1
+            
+            self._flush_log()
+            self._maybe_compact()
+        
+        self.logger.info(
+            f"Deletion queue batch: {len(batch) - len(failures)} done, {retried} to retry, "
+            f"{len(failures) - retried} failed permanently"
+        )
+    
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter: half fixed, half random."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay / 2 + self._random.uniform(0, delay / 2)
+    
+    # Persistence
+    
+    def _load(self):
+        """Replay the event log."""
+        if not self.queue_file.exists():
+            return
+        
+        now = time.time()
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write at the end
+                    self._event_count += 1
+                    self._apply(event, now)
+        except OSError as e:
+            self.logger.warning(f"Failed to load deletion queue: {e}")
+            return
+        
+        self._schedule = [(entry['next'], path) for path, entry in self._entries.items()]
+        heapq.heapify(self._schedule)
+        if self._entries:
+            self.logger.info(f"Recovered {len(self._entries)} pending deletions")
+    
+    def _apply(self, event: dict, now: float):
+        """Apply one replayed event to the in-memory state."""
+        op = event.get('op')
+        path = event.get('path')
+        if op == 'add':
+            self._entries.setdefault(path, {'attempts': 0, 'next': now, 'error': None, 'errno': None})
+            self._failed.pop(path, None)
+        elif op == 'retry' and path in self._entries:
+            self._entries[path].update(
+                attempts=event['attempts'], next=event['next'], error=event.get('error'), errno=event.get('errno')
+            )
+        elif op == 'done':
+            if self._entries.pop(path, None) is not None:
+                self._completed += 1
+        elif op == 'failed':
+            entry = self._entries.pop(path, None)
+            attempts = event.get('attempts')
+            if attempts is None:
+                # Logs written before failures recorded their attempts
+                attempts = entry['attempts'] + 1 if entry else 0
+            self._failed[path] = {
+                'error': event.get('error'),
+                'errno': event.get('errno'),
+                'reason': event.get('reason'),
+                'attempts': attempts
+            }
+        elif op == 'forget':
+            self._failed.pop(path, None)
+    
+    def _persist_inbox(self):
+        """Move submitted folders into the persistent queue (lock held)."""
+        if not self._inbox:
+            return
+        
+        now = time.time()
+        for path in self._inbox:
+            if path in self._entries:
+                continue
+            self._entries[path] = {'attempts': 0, 'next': now, 'error': None, 'errno': None}
+            self._failed.pop(path, None)
+            heapq.heappush(self._schedule, (now, path))
+            self._append_event({'op': 'add', 'path': path})
+        self._inbox = []
+        self._flush_log()
+    
+    def _append_event(self, event: dict):
+        """Append one event to the log (lock held)."""
+        if self._log is None:
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.queue_file, 'a', encoding='utf-8')
+        self._log.write(json.dumps(event) + '\n')
+        self._event_count += 1
+    
+    def _flush_log(self):
+        """Make appended events durable (lock held)."""
+        if self._log is not None:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+    
+    def _close_log(self):
+        """Close the log file (lock held)."""
+        if self._log is not None:
+            self._flush_log()
+            self._log.close()
+            self._log = None
+    
+    def _maybe_compact(self):
+        """Rewrite the log as a snapshot once most of it is history (lock held)."""
+        live = len(self._entries) + len(self._failed)
+        if self._event_count < COMPACT_RATIO * max(live, self.batch_size):
+            return
+        
+        self._close_log()
+        temp_file = self.queue_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for path, entry in self._entries.items():
+                f.write(json.dumps({'op': 'add', 'path': path}) + '\n')
+                if entry['attempts']:
+                    f.write(json.dumps({
+                        'op': 'retry', 'path': path, 'attempts': entry['attempts'],
+                        'next': entry['next'], 'error': entry['error'], 'errno': entry['errno']
+                    }) + '\n')
+            for path, info in self._failed.items():
+                f.write(json.dumps({
+                    'op': 'failed', 'path': path, 'error': info['error'], 'errno': info['errno'], 'reason': info['reason'],
+                    'attempts': info['attempts']
+                }) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.queue_file)
+        self._event_count = live + sum(1 for entry in self._entries.values() if entry['attempts'])
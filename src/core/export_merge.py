@@ -0,0 +1,464 @@
+"""
+Export Merge
+Combine exports from many scans or hosts into one sorted, deduplicated export.
+"""
+
+import os
+import csv
+import gzip
+import heapq
+import io
+import json
+import logging
+import pickle
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from utils.system_info import owner_uid
+
+from .exporters import create_writer, format_from_path
+from .scan_session import FolderRecord
+
+
+# Records sorted in memory per run; bounds the memory of the whole merge
+DEFAULT_RUN_SIZE = 250_000
+
+# Runs merged at once; more runs are merged in several passes
+MAX_MERGE_FANIN = 128
+
+# Records pickled together in a run file
+RUN_CHUNK_SIZE = 4096
+
+MANIFEST_SUFFIX = '.manifest.json'
+
+# Rows are ordered by path only; the metadata columns may hold None
+_BY_PATH = itemgetter(0)
+
+
+class ExportReader:
+    """
+    Read the records of an export back, in any format FolderPulse writes.
+    
+    Iterating yields FolderRecords one at a time without loading the file;
+    rows() yields plain (path, depth, mtime_ns, uid, inode, ctime_ns)
+    tuples, which is much cheaper when the paths are only compared.
+    Formats that only store paths (TXT, JSON) yield depth 0 and no
+    metadata. CSV has depth, times to the second and owner names, which are
+    mapped back to ids on this host, but no inode. The scan summary, where
+    the format has one, is available as .summary once iteration has
+    finished.
+    """
+    
+    def __init__(self, input_file: str, format_type: Optional[str] = None):
+        self.input_path = Path(input_file)
+        self.format_type = (format_type or format_from_path(input_file, default='')).lower()
+        self.summary: Optional[dict] = None
+        if not self.format_type:
+            raise ValueError(f"Cannot tell the export format of {input_file}")
+    
+    def __iter__(self) -> Iterator[FolderRecord]:
+        for path, *fields in self.rows():
+            yield FolderRecord(Path(path), *fields)
+    
+    def rows(self) -> Iterator[tuple]:
+        """Yield (path, depth, mtime_ns, uid, inode, ctime_ns) tuples with string paths."""
+        readers = {
+            'txt': self._read_txt,
+            'csv': self._read_csv,
+            'json': self._read_json,
+            'ndjson': self._read_ndjson,
+            'ndjson.gz': self._read_ndjson,
+            'ndjson.zst': self._read_ndjson,
+            'parquet': self._read_parquet,
+            'sqlite': self._read_sqlite
+        }
+        reader = readers.get(self.format_type)
+        if reader is None:
+            raise ValueError(f"Unsupported format: {self.format_type}")
+        return reader()
+    
+    def _read_txt(self) -> Iterator[tuple]:
+        summary = {}
+        in_folders = False
+        with open(self.input_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if in_folders:
+                    if not line:
+                        in_folders = False
+                    elif not line.startswith('---'):
+                        yield (line, 0, None, None, None, None)
+                elif line == "EMPTY FOLDERS:":
+                    in_folders = True
+                elif line.startswith("Total folders scanned: "):
+                    summary['total_folders'] = int(line.rsplit(' ', 1)[1])
+                elif line.startswith("Hidden folders: "):
+                    summary['hidden_folders'] = int(line.rsplit(' ', 1)[1])
+        self.summary = summary or None
+    
+    def _read_csv(self) -> Iterator[tuple]:
+        with open(self.input_path, 'r', encoding='utf-8', newline='') as f:
+            rows = csv.reader(f)
+            next(rows, None)  # Header
+            for row in rows:
+                if not row:
+                    continue
+                # Depth, Modified, Changed and Owner were added after the
+                # first CSV layout, which only had Path, Type and Size
+                if len(row) < 7:
+                    yield (row[0], int(row[3]) if len(row) > 3 else 0, None, None, None, None)
+                    continue
+                yield (
+                    row[0], int(row[3]), self._csv_time(row[4]), owner_uid(row[6]), None, self._csv_time(row[5])
+                )
+    
+    @staticmethod
+    def _csv_time(value: str) -> Optional[int]:
+        # Written in local time by CsvWriter, to the second
+        if not value:
+            return None
+        return int(datetime.fromisoformat(value).timestamp()) * 1_000_000_000
+    
+    def _read_json(self) -> Iterator[tuple]:
+        # Walks the top-level object by hand so the folder array is streamed
+        # element by element whatever its position or indentation
+        decoder = json.JSONDecoder()
+        with open(self.input_path, 'r', encoding='utf-8') as f:
+            stream = _JsonStream(f, decoder)
+            stream.expect('{')
+            while not stream.accept('}'):
+                stream.accept(',')
+                key = stream.value()
+                stream.expect(':')
+                if key != 'empty_folders':
+                    value = stream.value()
+                    if key == 'scan_summary':
+                        self.summary = value
+                    continue
+                stream.expect('[')
+                while not stream.accept(']'):
+                    stream.accept(',')
+                    yield (stream.value(), 0, None, None, None, None)
+    
+    def _read_ndjson(self) -> Iterator[tuple]:
+        with _open_text(self.input_path, self.format_type) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if 'scan_summary' in item:
+                    self.summary = item['scan_summary']
+                    continue
+                yield (
+                    item['path'], item.get('depth', 0),
+                    item.get('mtime_ns'), item.get('uid'), item.get('inode'), item.get('ctime_ns')
+                )
+    
+    def _read_parquet(self) -> Iterator[tuple]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet exports requires pyarrow (pip install pyarrow)")
+        parquet_file = pq.ParquetFile(str(self.input_path))
+        # The summary is in the footer when it was only known at close
+        metadata = parquet_file.metadata.metadata or {}
+        if b'folderpulse.scan_summary' in metadata:
+            self.summary = json.loads(metadata[b'folderpulse.scan_summary'])
+        # Exports written before ctime was recorded lack that column
+        names = ['path', 'depth', 'mtime', 'uid', 'inode']
+        has_ctime = 'ctime' in parquet_file.schema_arrow.names
+        for batch in parquet_file.iter_batches(columns=names + ['ctime'] if has_ctime else names):
+            columns = [
+                batch.column(0).to_pylist(),
+                batch.column(1).to_pylist(),
+                batch.column(2).cast('int64').to_pylist(),
+                batch.column(3).to_pylist(),
+                batch.column(4).to_pylist(),
+                batch.column(5).cast('int64').to_pylist() if has_ctime else [None] * batch.num_rows
+            ]
+            yield from zip(*columns)
+    
+    def _read_sqlite(self) -> Iterator[tuple]:
+        connection = sqlite3.connect(f"file:{self.input_path}?mode=ro", uri=True)
+        try:
+            summary = {
+                key: json.loads(value)
+                for key, value in connection.execute("SELECT key, value FROM scan_summary")
+            }
+            self.summary = summary or None
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(folders)")]
+            ctime = 'ctime_ns' if 'ctime_ns' in columns else 'NULL'
+            yield from connection.execute(f"SELECT path, depth, mtime_ns, uid, inode, {ctime} FROM folders")
+        finally:
+            connection.close()
+
+
+class _JsonStream:
+    """Token-level reading of a JSON document from a text file, in chunks."""
+    
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, f, decoder: json.JSONDecoder):
+        self._file = f
+        self._decoder = decoder
+        self._buffer = ''
+        self._position = 0
+    
+    def _skip_whitespace(self) -> bool:
+        """Move to the next non-blank character; False at end of file."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position].isspace():
+                self._position += 1
+            if self._position < len(self._buffer):
+                return True
+            if not self._fill():
+                return False
+    
+    def _fill(self) -> bool:
+        chunk = self._file.read(self.CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+    
+    def accept(self, token: str) -> bool:
+        if self._skip_whitespace() and self._buffer[self._position] == token:
+            self._position += 1
+            return True
+        return False
+    
+    def expect(self, token: str):
+        if not self.accept(token):
+            raise ValueError(f"Malformed JSON export: expected '{token}'")
+    
+    def value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if not self._fill():
+                    raise
+                continue
+            # A number could still continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._position = end
+            return value
+
+
+def _open_text(path: Path, format_type: str):
+    """Open a plain or compressed NDJSON export for reading text."""
+    if format_type == 'ndjson.gz':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if format_type == 'ndjson.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading zstd exports requires zstandard (pip install zstandard)")
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def expand_inputs(inputs: List[str]) -> Tuple[List[str], List[dict]]:
+    """
+    Resolve manifests of partitioned exports into their shard files.
+    
+    Returns:
+        Tuple of (export_files, summaries_taken_from_manifests)
+    """
+    files: List[str] = []
+    summaries: List[dict] = []
+    for input_file in inputs:
+        if not str(input_file).endswith(MANIFEST_SUFFIX):
+            files.append(str(input_file))
+            continue
+        with open(input_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        directory = Path(input_file).parent
+        files.extend(str(directory / shard['file']) for shard in manifest['shards'])
+        if manifest.get('scan_summary'):
+            summaries.append(manifest['scan_summary'])
+    return files, summaries
+
+
+class ExportMerger:
+    """
+    Merge many exports into one sorted, deduplicated export.
+    
+    Records from all inputs are cut into sorted runs of run_size records,
+    spilled to temporary files, and combined with a k-way heap merge, in
+    several passes when there are more than MAX_MERGE_FANIN runs. Memory is
+    bounded by the run size whatever the number or size of the inputs,
+    and at most MAX_MERGE_FANIN run files are open at once.
+    
+    Folders are ordered by path; of several records with the same path the
+    first one carrying metadata is kept. The summary of the merged export
+    is recomputed: empty_folders counts unique folders, and the counters
+    of the input summaries are added up.
+    """
+    
+    SUMMED_COUNTERS = ('total_folders', 'hidden_folders', 'scan_time')
+    OPTIONAL_COUNTERS = ('directories_visited', 'unreadable_directories')
+    
+    def __init__(self, run_size: int = DEFAULT_RUN_SIZE, temp_dir: Optional[str] = None):
+        """
+        Args:
+            run_size: Records sorted in memory at a time
+            temp_dir: Where run files are spilled (None = system default)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.run_size = max(1, run_size)
+        self.temp_dir = temp_dir
+        self.stats = {}
+    
+    def merge(
+        self,
+        inputs: List[str],
+        output_file: str,
+        format_type: Optional[str] = None,
+        **partitioning
+    ) -> dict:
+        """
+        Merge exports into one.
+        
+        Args:
+            inputs: Export files of any supported format, or manifests of
+                partitioned exports
+            output_file: Merged export to write
+            format_type: Output format (None = taken from the file name)
+            **partitioning: max_rows, max_bytes or subtree_root, as for
+                create_writer()
+        
+        Returns:
+            Summary of the merged export
+        """
+        files, summaries = expand_inputs(inputs)
+        work_dir = tempfile.mkdtemp(prefix="folderpulse_merge_", dir=self.temp_dir)
+        try:
+            runs, read, file_summaries = self._make_runs(files, work_dir)
+            summaries.extend(file_summaries)
+            while len(runs) > MAX_MERGE_FANIN:
+                runs = self._merge_pass(runs, work_dir)
+            
+            writer = create_writer(output_file, format_type or format_from_path(output_file), **partitioning)
+            writer.open()
+            unique = 0
+            summary = None
+            try:
+                rows = heapq.merge(*(self._read_run(run) for run in runs), key=_BY_PATH)
+                for record in self._deduplicate(rows):
+                    writer.write(record)
+                    unique += 1
+                summary = self._summary(summaries, len(files), read, unique)
+            finally:
+                writer.close(summary)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        self.stats = {'inputs': len(files), 'records_read': read, 'unique': unique, 'runs': len(runs)}
+        self.logger.info(
+            f"Merged {read} records from {len(files)} exports into {unique} unique folders: {output_file}"
+        )
+        return summary
+    
+    def _make_runs(self, files: List[str], work_dir: str) -> Tuple[List[str], int, List[dict]]:
+        """Read every input and spill sorted runs."""
+        runs: List[str] = []
+        summaries: List[dict] = []
+        buffer: List[tuple] = []
+        read = 0
+        
+        for input_file in files:
+            reader = ExportReader(input_file)
+            for row in reader.rows():
+                buffer.append(row)
+                if len(buffer) >= self.run_size:
+                    read += len(buffer)
+                    runs.append(self._spill(buffer, work_dir, len(runs)))
+                    buffer = []
+            if reader.summary:
+                summaries.append(reader.summary)
+        
+        if buffer:
+            read += len(buffer)
+            runs.append(self._spill(buffer, work_dir, len(runs)))
+        return runs, read, summaries
+    
+    def _spill(self, rows: List[tuple], work_dir: str, number: int) -> str:
+        rows.sort(key=_BY_PATH)
+        run_file = os.path.join(work_dir, f"run-{number:06d}")
+        with open(run_file, 'wb') as f:
+            for start in range(0, len(rows), RUN_CHUNK_SIZE):
+                pickle.dump(rows[start:start + RUN_CHUNK_SIZE], f, protocol=pickle.HIGHEST_PROTOCOL)
+        return run_file
+    
+    def _merge_pass(self, runs: List[str], work_dir: str) -> List[str]:
+        """Merge groups of runs into fewer, longer runs."""
+        merged = []
+        for start in range(0, len(runs), MAX_MERGE_FANIN):
+            group = runs[start:start + MAX_MERGE_FANIN]
+            run_file = os.path.join(work_dir, f"pass-{len(runs)}-{start:06d}")
+            with open(run_file, 'wb') as f:
+                chunk = []
+                for row in heapq.merge(*(self._read_run(run) for run in group), key=_BY_PATH):
+                    chunk.append(row)
+                    if len(chunk) >= RUN_CHUNK_SIZE:
+                        pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        chunk = []
+                if chunk:
+                    pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for run in group:
+                os.unlink(run)
+            merged.append(run_file)
+        return merged
+    
+    @staticmethod
+    def _read_run(run_file: str) -> Iterator[tuple]:
+        # Run files are written by this process only
+        with open(run_file, 'rb') as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                yield from chunk
+    
+    @staticmethod
+    def _deduplicate(rows: Iterator[tuple]) -> Iterator[FolderRecord]:
+        """Collapse sorted rows with the same path, preferring rows with metadata."""
+        current = None
+        for row in rows:
+            if current is not None and row[0] == current[0]:
+                if current[2] is None and row[2] is not None:
+                    current = row
+                continue
+            if current is not None:
+                yield FolderRecord(Path(current[0]), *current[1:])
+            current = row
+        if current is not None:
+            yield FolderRecord(Path(current[0]), *current[1:])
+    
+    def _summary(self, summaries: List[dict], inputs: int, read: int, unique: int) -> dict:
+        summary = {
+            'empty_folders': unique,
+            'duplicates_removed': read - unique,
+            'merged_exports': inputs
+        }
+        # Inputs without a summary (CSV) count as zero for the main counters
+        for counter in self.SUMMED_COUNTERS:
+            summary[counter] = sum(item.get(counter) or 0 for item in summaries)
+        for counter in self.OPTIONAL_COUNTERS:
+            values = [item[counter] for item in summaries if counter in item]
+            if values:
+                summary[counter] = sum(values)
+        return summary
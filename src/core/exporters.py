@@ -0,0 +1,893 @@
+"""
+Exporters
+Incremental TXT, CSV and JSON writers that can follow a running scan.
+"""
+
+import os
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from utils.system_info import owner_name
+
+from .scan_session import FolderRecord, ScanSession
+
+# Parquet export needs pyarrow, which is optional
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# zstd compression needs zstandard, which is optional
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+
+# Buffer of each output file; writes reach the disk in chunks of this size
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Records formatted before they are handed to the file in one write call
+RECORD_BATCH_SIZE = 4096
+
+# Rows per Parquet row group; also the most rows held in memory at once
+PARQUET_ROW_GROUP_SIZE = 128 * 1024
+
+# Rows per SQLite transaction; a handful of large ones keeps inserts fast
+SQLITE_TRANSACTION_ROWS = 500_000
+SQLITE_PAGE_SIZE = 65536
+
+# Subtree shards kept open at the same time when partitioning by subtree
+MAX_OPEN_SHARDS = 32
+
+# Compression threads per NDJSON export, and levels chosen for throughput
+COMPRESSION_WORKERS = min(4, os.cpu_count() or 1)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class ResultWriter:
+    """
+    Base class of the export formats.
+    
+    A writer is opened once, receives records one at a time and is closed
+    with the scan summary. Records are formatted into a small batch and
+    written with a single call per batch into a large file buffer, so memory
+    stays constant no matter how many records pass through. When the summary
+    is already known at open time (exporting a finished scan) formats that
+    carry one write it first; otherwise it is written when closing.
+    """
+    
+    # Whether records must carry folder metadata (mtime, owner, inode)
+    needs_metadata = False
+    
+    def __init__(self, output_file: str):
+        self.output_path = Path(output_file)
+        self.records_written = 0
+        self.bytes_written = 0  # Approximate output size so far
+        self._file = None
+        self._batch: List[str] = []
+        self._summary_written = False
+    
+    def open(self, summary: Optional[dict] = None):
+        """
+        Create the output file and write the header.
+        
+        Args:
+            summary: Scan summary, if the scan has already finished
+        """
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(
+            self.output_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE
+        )
+        self._file.write(self._header(summary))
+        self._summary_written = summary is not None
+    
+    def write(self, record: FolderRecord):
+        """Add one empty folder."""
+        self._batch.append(self._format(record))
+        if len(self._batch) >= RECORD_BATCH_SIZE:
+            self._write_batch()
+    
+    def close(self, summary: Optional[dict] = None):
+        """
+        Write the remaining records and the footer, then close the file.
+        
+        Args:
+            summary: Final scan summary (ignored if written at open time)
+        """
+        if self._file is None:
+            return
+        try:
+            self._write_batch()
+            self._file.write(self._footer(None if self._summary_written else summary))
+        finally:
+            self._file.close()
+            self._file = None
+    
+    def _write_batch(self):
+        if self._batch:
+            text = ''.join(self._batch)
+            self._file.write(text)
+            self.records_written += len(self._batch)
+            self.bytes_written += len(text)
+            self._batch.clear()
+    
+    def _header(self, summary: Optional[dict]) -> str:
+        return ''
+    
+    def _format(self, record: FolderRecord) -> str:
+        raise NotImplementedError
+    
+    def _footer(self, summary: Optional[dict]) -> str:
+        return ''
+
+
+class TxtWriter(ResultWriter):
+    """Human readable report: summary and one folder per line."""
+    
+    def _header(self, summary: Optional[dict]) -> str:
+        header = "FolderPulse - Empty Folder Scan Results\n" + "=" * 50 + "\n\n"
+        if summary is not None:
+            header += self._summary_text(summary)
+        return header + "EMPTY FOLDERS:\n" + "-" * 20 + "\n"
+    
+    def _format(self, record: FolderRecord) -> str:
+        return f"{record.path}\n"
+    
+    def _footer(self, summary: Optional[dict]) -> str:
+        return "\n" + self._summary_text(summary) if summary is not None else ''
+    
+    @staticmethod
+    def _summary_text(summary: dict) -> str:
+        text = "SCAN SUMMARY:\n"
+        text += f"Total folders scanned: {summary['total_folders']}\n"
+        text += f"Empty folders found: {summary['empty_folders']}\n"
+        text += f"Hidden folders: {summary['hidden_folders']}\n"
+        text += f"Scan time: {summary['scan_time']:.2f} seconds\n"
+        if summary.get('budget_exhausted'):
+            text += (
+                f"Partial scan: {summary['budget_exhausted']} budget exhausted, "
+                f"{summary['coverage']:.1%} of discovered folders covered\n"
+            )
+        return text + "\n"
+
+
+class CsvWriter(ResultWriter):
+    """
+    One CSV row per folder, with the metadata recorded during the scan.
+    
+    Size is the size of the folder's contents, as in the GUI, so always 0.
+    Times are local ISO 8601; Changed is the creation time on Windows and
+    the inode change time elsewhere.
+    """
+    
+    needs_metadata = True
+    
+    def __init__(self, output_file: str):
+        super().__init__(output_file)
+        # The csv module writes each formatted row straight into the batch
+        self._csv = csv.writer(_Appender(self._batch))
+    
+    def _header(self, summary: Optional[dict]) -> str:
+        row = io.StringIO()
+        csv.writer(row).writerow(['Path', 'Type', 'Size', 'Depth', 'Modified', 'Changed', 'Owner'])
+        return row.getvalue()
+    
+    def write(self, record: FolderRecord):
+        """Add one empty folder."""
+        self._csv.writerow((
+            str(record.path), 'Empty Folder', '0', record.depth,
+            self._timestamp(record.mtime_ns), self._timestamp(record.ctime_ns), owner_name(record.uid)
+        ))
+        if len(self._batch) >= RECORD_BATCH_SIZE:
+            self._write_batch()
+    
+    @staticmethod
+    def _timestamp(time_ns: Optional[int]) -> str:
+        if time_ns is None:
+            return ''
+        return datetime.fromtimestamp(time_ns / 1e9).isoformat(timespec='seconds')
+    
+
+class _Appender:
+    """File-like target that collects written strings in a list."""
+    
+    def __init__(self, lines: List[str]):
+        self.write = lines.append
+
+
+class JsonWriter(ResultWriter):
+    """
+    A single JSON object with the folder list and the scan summary.
+    
+    The folder array is written element by element, so the document is
+    never held in memory; the summary follows the array when it is only
+    known at the end of the scan.
+    """
+    
+    def _header(self, summary: Optional[dict]) -> str:
+        if summary is not None:
+            return f'{{"scan_summary": {self._dumps(summary)}, "empty_folders": ['
+        return '{"empty_folders": ['
+    
+    def _format(self, record: FolderRecord) -> str:
+        separator = ', ' if self.records_written or self._batch else ''
+        return separator + json.dumps(str(record.path), ensure_ascii=False)
+    
+    def _footer(self, summary: Optional[dict]) -> str:
+        if summary is None:
+            return ']}\n'
+        return f'], "scan_summary": {self._dumps(summary)}}}\n'
+    
+    @staticmethod
+    def _dumps(summary: dict) -> str:
+        return json.dumps(summary, ensure_ascii=False, default=str)
+
+
+class ParquetWriter(ResultWriter):
+    """
+    Typed, columnar export for analytics (requires pyarrow).
+    
+    Columns: path, parent (dictionary encoded, since siblings share it),
+    depth, mtime, uid, inode and ctime. Rows are collected in compact typed arrays
+    and written one row group at a time, so at most one row group is held
+    in memory. The scan summary is stored as JSON in the file's key-value
+    metadata under 'folderpulse.scan_summary'.
+    """
+    
+    needs_metadata = True
+    
+    def __init__(self, output_file: str):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        super().__init__(output_file)
+        self._writer = None
+        self._reset_columns()
+    
+    @staticmethod
+    def schema() -> 'pa.Schema':
+        """Arrow schema of the exported table."""
+        return pa.schema([
+            ('path', pa.string()),
+            ('parent', pa.dictionary(pa.int32(), pa.string())),
+            ('depth', pa.int32()),
+            ('mtime', pa.timestamp('ns')),
+            ('uid', pa.uint32()),
+            ('inode', pa.uint64()),
+            ('ctime', pa.timestamp('ns'))
+        ])
+    
+    def open(self, summary: Optional[dict] = None):
+        """Create the Parquet file."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        schema = self.schema()
+        if summary is not None:
+            schema = schema.with_metadata(self._summary_metadata(summary))
+        self._writer = pq.ParquetWriter(str(self.output_path), schema)
+        self._summary_written = summary is not None
+    
+    def write(self, record: FolderRecord):
+        """Add one empty folder."""
+        path = str(record.path)
+        parent = os.path.dirname(path)
+        index = self._parent_ids.get(parent)
+        if index is None:
+            index = self._parent_ids[parent] = len(self._parents)
+            self._parents.append(parent)
+        
+        self._paths.append(path)
+        self._parent_indices.append(index)
+        self._depths.append(record.depth)
+        if record.mtime_ns is None:
+            self._missing.append(len(self._paths) - 1)
+            self._mtimes.append(0)
+            self._uids.append(0)
+            self._inodes.append(0)
+        else:
+            self._mtimes.append(record.mtime_ns)
+            self._uids.append(record.uid)
+            self._inodes.append(record.inode)
+        if record.ctime_ns is None:
+            self._missing_ctime.append(len(self._paths) - 1)
+            self._ctimes.append(0)
+        else:
+            self._ctimes.append(record.ctime_ns)
+        
+        if len(self._paths) >= PARQUET_ROW_GROUP_SIZE:
+            self._write_row_group()
+    
+    def close(self, summary: Optional[dict] = None):
+        """Write the last row group and the summary, then close the file."""
+        if self._writer is None:
+            return
+        try:
+            self._write_row_group()
+            if summary is not None and not self._summary_written:
+                self._writer.add_key_value_metadata(self._summary_metadata(summary))
+        finally:
+            self._writer.close()
+            self._writer = None
+    
+    def _reset_columns(self):
+        self._paths: List[str] = []
+        self._parents: List[str] = []
+        self._parent_ids: Dict[str, int] = {}
+        self._parent_indices = array('i')
+        self._depths = array('i')
+        self._mtimes = array('q')
+        self._uids = array('I')
+        self._inodes = array('Q')
+        self._ctimes = array('q')
+        self._missing: List[int] = []  # Rows whose metadata could not be read
+        self._missing_ctime: List[int] = []
+    
+    def _write_row_group(self):
+        rows = len(self._paths)
+        if not rows:
+            return
+        
+        # Typed arrays are handed to Arrow as buffers, without per-value conversion
+        def numeric(values: array, arrow_type):
+            return pa.Array.from_buffers(arrow_type, rows, [None, pa.py_buffer(values)])
+        
+        mtime = numeric(self._mtimes, pa.timestamp('ns'))
+        uid = numeric(self._uids, pa.uint32())
+        inode = numeric(self._inodes, pa.uint64())
+        ctime = numeric(self._ctimes, pa.timestamp('ns'))
+        if self._missing:
+            valid = self._valid(rows, self._missing)
+            mtime, uid, inode = (self._with_nulls(column, valid) for column in (mtime, uid, inode))
+        if self._missing_ctime:
+            ctime = self._with_nulls(ctime, self._valid(rows, self._missing_ctime))
+        
+        table = pa.Table.from_arrays([
+            pa.array(self._paths, pa.string()),
+            pa.DictionaryArray.from_arrays(
+                numeric(self._parent_indices, pa.int32()),
+                pa.array(self._parents, pa.string())
+            ),
+            numeric(self._depths, pa.int32()),
+            mtime,
+            uid,
+            inode,
+            ctime
+        ], schema=self.schema())
+        self._writer.write_table(table, row_group_size=rows)
+        self.records_written += rows
+        self.bytes_written = os.path.getsize(self.output_path)
+        self._reset_columns()
+    
+    @staticmethod
+    def _valid(rows: int, missing: List[int]) -> List[bool]:
+        valid = [True] * rows
+        for row in missing:
+            valid[row] = False
+        return valid
+    
+    @staticmethod
+    def _with_nulls(column: 'pa.Array', valid: List[bool]) -> 'pa.Array':
+        return pc.if_else(pa.array(valid), column, pa.scalar(None, column.type))
+    
+    @staticmethod
+    def _summary_metadata(summary: dict) -> Dict[str, str]:
+        return {'folderpulse.scan_summary': json.dumps(summary, ensure_ascii=False, default=str)}
+
+
+class NdjsonWriter(ResultWriter):
+    """
+    Newline-delimited JSON: one object per folder, the summary last.
+    
+    Every line stands on its own, so shards or partial exports can be
+    joined with `cat`; the summary line is the only one with a
+    'scan_summary' key.
+    """
+    
+    needs_metadata = True
+    
+    def _format(self, record: FolderRecord) -> str:
+        line = '{"path": ' + json.dumps(str(record.path), ensure_ascii=False) + f', "depth": {record.depth}'
+        if record.mtime_ns is not None:
+            line += f', "mtime_ns": {record.mtime_ns}, "uid": {record.uid}, "inode": {record.inode}'
+        if record.ctime_ns is not None:
+            line += f', "ctime_ns": {record.ctime_ns}'
+        return line + '}\n'
+    
+    def _header(self, summary: Optional[dict]) -> str:
+        return self._summary_line(summary) if summary is not None else ''
+    
+    def _footer(self, summary: Optional[dict]) -> str:
+        return self._summary_line(summary) if summary is not None else ''
+    
+    @staticmethod
+    def _summary_line(summary: dict) -> str:
+        return json.dumps({'scan_summary': summary}, ensure_ascii=False, default=str) + '\n'
+
+
+class CompressedNdjsonWriter(NdjsonWriter):
+    """
+    NDJSON compressed in independent blocks on a thread pool.
+    
+    Each batch of records becomes one complete gzip member or zstd frame.
+    Both formats define a sequence of members/frames as one stream, so the
+    output decompresses with standard tools and compressed files can still
+    be concatenated. Blocks are compressed in parallel (zlib and zstandard
+    release the GIL) and written in order; at most two blocks per worker
+    are in flight, which keeps memory bounded.
+    """
+    
+    def __init__(self, output_file: str, compression: str = 'gzip', workers: int = COMPRESSION_WORKERS):
+        """
+        Args:
+            output_file: Output file path
+            compression: 'gzip' or 'zstd'
+            workers: Parallel compression threads
+        """
+        if compression == 'zstd' and not ZSTANDARD_AVAILABLE:
+            raise ImportError("zstd export requires zstandard (pip install zstandard)")
+        if compression not in ('gzip', 'zstd'):
+            raise ValueError(f"Unsupported compression: {compression}")
+        super().__init__(output_file)
+        self.compression = compression
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: deque = deque()
+    
+    def open(self, summary: Optional[dict] = None):
+        """Create the output file and start the compression threads."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="folderpulse-compress")
+        self._summary_written = summary is not None
+        if summary is not None:
+            self._submit(self._summary_line(summary), 0)
+    
+    def close(self, summary: Optional[dict] = None):
+        """Compress the remaining records and the summary, then close the file."""
+        if self._file is None:
+            return
+        try:
+            self._write_batch()
+            if summary is not None and not self._summary_written:
+                self._submit(self._summary_line(summary), 0)
+            while self._pending:
+                self._write_block()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._file.close()
+            self._file = None
+    
+    def _write_batch(self):
+        if self._batch:
+            self._submit(''.join(self._batch), len(self._batch))
+            self._batch.clear()
+    
+    def _submit(self, text: str, records: int):
+        self._pending.append((self._executor.submit(self._compress, text.encode('utf-8')), records))
+        while len(self._pending) > 2 * self.workers:
+            self._write_block()
+    
+    def _write_block(self):
+        future, records = self._pending.popleft()
+        block = future.result()
+        self._file.write(block)
+        self.records_written += records
+        self.bytes_written += len(block)
+    
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class SqliteWriter(ResultWriter):
+    """
+    SQLite database with one row per folder, indexed for ad hoc queries.
+    
+    Rows go in with executemany() in large transactions, with journaling
+    and syncing turned off for the duration of the export (an interrupted
+    export is simply written again). The indexes on parent, depth and
+    mtime are built once at the end, which is far cheaper than keeping
+    them up to date row by row. Example queries:
+        
+        SELECT path FROM folders WHERE parent >= '/data/a/' AND parent < '/data/a0';
+        SELECT count(*) FROM folders WHERE mtime_ns < strftime('%s', 'now', '-1 year') * 1000000000;
+    """
+    
+    needs_metadata = True
+    
+    def open(self, summary: Optional[dict] = None):
+        """Create a fresh database and its tables."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output_path.unlink(missing_ok=True)
+        
+        self._file = sqlite3.connect(str(self.output_path), isolation_level=None, check_same_thread=False)
+        for pragma in (
+            f'page_size = {SQLITE_PAGE_SIZE}',
+            'journal_mode = OFF',
+            'synchronous = OFF',
+            'locking_mode = EXCLUSIVE',
+            'temp_store = MEMORY',
+            'cache_size = -262144'  # 256 MiB, mostly for the index builds
+        ):
+            self._file.execute(f'PRAGMA {pragma}')
+        self._file.execute(
+            'CREATE TABLE folders ('
+            'path TEXT NOT NULL, parent TEXT NOT NULL, depth INTEGER NOT NULL, '
+            'mtime_ns INTEGER, uid INTEGER, inode INTEGER, ctime_ns INTEGER)'
+        )
+        self._file.execute('CREATE TABLE scan_summary (key TEXT PRIMARY KEY, value TEXT)')
+        self._file.execute('BEGIN')
+        self._rows_in_transaction = 0
+        
+        self._summary_written = summary is not None
+        if summary is not None:
+            self._insert_summary(summary)
+    
+    def write(self, record: FolderRecord):
+        """Add one empty folder."""
+        path = str(record.path)
+        self._batch.append((
+            path, os.path.dirname(path), record.depth, record.mtime_ns, record.uid, record.inode, record.ctime_ns
+        ))
+        if len(self._batch) >= RECORD_BATCH_SIZE:
+            self._write_batch()
+    
+    def close(self, summary: Optional[dict] = None):
+        """Insert the remaining rows and the summary, build the indexes and close."""
+        if self._file is None:
+            return
+        try:
+            self._write_batch()
+            if summary is not None and not self._summary_written:
+                self._insert_summary(summary)
+            for column in ('parent', 'depth', 'mtime_ns'):
+                self._file.execute(f'CREATE INDEX folders_{column} ON folders ({column})')
+            self._file.execute('COMMIT')
+            self._file.execute('ANALYZE')
+        finally:
+            self._file.close()
+            self._file = None
+    
+    def _write_batch(self):
+        if not self._batch:
+            return
+        self._file.executemany('INSERT INTO folders VALUES (?, ?, ?, ?, ?, ?, ?)', self._batch)
+        self.records_written += len(self._batch)
+        self._rows_in_transaction += len(self._batch)
+        self._batch.clear()
+        # Counts pages still in the cache, unlike the file size
+        self.bytes_written = self._file.execute('PRAGMA page_count').fetchone()[0] * SQLITE_PAGE_SIZE
+        
+        if self._rows_in_transaction >= SQLITE_TRANSACTION_ROWS:
+            self._file.execute('COMMIT')
+            self._file.execute('BEGIN')
+            self._rows_in_transaction = 0
+    
+    def _insert_summary(self, summary: dict):
+        self._file.executemany(
+            'INSERT OR REPLACE INTO scan_summary VALUES (?, ?)',
+            [(key, json.dumps(value, ensure_ascii=False, default=str)) for key, value in summary.items()]
+        )
+
+
+# Format name -> factory taking the output file
+EXPORT_FORMATS: Dict[str, Callable[[str], ResultWriter]] = {
+    'txt': TxtWriter,
+    'csv': CsvWriter,
+    'json': JsonWriter,
+    'parquet': ParquetWriter,
+    'sqlite': SqliteWriter,
+    'ndjson': NdjsonWriter,
+    'ndjson.gz': partial(CompressedNdjsonWriter, compression='gzip'),
+    'ndjson.zst': partial(CompressedNdjsonWriter, compression='zstd')
+}
+
+
+def writer_class(format_type: str) -> type:
+    """Get the ResultWriter class of a format without creating a writer."""
+    factory = EXPORT_FORMATS[format_type]
+    return getattr(factory, 'func', factory)
+
+
+def create_writer(
+    output_file: str,
+    format_type: str,
+    max_rows: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    subtree_root: Optional[str] = None
+) -> ResultWriter:
+    """
+    Create the writer of an export format.
+    
+    Args:
+        output_file: Output file path
+        format_type: Format type ('txt', 'csv', 'json', 'parquet', 'sqlite',
+            'ndjson', 'ndjson.gz' or 'ndjson.zst')
+        max_rows: Start a new shard after this many rows (None = no limit)
+        max_bytes: Start a new shard once this size is reached (None = no limit)
+        subtree_root: Write one set of shards per top-level folder below this
+            root (None = don't split by subtree)
+    
+    Returns:
+        An unopened ResultWriter; a PartitionedWriter when any partitioning
+        option is given
+    """
+    format_type = format_type.lower()
+    factory = EXPORT_FORMATS.get(format_type)
+    if factory is None:
+        raise ValueError(f"Unsupported format: {format_type}")
+    if max_rows is not None or max_bytes is not None or subtree_root is not None:
+        return PartitionedWriter(output_file, format_type, max_rows, max_bytes, subtree_root)
+    return factory(output_file)
+
+
+class PartitionedWriter(ResultWriter):
+    """
+    Split an export into shards with a manifest.
+    
+    A shard is closed and a new one started when it reaches max_rows rows
+    or (at the next batch boundary) max_bytes bytes. With a subtree root,
+    each top-level folder below it gets its own shards, so one subtree can
+    be exported again on its own. Shards are named after the output file,
+    e.g. results.part-00000.csv or results.projects.part-00000.csv.
+    
+    The manifest (results.manifest.json) lists every finished shard with
+    its row count, size and SHA-256. It is rewritten after each shard, so
+    an interrupted export still describes the shards it completed, and is
+    marked complete, with the scan summary, when the export closes.
+    Downstream jobs can process shards in parallel and verify or fetch
+    again any single one.
+    """
+    
+    def __init__(
+        self,
+        output_file: str,
+        format_type: str,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        subtree_root: Optional[str] = None
+    ):
+        """
+        Args:
+            output_file: Output file path the shard names are derived from
+            format_type: Format of every shard
+            max_rows: Rows per shard (None = no limit)
+            max_bytes: Approximate bytes per shard (None = no limit)
+            subtree_root: Root whose top-level folders get their own shards
+        """
+        if max_rows is not None and max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        super().__init__(output_file)
+        self.logger = logging.getLogger(__name__)
+        self.format_type = format_type
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.subtree_root = str(subtree_root) if subtree_root is not None else None
+        self.needs_metadata = writer_class(format_type).needs_metadata
+        self.shards: List[dict] = []
+        self._summary: Optional[dict] = None
+        
+        name = self.output_path.name
+        extension = '.' + format_type
+        if name.lower().endswith(extension) and len(name) > len(extension):
+            self._stem, self._extension = name[:-len(extension)], name[-len(extension):]
+        else:
+            self._stem, self._extension = name, ''
+        self.manifest_path = self.output_path.with_name(f"{self._stem}.manifest.json")
+        
+        self._root_prefix = os.path.join(self.subtree_root, '') if self.subtree_root is not None else None
+        self._open: 'OrderedDict[Optional[str], dict]' = OrderedDict()  # subtree -> shard being written
+        self._sequence: Dict[Optional[str], int] = {}
+        self._labels: Dict[Optional[str], str] = {}
+    
+    def open(self, summary: Optional[dict] = None):
+        """Start the export; shards are created as records arrive."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._summary = summary
+        self._write_manifest(None, complete=False)
+    
+    def write(self, record: FolderRecord):
+        """Add one empty folder to the shard it belongs to."""
+        subtree = self._subtree(record) if self._root_prefix is not None else None
+        shard = self._open.get(subtree)
+        if shard is None:
+            shard = self._start_shard(subtree)
+        elif len(self._open) > 1:
+            self._open.move_to_end(subtree)
+        
+        writer = shard['writer']
+        writer.write(record)
+        shard['rows'] += 1
+        self.records_written += 1
+        
+        if (self.max_rows is not None and shard['rows'] >= self.max_rows) or \
+                (self.max_bytes is not None and writer.bytes_written >= self.max_bytes):
+            self._finish_shard(subtree)
+    
+    def close(self, summary: Optional[dict] = None):
+        """Finish all open shards and mark the manifest complete."""
+        for subtree in list(self._open):
+            self._finish_shard(subtree)
+        self._write_manifest(summary if summary is not None else self._summary, complete=True)
+        self.logger.info(f"Exported {self.records_written} results in {len(self.shards)} shards")
+    
+    def _subtree(self, record: FolderRecord) -> str:
+        path = str(record.path)
+        if not path.startswith(self._root_prefix):
+            return ''
+        return path[len(self._root_prefix):].split(os.sep, 1)[0]
+    
+    def _start_shard(self, subtree: Optional[str]) -> dict:
+        # Bound open files when there are many subtrees; a subtree seen again
+        # later simply continues in its next shard
+        if len(self._open) >= MAX_OPEN_SHARDS:
+            self._finish_shard(next(iter(self._open)))
+        
+        sequence = self._sequence.get(subtree, 0)
+        self._sequence[subtree] = sequence + 1
+        parts = [self._stem]
+        if subtree is not None:
+            parts.append(self._label(subtree))
+        parts.append(f"part-{sequence:05d}")
+        
+        writer = EXPORT_FORMATS[self.format_type](str(self.output_path.with_name('.'.join(parts) + self._extension)))
+        writer.open()
+        shard = {'writer': writer, 'rows': 0, 'subtree': subtree}
+        self._open[subtree] = shard
+        return shard
+    
+    def _label(self, subtree: str) -> str:
+        """File-name-safe, unique label of a subtree."""
+        label = self._labels.get(subtree)
+        if label is None:
+            label = ''.join(c if c.isalnum() or c in '-_' else '_' for c in subtree) or '_root'
+            taken = set(self._labels.values())
+            candidate, number = label, 1
+            while candidate in taken:
+                number += 1
+                candidate = f"{label}-{number}"
+            label = self._labels[subtree] = candidate
+        return label
+    
+    def _finish_shard(self, subtree: Optional[str]):
+        shard = self._open.pop(subtree)
+        writer = shard['writer']
+        writer.close()
+        
+        digest = hashlib.sha256()
+        with open(writer.output_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+                digest.update(chunk)
+        
+        entry = {
+            'file': writer.output_path.name,
+            'rows': shard['rows'],
+            'bytes': writer.output_path.stat().st_size,
+            'sha256': digest.hexdigest()
+        }
+        if subtree is not None:
+            entry['subtree'] = subtree
+        self.shards.append(entry)
+        self.bytes_written += entry['bytes']
+        self._write_manifest(None, complete=False)
+    
+    def _write_manifest(self, summary: Optional[dict], complete: bool):
+        manifest = {
+            'format': self.format_type,
+            'complete': complete,
+            'rows': sum(shard['rows'] for shard in self.shards),
+            'partitioning': {
+                'max_rows': self.max_rows,
+                'max_bytes': self.max_bytes,
+                'subtree_root': self.subtree_root
+            },
+            'shards': self.shards
+        }
+        if summary is not None:
+            manifest['scan_summary'] = summary
+        
+        # Replace atomically, so readers never see a half-written manifest
+        temporary = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(temporary, self.manifest_path)
+
+
+def format_from_path(output_file: str, default: str = 'txt') -> str:
+    """
+    Guess the export format from a file name, including double extensions
+    such as '.ndjson.gz'.
+    """
+    suffixes = [suffix.lower() for suffix in Path(output_file).suffixes]
+    for count in (2, 1):
+        candidate = ''.join(suffixes[-count:]).lstrip('.')
+        if len(suffixes) >= count and candidate in EXPORT_FORMATS:
+            return candidate
+    return default
+
+
+class StreamingExporter:
+    """
+    Write the results of a scan session to one or more files while it runs.
+    
+    Every writer is fed from the session's result listener, so a single
+    pass over the results serves all formats. The files are completed with
+    the final summary as soon as the session finishes, before wait()
+    returns.
+    
+    Usage:
+        session = scanner.create_session(root)
+        StreamingExporter(session, [create_writer('out.csv', 'csv'),
+                                    create_writer('out.json', 'json')])
+        scanner.run_session(session)
+    """
+    
+    def __init__(self, session: ScanSession, writers: List[ResultWriter]):
+        """
+        Open the writers and subscribe to the session.
+        
+        Args:
+            session: Pending session to follow
+            writers: Writers to fan the results out to
+        """
+        self.logger = logging.getLogger(__name__)
+        self.writers = list(writers)
+        self.error: Optional[Exception] = None
+        
+        opened = []
+        try:
+            for writer in self.writers:
+                writer.open()
+                opened.append(writer)
+        except Exception:
+            for writer in opened:
+                writer.close()
+            raise
+        
+        session.add_result_listener(self._write)
+        session.add_completion_listener(self._finish)
+    
+    def _write(self, record: FolderRecord):
+        if self.error is not None:
+            return
+        try:
+            for writer in self.writers:
+                writer.write(record)
+        except Exception as e:
+            # Keep the scan going; the export is reported as failed
+            self.error = e
+            self.logger.error(f"Streaming export failed: {e}")
+    
+    def _finish(self, session: ScanSession):
+        summary = session.get_summary()
+        for writer in self.writers:
+            try:
+                writer.close(summary)
+            except Exception as e:
+                self.error = self.error or e
+                self.logger.error(f"Failed to finish export {writer.output_path}: {e}")
+        if self.error is None:
+            self.logger.info(
+                f"Streamed {self.writers[0].records_written if self.writers else 0} results to "
+                f"{', '.join(str(writer.output_path) for writer in self.writers)}"
+            )
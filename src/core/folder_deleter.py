@@ -0,0 +1,286 @@
+"""
+Bulk Folder Deleter
+Parallel removal of many empty folders, grouped by parent directory.
+"""
+
+import os
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .deletion_journal import DeletionJournal
+from .io_governor import IOGovernor, governed
+
+
+DEFAULT_DELETE_WORKERS = 8
+
+# Below this many targets per parent, checking each one directly is cheaper
+# than listing the parent
+PARENT_LISTING_THRESHOLD = 2
+
+
+def existing_subdirectories(parent: Path, governor: Optional[IOGovernor] = None) -> Optional[Set[str]]:
+    """
+    List the names of the real subdirectories of a directory in one pass.
+    
+    Args:
+        parent: Directory to list
+        governor: I/O governor the listing goes through
+    
+    Returns:
+        Set of subdirectory names (empty if parent no longer exists), or None
+        if the parent exists but cannot be listed
+    """
+    try:
+        with governed(governor, 'scandir'), os.scandir(parent) as it:
+            return {entry.name for entry in it if entry.is_dir(follow_symlinks=False)}
+    except FileNotFoundError:
+        return set()
+    except OSError:
+        return None
+
+
+class BulkDeleter:
+    """
+    Delete empty folders on a bounded thread pool.
+    
+    Targets are grouped by parent directory and each group is handled by one
+    worker, so operations on the same directory never contend with each
+    other while different parents proceed in parallel. Groups are processed
+    in waves from the deepest level up, so a folder is always attempted after
+    any targets nested inside it, and parents emptied by one wave can join
+    the next.
+    """
+    
+    def __init__(
+        self,
+        workers: int = DEFAULT_DELETE_WORKERS,
+        journal: Optional[DeletionJournal] = None,
+        governor: Optional[IOGovernor] = None,
+        failure_log_level: int = logging.ERROR
+    ):
+        """
+        Initialize the deleter.
+        
+        Args:
+            workers: Maximum parallel rmdir calls
+            journal: Journal recording every real deletion (None = no undo)
+            governor: I/O governor every filesystem operation goes through
+            failure_log_level: Level at which individual failures are logged
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = max(1, workers)
+        self.journal = journal
+        self.governor = governor
+        self.failure_log_level = failure_log_level
+        self.error_codes: Dict[Path, Optional[int]] = {}
+        self.stats: dict = {}
+    
+    def delete(
+        self,
+        folders: List[Path],
+        dry_run: bool = True,
+        cascade: bool = False,
+        stop_at: Optional[str] = None,
+        cascade_index: Optional[Dict[str, int]] = None
+    ) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Delete folders, or check what would be deleted.
+        
+        Folders that no longer exist are skipped, as are duplicates.
+        
+        With cascade enabled, every parent left empty by a deletion is removed
+        as well, climbing towards (but never removing) stop_at. A dry run
+        computes the cascade in memory from cascade_index, the scan's record of
+        directories that contain nothing but subdirectories; parents the scan
+        did not see are never predicted to cascade.
+        
+        Args:
+            folders: Folders to delete
+            dry_run: If True, don't actually delete, just simulate
+            cascade: Also remove parents that become empty
+            stop_at: Directory the cascade must stay below
+            cascade_index: Directory path -> number of entries, for directories
+                whose entries are all subdirectories (dry run only)
+        
+        Returns:
+            Tuple of (successfully_deleted, failed_deletions_with_errors).
+            Requested folders keep the order they were given; cascaded parents
+            follow, deepest first.
+        """
+        start_time = time.perf_counter()
+        order = {}
+        for folder in folders:
+            order.setdefault(Path(folder), len(order))
+        
+        if cascade and stop_at is None:
+            raise ValueError("Cascading deletion needs a directory to stop at")
+        stop_path = Path(os.path.abspath(stop_at)) if cascade else None
+        
+        by_depth: Dict[int, Dict[Path, List[Path]]] = {}
+        for folder in order:
+            self._add_target(by_depth, folder)
+        
+        deleted: List[Path] = []
+        failed: List[Tuple[Path, str]] = []
+        cascaded: List[Path] = []
+        candidates: Set[Path] = set()
+        missing = 0
+        groups = 0
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="folderpulse-delete") as executor:
+            while by_depth:
+                wave = by_depth.pop(max(by_depth))
+                groups += len(wave)
+                wave_removed = []
+                for group_deleted, group_failed, group_missing in executor.map(
+                    lambda children: self._process_group(children, dry_run, candidates), wave.values()
+                ):
+                    wave_removed.extend(group_deleted)
+                    failed.extend(group_failed)
+                    missing += group_missing
+                
+                for folder in wave_removed:
+                    (cascaded if folder in candidates else deleted).append(folder)
+                
+                # Real cascade: parents are tried once all their targeted children were
+                if cascade and not dry_run:
+                    for folder in wave_removed:
+                        parent = folder.parent
+                        if parent not in order and parent not in candidates and self._below(parent, stop_path):
+                            candidates.add(parent)
+                            self._add_target(by_depth, parent)
+        
+        if self.journal is not None:
+            self.journal.flush()
+        
+        if cascade and dry_run:
+            cascaded = self._preview_cascade(deleted, order, stop_path, cascade_index or {})
+        
+        deleted.sort(key=order.__getitem__)
+        failed.sort(key=lambda item: order[item[0]])
+        deleted.extend(cascaded)
+        
+        elapsed = time.perf_counter() - start_time
+        self.stats = {
+            'requested': len(order),
+            'deleted': len(deleted),
+            'failed': len(failed),
+            'missing': missing,
+            'cascaded': len(cascaded),
+            'parent_groups': groups,
+            'workers': self.workers,
+            'dry_run': dry_run,
+            'elapsed': elapsed,
+            'folders_per_second': len(deleted) / elapsed if elapsed > 0 else 0.0
+        }
+        
+        if missing:
+            self.logger.warning(f"{missing} folders no longer existed and were skipped")
+        return deleted, failed
+    
+    @staticmethod
+    def _add_target(by_depth: Dict[int, Dict[Path, List[Path]]], folder: Path):
+        """Queue a folder in its depth wave, grouped by parent directory."""
+        by_depth.setdefault(len(folder.parts), {}).setdefault(folder.parent, []).append(folder)
+    
+    @staticmethod
+    def _below(folder: Path, stop_path: Path) -> bool:
+        """Check that a folder lies strictly inside stop_path."""
+        return stop_path in Path(os.path.abspath(folder)).parents
+    
+    def _preview_cascade(
+        self,
+        deleted: List[Path],
+        order: Dict[Path, int],
+        stop_path: Path,
+        cascade_index: Dict[str, int]
+    ) -> List[Path]:
+        """Work out, without touching the disk, which parents a cascade would remove."""
+        removed_children: Dict[Path, int] = {}
+        levels: Dict[int, Set[Path]] = {}
+        
+        def count_removal(folder: Path):
+            parent = folder.parent
+            if parent in order or not self._below(parent, stop_path):
+                return
+            removed_children[parent] = removed_children.get(parent, 0) + 1
+            levels.setdefault(len(parent.parts), set()).add(parent)
+        
+        for folder in deleted:
+            count_removal(folder)
+        
+        cascaded = []
+        while levels:
+            for parent in sorted(levels.pop(max(levels))):
+                if cascade_index.get(str(parent)) == removed_children[parent]:
+                    cascaded.append(parent)
+                    count_removal(parent)
+        
+        return cascaded
+    
+    def _process_group(
+        self,
+        children: List[Path],
+        dry_run: bool,
+        optional: Set[Path]
+    ) -> Tuple[List[Path], List[Tuple[Path, str]], int]:
+        """
+        Remove (or check) all targets below one parent directory.
+        
+        Folders in optional are cascade candidates: if they cannot be removed
+        they are silently left alone instead of being reported as failures.
+        """
+        deleted = []
+        failed = []
+        missing = 0
+        
+        # A dry run confirms existence from one listing of the shared parent
+        governor = self.governor
+        siblings = None
+        if dry_run and len(children) >= PARENT_LISTING_THRESHOLD:
+            siblings = existing_subdirectories(children[0].parent, governor)
+        
+        for folder in children:
+            try:
+                if dry_run:
+                    if siblings is not None:
+                        exists = folder.name in siblings
+                    else:
+                        with governed(governor, 'stat'):
+                            exists = os.path.isdir(folder)
+                    if not exists:
+                        raise FileNotFoundError(folder)
+                    self.logger.debug(f"Would delete: {folder}")
+                elif self.journal is not None:
+                    # Metadata must be captured before it is gone
+                    with governed(governor, 'lstat'):
+                        stat_result = os.lstat(folder)
+                    with governed(governor, 'rmdir'):
+                        os.rmdir(folder)  # Only removes empty directories
+                    self.journal.record(folder, stat_result)
+                    self.logger.debug(f"Deleted: {folder}")
+                else:
+                    with governed(governor, 'rmdir'):
+                        os.rmdir(folder)  # Only removes empty directories
+                    self.logger.debug(f"Deleted: {folder}")
+                deleted.append(folder)
+            
+            except OSError as e:
+                if folder in optional:
+                    self.logger.debug(f"Cascade stopped at {folder}: {e}")
+                elif isinstance(e, FileNotFoundError):
+                    self.logger.debug(f"Folder no longer exists: {folder}")
+                    missing += 1
+                else:
+                    self.logger.log(self.failure_log_level, f"Failed to delete {folder}: {e}")
+                    failed.append((folder, str(e)))
+                    self.error_codes[folder] = e.errno
+            except Exception as e:
+                self.logger.error(f"Unexpected error deleting {folder}: {e}")
+                failed.append((folder, str(e)))
+                self.error_codes[folder] = None
+        
+        return deleted, failed, missing
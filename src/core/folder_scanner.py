@@ -5,15 +5,46 @@ Core functionality for detecting and managing empty folders.
 
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Set, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Optional
 import stat
 
+from .scan_session import ScanSession, ScanOptions, FolderRecord, ResultMetadata, DEFAULT_IGNORE_PATTERNS
+from .scan_estimator import ScanEstimator
+from .scan_planner import ScanPlanner, ScanHistory
+from .folder_deleter import BulkDeleter, DEFAULT_DELETE_WORKERS, existing_subdirectories
+from .deletion_journal import DeletionJournal, JournalUndo, latest_journal
+from .io_governor import IOGovernor, governed
+from .quarantine import QuarantineManager, QUARANTINE_DIR_NAME
+from .permission_cache import PermissionCache
+from .exporters import StreamingExporter, create_writer
+from .results_snapshot import ResultsSnapshot, SnapshotWriter
+from .scan_analytics import result_arrays, result_dataframe
+
+
+# Results probed per task when revalidating
+REVALIDATE_CHUNK_SIZE = 256
+
 
 class EmptyFolderScanner:
     """Scanner for detecting empty folders with various options."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, io_governor: Optional[IOGovernor] = None):
+        """
+        Initialize the scanner.
+        
+        Args:
+            cache_dir: Directory for persistent scanner state such as the scan
+                history used by the planner, the directories known to be
+                unreadable, the deletion journals, the quarantine index and
+                the snapshot of the last scan's results (None = keep nothing
+                on disk, deletions cannot be undone and nothing can be
+                quarantined)
+            io_governor: Rate and concurrency limits shared by scans,
+                revalidation and deletions (None = unlimited)
+        """
         self.logger = logging.getLogger(__name__)
         self.empty_folders: List[Path] = []
         self.scan_results = {
@@ -22,96 +53,244 @@ class EmptyFolderScanner:
             'hidden_folders': 0,
             'scan_time': 0
         }
+        self.last_session: Optional[ScanSession] = None
+        self.last_deletion_stats: dict = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.io_governor = io_governor
+        
+        self.journal_dir = self.cache_dir / "journal" if self.cache_dir else None
+        self.quarantine = (
+            QuarantineManager(str(self.cache_dir / "quarantine_index.ndjson"), governor=io_governor)
+            if self.cache_dir else None
+        )
+        history = ScanHistory(self.cache_dir / "scan_history.json") if self.cache_dir else None
+        self.permission_cache = PermissionCache(self.cache_dir / "unreadable_dirs.json") if self.cache_dir else None
+        self.snapshot_file = self.cache_dir / "last_scan.fpsnap" if self.cache_dir else None
+        self.planner = ScanPlanner(history)
+        
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+    
+    def create_session(
+        self,
+        root_path: str,
+        include_subdirectories: bool = True,
+        scan_hidden: bool = False,
+        ignore_patterns: Optional[List[str]] = None,
+        **options
+    ) -> ScanSession:
+        """
+        Create an independent scan session without running it.
+        
+        Sessions created by the same scanner can run concurrently; each one
+        keeps its own results and counters.
+        
+        Args:
+            root_path: Root directory to scan
+            include_subdirectories: Whether to scan subdirectories recursively
+            scan_hidden: Whether to include hidden files/folders in emptiness check
+            ignore_patterns: List of patterns to ignore (e.g., ['.git', '__pycache__'])
+            **options: Further ScanOptions fields, e.g. max_scan_time,
+                max_directories or max_memory_mb budgets
+        
+        Returns:
+            A pending ScanSession
+        """
+        # Default ignore patterns
+        if ignore_patterns is None:
+            ignore_patterns = list(DEFAULT_IGNORE_PATTERNS)
+        
+        scan_options = ScanOptions(
+            include_subdirectories=include_subdirectories,
+            scan_hidden=scan_hidden,
+            ignore_patterns=list(ignore_patterns),
+            **options
+        )
+        return ScanSession(self, root_path, scan_options)
+    
+    def run_session(self, session: ScanSession) -> List[Path]:
+        """
+        Run a session and publish its results as the scanner's last scan.
+        
+        Args:
+            session: Session created by create_session()
+        
+        Returns:
+            List of empty folder paths
+        """
+        if self.snapshot_file is not None:
+            # Saved while the scan runs, for load_snapshot() after a restart.
+            # Registered before the exporter finishes the file, so a failed,
+            # cancelled or budget-limited scan keeps the last full snapshot.
+            snapshot = SnapshotWriter(str(self.snapshot_file))
+            session.add_completion_listener(lambda finished: self._discard_partial_snapshot(finished, snapshot))
+            StreamingExporter(session, [snapshot])
+        results = session.run()
+        self._publish_session(session)
+        return results
+    
+    @staticmethod
+    def _discard_partial_snapshot(session: ScanSession, snapshot: SnapshotWriter):
+        """Drop the snapshot of a session that did not scan its whole tree."""
+        if session.status != ScanSession.COMPLETED or session.scan_results['budget_exhausted']:
+            snapshot.discard()
+    
+    def load_snapshot(self) -> Optional[ResultsSnapshot]:
+        """
+        Open the snapshot of the last scan run with run_session().
+        
+        Returns:
+            The memory-mapped snapshot, or None if there is none or it cannot
+            be read
+        """
+        if self.snapshot_file is None or not self.snapshot_file.exists():
+            return None
+        try:
+            return ResultsSnapshot(str(self.snapshot_file))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable results snapshot: {e}")
+            return None
     
     def scan_directory(
         self,
         root_path: str,
         include_subdirectories: bool = True,
         scan_hidden: bool = False,
-        ignore_patterns: Optional[List[str]] = None
+        ignore_patterns: Optional[List[str]] = None,
+        max_scan_time: Optional[float] = None,
+        max_directories: Optional[int] = None,
+        max_memory_mb: Optional[float] = None,
+        **options
     ) -> List[Path]:
         """
         Scan directory for empty folders.
         
+        When a budget runs out the scan stops cleanly and returns the partial
+        results; get_scan_summary() then reports which budget was exhausted
+        ('budget_exhausted') and how much of the tree was covered ('coverage').
+        
         Args:
             root_path: Root directory to scan
             include_subdirectories: Whether to scan subdirectories recursively
             scan_hidden: Whether to include hidden files/folders in emptiness check
             ignore_patterns: List of patterns to ignore (e.g., ['.git', '__pycache__'])
+            max_scan_time: Wall-clock budget in seconds (None = unlimited)
+            max_directories: Maximum directories to visit (None = unlimited)
+            max_memory_mb: Process RSS ceiling in megabytes (None = unlimited)
+            **options: Further ScanOptions fields, e.g. traversal_order,
+                max_frontier, engine ('serial', 'threads', 'auto') and workers
         
         Returns:
             List of empty folder paths
         """
-        import time
-        start_time = time.time()
+        session = self.create_session(
+            root_path,
+            include_subdirectories=include_subdirectories,
+            scan_hidden=scan_hidden,
+            ignore_patterns=ignore_patterns,
+            max_scan_time=max_scan_time,
+            max_directories=max_directories,
+            max_memory_mb=max_memory_mb,
+            **options
+        )
+        return self.run_session(session)
+    
+    def census_directories(
+        self,
+        root_paths: List[str],
+        scan_hidden: bool = False,
+        ignore_patterns: Optional[List[str]] = None,
+        **options
+    ) -> Dict[str, dict]:
+        """
+        Count directories without recording any paths.
         
-        self.logger.info(f"Starting empty folder scan: {root_path}")
-        self.empty_folders.clear()
+        Memory stays bounded by traversal depth and frontier size, which makes
+        this suitable for capacity dashboards over very large trees.
         
-        # Default ignore patterns
+        Args:
+            root_paths: Root directories to count
+            scan_hidden: Whether to include hidden files/folders in emptiness check
+            ignore_patterns: List of patterns to ignore
+            **options: Further ScanOptions fields (budgets, traversal order)
+        
+        Returns:
+            Mapping of root path to its summary; each summary has a 'census'
+            entry with histograms 'by_depth' and 'by_fanout'
+        """
+        census = {}
+        for root_path in root_paths:
+            session = self.create_session(
+                root_path,
+                scan_hidden=scan_hidden,
+                ignore_patterns=ignore_patterns,
+                count_only=True,
+                **options
+            )
+            session.run()
+            census[root_path] = session.get_summary()
+        return census
+    
+    def estimate_directory(
+        self,
+        root_path: str,
+        time_budget: float = 5.0,
+        scan_hidden: bool = False,
+        ignore_patterns: Optional[List[str]] = None,
+        confidence: float = 0.95,
+        seed: Optional[int] = None
+    ) -> dict:
+        """
+        Estimate folder counts by sampling, within a fixed time budget.
+        
+        Useful before committing to a long full scan: the result includes
+        confidence intervals and a projected serial scan duration.
+        
+        Args:
+            root_path: Root directory to estimate
+            time_budget: Seconds to spend sampling
+            scan_hidden: Whether to include hidden files/folders in emptiness check
+            ignore_patterns: List of patterns to ignore
+            confidence: Confidence level of the reported intervals
+            seed: Random seed for reproducible estimates
+        
+        Returns:
+            Dictionary of estimates (see ScanEstimator.estimate)
+        """
         if ignore_patterns is None:
-            ignore_patterns = ['.git', '__pycache__', '.vscode', 'node_modules']
+            ignore_patterns = list(DEFAULT_IGNORE_PATTERNS)
         
-        try:
-            root = Path(root_path)
-            if not root.exists():
-                raise FileNotFoundError(f"Directory does not exist: {root_path}")
-            
-            if not root.is_dir():
-                raise NotADirectoryError(f"Path is not a directory: {root_path}")
-            
-            # Scan directories
-            if include_subdirectories:
-                self._scan_recursive(root, scan_hidden, ignore_patterns)
-            else:
-                self._scan_single_level(root, scan_hidden, ignore_patterns)
-            
-            # Update scan results
-            self.scan_results['scan_time'] = time.time() - start_time
-            self.scan_results['empty_folders'] = len(self.empty_folders)
-            
-            self.logger.info(f"Scan completed. Found {len(self.empty_folders)} empty folders")
-            return self.empty_folders.copy()
-            
-        except Exception as e:
-            self.logger.error(f"Error during scan: {e}")
-            raise
+        estimator = ScanEstimator(self, scan_hidden=scan_hidden, ignore_patterns=ignore_patterns, seed=seed)
+        return estimator.estimate(root_path, time_budget=time_budget, confidence=confidence)
     
-    def _scan_recursive(self, root: Path, scan_hidden: bool, ignore_patterns: List[str]):
-        """Recursively scan directories."""
-        for dirpath, dirnames, filenames in os.walk(root):
-            current_path = Path(dirpath)
-            
-            # Skip ignored directories
-            if self._should_ignore(current_path, ignore_patterns):
-                continue
-            
-            # Check if directory is empty
-            if self._is_directory_empty(current_path, scan_hidden, ignore_patterns):
-                self.empty_folders.append(current_path)
-                self.logger.debug(f"Found empty folder: {current_path}")
-            
-            self.scan_results['total_folders'] += 1
-            
-            # Track hidden folders
-            if self._is_hidden(current_path):
-                self.scan_results['hidden_folders'] += 1
+    def _get_executor(self, workers: int) -> ThreadPoolExecutor:
+        """Get the worker pool shared by all sessions, growing it if needed."""
+        with self._lock:
+            if self._executor is None or self._executor_workers < workers:
+                # Sessions still using a smaller pool keep their reference; its
+                # idle threads exit once it is garbage collected
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="folderpulse-scan"
+                )
+                self._executor_workers = workers
+            return self._executor
     
-    def _scan_single_level(self, root: Path, scan_hidden: bool, ignore_patterns: List[str]):
-        """Scan only direct subdirectories."""
-        try:
-            for item in root.iterdir():
-                if item.is_dir() and not self._should_ignore(item, ignore_patterns):
-                    if self._is_directory_empty(item, scan_hidden, ignore_patterns):
-                        self.empty_folders.append(item)
-                        self.logger.debug(f"Found empty folder: {item}")
-                    
-                    self.scan_results['total_folders'] += 1
-                    
-                    if self._is_hidden(item):
-                        self.scan_results['hidden_folders'] += 1
-        except PermissionError as e:
-            self.logger.warning(f"Permission denied accessing: {root} - {e}")
+    def cleanup(self):
+        """Release the shared worker pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self._executor_workers = 0
+    
+    def _publish_session(self, session: ScanSession):
+        """Make a finished session the one reported by the scanner."""
+        with self._lock:
+            self.last_session = session
+            self.empty_folders = session.empty_folders
+            self.scan_results = session.scan_results
     
     def _is_directory_empty(self, path: Path, scan_hidden: bool, ignore_patterns: List[str]) -> bool:
         """
@@ -126,41 +305,73 @@ class EmptyFolderScanner:
             True if directory is empty, False otherwise
         """
         try:
-            items = list(path.iterdir())
-            
-            # If no items at all, it's empty
-            if not items:
-                return True
-            
-            # Check each item
-            for item in items:
-                # Skip ignored patterns
-                if self._should_ignore(item, ignore_patterns):
-                    continue
-                
-                # If not scanning hidden files, skip hidden items
-                if not scan_hidden and self._is_hidden(item):
-                    continue
-                
-                # If we find any non-ignored, non-hidden item, it's not empty
-                return False
-            
-            # All items were ignored or hidden (and we're not scanning hidden)
-            return True
-            
+            with governed(self.io_governor, 'scandir'), os.scandir(path) as it:
+                items = list(it)
+            return self._is_listing_empty(items, scan_hidden, ignore_patterns)
+        
         except PermissionError:
-            self.logger.warning(f"Permission denied checking: {path}")
+            self.logger.debug(f"Permission denied checking: {path}")
             return False  # Can't determine, assume not empty
         except Exception as e:
             self.logger.error(f"Error checking directory {path}: {e}")
             return False
     
+    def _is_listing_empty(self, items: list, scan_hidden: bool, ignore_patterns: List[str]) -> bool:
+        """
+        Check if an already fetched directory listing counts as empty.
+        
+        Args:
+            items: Directory entries (os.DirEntry or Path objects)
+            scan_hidden: Whether to consider hidden files
+            ignore_patterns: Patterns to ignore when checking emptiness
+        
+        Returns:
+            True if the listing is empty, False otherwise
+        """
+        # If no items at all, it's empty
+        if not items:
+            return True
+        
+        # Check each item
+        for item in items:
+            # Skip ignored patterns
+            if self._should_ignore(item, ignore_patterns):
+                continue
+            
+            # If not scanning hidden files, skip hidden items
+            if not scan_hidden and self._is_hidden(item):
+                continue
+            
+            # If we find any non-ignored, non-hidden item, it's not empty
+            return False
+        
+        # All items were ignored or hidden (and we're not scanning hidden)
+        return True
+    
+    def _subdirectories(self, entries: list, ignore_patterns: List[str]) -> list:
+        """Select the entries to descend into: real directories that are not ignored."""
+        subdirs = []
+        for entry in entries:
+            if entry.name == QUARANTINE_DIR_NAME:
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            if not self._should_ignore(entry, ignore_patterns):
+                subdirs.append(entry)
+        return subdirs
+    
     def _is_hidden(self, path: Path) -> bool:
         """Check if a file or directory is hidden."""
         # On Windows, check file attributes
         if os.name == 'nt':
             try:
-                attrs = os.stat(path).st_file_attributes
+                if isinstance(path, os.DirEntry):
+                    attrs = path.stat(follow_symlinks=False).st_file_attributes  # Cached by scandir
+                else:
+                    attrs = os.stat(path).st_file_attributes
                 return attrs & stat.FILE_ATTRIBUTE_HIDDEN
             except (AttributeError, OSError):
                 pass
@@ -178,128 +389,398 @@ class EmptyFolderScanner:
         
         return False
     
+    def revalidate_results(
+        self,
+        folders: Optional[List[Path]] = None,
+        workers: int = DEFAULT_DELETE_WORKERS
+    ) -> Dict[str, int]:
+        """
+        Recheck that results are still there and still empty.
+        
+        Results are grouped by parent and each parent is listed once to
+        confirm which of them still exist; the survivors are then re-probed
+        for emptiness in parallel. The list is updated in place, keeping only
+        folders that are still empty. Emptiness follows the options of the
+        last scan.
+        
+        Args:
+            folders: Result list to revalidate (None = current scan results)
+            workers: Maximum parallel listings
+        
+        Returns:
+            Dictionary with counts of checked, still_empty, disappeared and
+            no_longer_empty folders
+        """
+        with self._lock:
+            session = self.last_session
+            if folders is None:
+                folders = self.empty_folders
+            targets = list(folders)
+        
+        options = session.options if session is not None else ScanOptions()
+        executor = self._get_executor(workers)
+        
+        groups: Dict[Path, List[Path]] = {}
+        for folder in targets:
+            groups.setdefault(folder.parent, []).append(folder)
+        
+        # One listing per parent settles existence
+        present: List[Path] = []
+        parents = list(groups)
+        listings = executor.map(lambda parent: existing_subdirectories(parent, self.io_governor), parents)
+        for parent, names in zip(parents, listings):
+            if names is None:
+                present.extend(groups[parent])  # Unlistable parent: probe directly
+            else:
+                present.extend(folder for folder in groups[parent] if folder.name in names)
+        
+        # Emptiness needs each survivor listed; chunks keep tasks coarse
+        chunk_size = max(1, min(REVALIDATE_CHUNK_SIZE, len(present) // (workers * 4)))
+        chunks = [present[i:i + chunk_size] for i in range(0, len(present), chunk_size)]
+        states: Dict[Path, str] = {}
+        for chunk, chunk_states in zip(chunks, executor.map(
+            lambda chunk: [self._probe_result(folder, options) for folder in chunk], chunks
+        )):
+            states.update(zip(chunk, chunk_states))
+        
+        kept = [index for index, folder in enumerate(targets) if states.get(folder, 'missing') == 'empty']
+        still_empty = [targets[index] for index in kept]
+        counts = {
+            'checked': len(targets),
+            'still_empty': len(still_empty),
+            'disappeared': sum(1 for folder in targets if states.get(folder, 'missing') == 'missing'),
+            'no_longer_empty': sum(1 for state in states.values() if state == 'not_empty')
+        }
+        
+        with self._lock:
+            folders[:] = still_empty
+            if folders is self.empty_folders:
+                self.scan_results['empty_folders'] = len(still_empty)
+                if session is not None and folders is session.empty_folders:
+                    session.metadata.keep(kept)
+        
+        self.logger.info(
+            f"Revalidated {counts['checked']} results: {counts['disappeared']} disappeared, "
+            f"{counts['no_longer_empty']} no longer empty"
+        )
+        return counts
+    
+    def _probe_result(self, folder: Path, options: ScanOptions) -> str:
+        """Classify one result as 'empty', 'not_empty' or 'missing'."""
+        try:
+            with governed(self.io_governor, 'scandir'), os.scandir(folder) as it:
+                entries = list(it)
+        except (FileNotFoundError, NotADirectoryError):
+            return 'missing'
+        except OSError as e:
+            # Cannot verify: keep the result rather than drop it silently
+            self.logger.debug(f"Cannot revalidate {folder}: {e}")
+            return 'empty'
+        
+        if self._is_listing_empty(entries, options.scan_hidden, options.ignore_patterns):
+            return 'empty'
+        return 'not_empty'
+    
     def delete_empty_folders(
         self,
         folders_to_delete: Optional[List[Path]] = None,
-        dry_run: bool = True
+        dry_run: bool = True,
+        workers: int = DEFAULT_DELETE_WORKERS,
+        cascade: bool = False,
+        stop_at: Optional[str] = None
     ) -> Tuple[List[Path], List[Tuple[Path, str]]]:
         """
         Delete empty folders.
         
+        Folders are removed in parallel, grouped by parent directory; nested
+        targets are always removed before the folders containing them. Real
+        deletions are journaled in the cache directory so that
+        undo_last_deletion() can bring them back.
+        
         Args:
             folders_to_delete: Specific folders to delete (None = use scan results)
             dry_run: If True, don't actually delete, just simulate
+            workers: Maximum parallel deletions
+            cascade: Also remove parents left empty by the deletions; a dry
+                run predicts them only after a scan with track_cascade
+            stop_at: Directory the cascade never climbs to or above
+                (None = root of the last scan)
         
         Returns:
-            Tuple of (successfully_deleted, failed_deletions_with_errors)
+            Tuple of (successfully_deleted, failed_deletions_with_errors);
+            cascaded parents are appended to the deleted list
         """
         if folders_to_delete is None:
             folders_to_delete = self.empty_folders
         
-        deleted = []
-        failed = []
+        with self._lock:
+            session = self.last_session
+        if cascade and stop_at is None:
+            if session is None:
+                raise ValueError("Cascading deletion needs stop_at when no scan has been run")
+            stop_at = session.root_path
         
         self.logger.info(f"{'Simulating' if dry_run else 'Starting'} deletion of {len(folders_to_delete)} folders")
         
-        for folder in folders_to_delete:
-            try:
-                if not folder.exists():
-                    self.logger.warning(f"Folder no longer exists: {folder}")
-                    continue
-                
-                if not dry_run:
-                    folder.rmdir()  # Only removes empty directories
-                    self.logger.info(f"Deleted: {folder}")
-                else:
-                    self.logger.debug(f"Would delete: {folder}")
-                
-                deleted.append(folder)
-                
-            except OSError as e:
-                error_msg = f"Failed to delete {folder}: {e}"
-                self.logger.error(error_msg)
-                failed.append((folder, str(e)))
-            except Exception as e:
-                error_msg = f"Unexpected error deleting {folder}: {e}"
-                self.logger.error(error_msg)
-                failed.append((folder, str(e)))
+        journal = None
+        if not dry_run and self.journal_dir is not None:
+            journal = DeletionJournal.create(str(self.journal_dir))
+        
+        deleter = BulkDeleter(workers=workers, journal=journal, governor=self.io_governor)
+        try:
+            deleted, failed = deleter.delete(
+                folders_to_delete,
+                dry_run=dry_run,
+                cascade=cascade,
+                stop_at=stop_at,
+                cascade_index=session.cascade_index if session is not None else None
+            )
+        finally:
+            if journal is not None:
+                journal.close()
+        
+        if self.io_governor is not None:
+            deleter.stats['io'] = self.io_governor.get_accounting()
+        if journal is not None:
+            if deleted:
+                deleter.stats['journal'] = str(journal.journal_file)
+            else:
+                journal.journal_file.unlink(missing_ok=True)
+        
+        with self._lock:
+            self.last_deletion_stats = deleter.stats
+            if not dry_run and session is not None:
+                self._forget_deleted(session, deleted)
         
         action = "Would delete" if dry_run else "Deleted"
-        self.logger.info(f"{action} {len(deleted)} folders, {len(failed)} failed")
+        self.logger.info(
+            f"{action} {len(deleted)} folders ({deleter.stats['cascaded']} cascaded), {len(failed)} failed "
+            f"in {deleter.stats['elapsed']:.2f}s ({deleter.stats['folders_per_second']:.0f} folders/s)"
+        )
         
         return deleted, failed
     
+    def undo_last_deletion(
+        self,
+        journal_file: Optional[str] = None,
+        workers: int = DEFAULT_DELETE_WORKERS
+    ) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Recreate the folders removed by a journaled deletion.
+        
+        Args:
+            journal_file: Journal to undo (None = most recent one not undone yet)
+            workers: Maximum parallel restorations
+        
+        Returns:
+            Tuple of (restored_folders, failed_restorations_with_errors)
+        """
+        if journal_file is None:
+            latest = latest_journal(str(self.journal_dir)) if self.journal_dir else None
+            if latest is None:
+                self.logger.info("No deletion journal to undo")
+                return [], []
+            journal_file = str(latest)
+        
+        return JournalUndo(workers=workers).undo(journal_file)
+    
+    def quarantine_folders(
+        self,
+        folders: Optional[List[Path]] = None
+    ) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Move folders into quarantine instead of deleting them.
+        
+        Each folder is renamed into a holding directory on its own
+        filesystem (below the root of the last scan where possible), so this
+        is near-instant; restore_quarantine() puts them back and
+        purge_quarantine() deletes them for good.
+        
+        Args:
+            folders: Folders to quarantine (None = use scan results)
+        
+        Returns:
+            Tuple of (quarantined_folders, failed_with_errors)
+        """
+        if self.quarantine is None:
+            raise RuntimeError("Quarantine needs a cache directory")
+        if folders is None:
+            folders = self.empty_folders
+        
+        with self._lock:
+            session = self.last_session
+        root = Path(session.root_path) if session is not None else None
+        
+        quarantined, failed = self.quarantine.quarantine(folders, root=root)
+        
+        with self._lock:
+            if session is not None:
+                self._forget_deleted(session, quarantined)
+        return quarantined, failed
+    
+    def restore_quarantine(self, batch: Optional[str] = None) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Move quarantined folders back to their original locations.
+        
+        Args:
+            batch: Quarantine batch to restore (None = the most recent one)
+        
+        Returns:
+            Tuple of (restored_folders, failed_restorations_with_errors)
+        """
+        if self.quarantine is None:
+            raise RuntimeError("Quarantine needs a cache directory")
+        return self.quarantine.restore(batch)
+    
+    def purge_quarantine(self, older_than: Optional[float] = None) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Permanently delete quarantined folders.
+        
+        Args:
+            older_than: Only purge folders quarantined at least this many
+                seconds ago (None = everything)
+        
+        Returns:
+            Tuple of (purged_original_paths, failed_with_errors)
+        """
+        if self.quarantine is None:
+            raise RuntimeError("Quarantine needs a cache directory")
+        return self.quarantine.purge(older_than)
+    
+    def _forget_deleted(self, session: ScanSession, deleted: List[Path]):
+        """Keep the session's cascade index in step with removed folders."""
+        index = session.cascade_index
+        if index is None:
+            return
+        for folder in deleted:
+            index.pop(str(folder), None)
+            parent = str(folder.parent)
+            if parent in index:
+                index[parent] -= 1
+    
+    def get_deletion_summary(self) -> dict:
+        """Get throughput statistics of the last deletion run."""
+        with self._lock:
+            return self.last_deletion_stats.copy()
+    
+    def iter_results(self) -> Iterator[FolderRecord]:
+        """
+        Yield the last scan's results with the metadata recorded while
+        scanning (mtime, ctime, owner, inode and depth), without any stat.
+        """
+        # A consistent copy, so a concurrent revalidation cannot misalign them
+        with self._lock:
+            session = self.last_session
+            folders = list(self.empty_folders)
+            metadata = None
+            if session is not None and self.empty_folders is session.empty_folders:
+                metadata = session.metadata.copy()
+        
+        recorded = len(metadata) if metadata is not None else 0
+        root_depth = len(Path(session.root_path).parts) if session is not None else None
+        for index, folder in enumerate(folders):
+            if index < recorded:
+                yield metadata.record(index, folder)
+            else:
+                yield FolderRecord(folder, len(folder.parts) - root_depth if root_depth is not None else 0)
+    
+    def to_numpy(self, include_paths: bool = False) -> Dict[str, 'np.ndarray']:
+        """
+        Get the last scan's results as NumPy arrays (requires numpy).
+        
+        The arrays are built from the metadata recorded while scanning,
+        without a Python loop over the results; see
+        scan_analytics.result_arrays() for the columns.
+        
+        Args:
+            include_paths: Add a 'path' column of strings, which is the
+                only part that costs time in proportion to the results
+        """
+        metadata, folders = self._analytics_snapshot()
+        return result_arrays(metadata, folders if include_paths else None)
+    
+    def to_dataframe(self, include_paths: bool = True) -> 'pd.DataFrame':
+        """
+        Get the last scan's results as a pandas DataFrame (requires pandas).
+        
+        Args:
+            include_paths: Add a 'path' column; leave it out for reports
+                that only group by parent, depth, time or owner
+        """
+        metadata, folders = self._analytics_snapshot()
+        return result_dataframe(metadata, folders if include_paths else None)
+    
+    def _analytics_snapshot(self) -> Tuple[ResultMetadata, List[Path]]:
+        """Copy the last scan's results and metadata consistently."""
+        with self._lock:
+            session = self.last_session
+            if session is None or self.empty_folders is not session.empty_folders:
+                return ResultMetadata(), []
+            return session.metadata.copy(), list(self.empty_folders)
+    
     def get_scan_summary(self) -> dict:
         """Get summary of the last scan."""
-        return self.scan_results.copy()
+        with self._lock:
+            return self.scan_results.copy()
     
-    def export_results(self, output_file: str, format_type: str = 'txt') -> bool:
+    def export_results(
+        self,
+        output_file: str,
+        format_type: str = 'txt',
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        by_subtree: bool = False,
+        records: Optional[Iterable[FolderRecord]] = None,
+        summary: Optional[dict] = None
+    ) -> bool:
         """
         Export scan results to file.
         
+        To write results while a scan is still running, attach a
+        StreamingExporter to the session instead.
+        
         Args:
             output_file: Output file path
-            format_type: Format type ('txt', 'csv', 'json')
+            format_type: Format type ('txt', 'csv', 'json', 'parquet',
+                'sqlite', 'ndjson', 'ndjson.gz' or 'ndjson.zst')
+            max_rows: Split into shards of at most this many rows
+            max_bytes: Split into shards of about this many bytes
+            by_subtree: Split into shards per top-level folder of the scan
+            records: Results to export instead of the last scan's, e.g. the
+                records of a reopened ResultsSnapshot (not with by_subtree)
+            summary: Summary written with records (None = the last scan's)
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            output_path = Path(output_file)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                if summary is None:
+                    summary = self.scan_results.copy()
+                session = self.last_session
+                root = session.root_path if session is not None and records is None else None
+            if by_subtree and root is None:
+                raise ValueError("Partitioning by subtree needs a scan to take the root from")
+            writer = create_writer(
+                output_file,
+                format_type,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+                subtree_root=root if by_subtree else None
+            )
             
-            if format_type.lower() == 'txt':
-                self._export_txt(output_path)
-            elif format_type.lower() == 'csv':
-                self._export_csv(output_path)
-            elif format_type.lower() == 'json':
-                self._export_json(output_path)
-            else:
-                raise ValueError(f"Unsupported format: {format_type}")
+            writer.open(summary)
+            try:
+                # Metadata comes from the scan; nothing is stat'ed again
+                for record in self.iter_results() if records is None else records:
+                    writer.write(record)
+            finally:
+                writer.close()
             
-            self.logger.info(f"Results exported to: {output_path}")
+            self.logger.info(f"Results exported to: {writer.output_path}")
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to export results: {e}")
             return False
-    
-    def _export_txt(self, output_path: Path):
-        """Export results as text file."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("FolderPulse - Empty Folder Scan Results\n")
-            f.write("=" * 50 + "\n\n")
-            
-            # Summary
-            f.write("SCAN SUMMARY:\n")
-            f.write(f"Total folders scanned: {self.scan_results['total_folders']}\n")
-            f.write(f"Empty folders found: {self.scan_results['empty_folders']}\n")
-            f.write(f"Hidden folders: {self.scan_results['hidden_folders']}\n")
-            f.write(f"Scan time: {self.scan_results['scan_time']:.2f} seconds\n\n")
-            
-            # Empty folders list
-            f.write("EMPTY FOLDERS:\n")
-            f.write("-" * 20 + "\n")
-            for folder in self.empty_folders:
-                f.write(f"{folder}\n")
-    
-    def _export_csv(self, output_path: Path):
-        """Export results as CSV file."""
-        import csv
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Path', 'Type', 'Size'])
-            
-            for folder in self.empty_folders:
-                writer.writerow([str(folder), 'Empty Folder', '0'])
-    
-    def _export_json(self, output_path: Path):
-        """Export results as JSON file."""
-        import json
-        data = {
-            'scan_summary': self.scan_results,
-            'empty_folders': [str(folder) for folder in self.empty_folders]
-        }
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    
\ No newline at end of file
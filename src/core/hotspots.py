@@ -0,0 +1,138 @@
+"""
+Hotspots
+Prefix-trie rollup of where empty folders concentrate in a scanned tree.
+"""
+
+import os
+import heapq
+from typing import Dict, List
+
+
+# Subtrees reported by default
+DEFAULT_HOTSPOT_TOP = 20
+
+# Trie nodes kept before deeper directories are folded into their ancestors
+DEFAULT_HOTSPOT_MAX_NODES = 100_000
+
+# Smallest subtree reported; a lone empty folder is always 100% dense
+MIN_HOTSPOT_DIRECTORIES = 10
+
+
+class HotspotRollup:
+    """
+    Count directories and empty folders per subtree while a scan runs.
+    
+    The trie holds one node per directory down to max_depth below the
+    root, keyed by path; deeper directories are counted at their ancestor
+    on that level. Each directory costs one dictionary lookup (plus a
+    split of the path when it lies below max_depth), and the subtree
+    totals are added up once, in report(), so the whole rollup is linear
+    in the number of directories.
+    
+    Memory is bounded by max_nodes: once the trie is full, directories
+    that would need a new node are counted at their nearest ancestor in
+    the trie. Subtree totals stay exact; only the resolution is lost.
+    """
+    
+    def __init__(self, root_path: str, max_depth: int, max_nodes: int = DEFAULT_HOTSPOT_MAX_NODES):
+        """
+        Start an empty rollup.
+        
+        Args:
+            root_path: Scanned root, as the scan session spells it
+            max_depth: Deepest level below the root that gets its own node
+            max_nodes: Maximum number of trie nodes
+        """
+        if max_depth < 1:
+            raise ValueError(f"Hotspot depth must be at least 1: {max_depth}")
+        self.root_path = root_path
+        self.max_depth = max_depth
+        self.max_nodes = max(max_nodes, 1)
+        self.folded = 0  # Directories counted at an ancestor because the trie was full
+        # Index of the separator that follows the root in every path below it
+        self._prefix_length = len(root_path.rstrip(os.sep))
+        # path -> [depth, directories, empty folders] counted at that node
+        self._nodes: Dict[str, List[int]] = {root_path: [0, 0, 0]}
+    
+    def __len__(self) -> int:
+        """Number of trie nodes."""
+        return len(self._nodes)
+    
+    def add(self, path: str, depth: int, is_empty: bool):
+        """
+        Count one scanned directory.
+        
+        Args:
+            path: Directory path, below the root (or the root itself)
+            depth: Levels below the root
+            is_empty: Whether the directory is an empty folder
+        """
+        if depth > self.max_depth:
+            # Cut the path after max_depth components below the root
+            end = self._prefix_length
+            for _ in range(self.max_depth):
+                end = path.find(os.sep, end + 1)
+            path = path[:end]
+            depth = self.max_depth
+        
+        node = self._nodes.get(path)
+        if node is None:
+            if len(self._nodes) < self.max_nodes:
+                node = self._nodes[path] = [depth, 0, 0]
+            else:
+                self.folded += 1
+                node = self._nodes[self._nearest_node(path)]
+        node[1] += 1
+        if is_empty:
+            node[2] += 1
+    
+    def report(self, top: int = DEFAULT_HOTSPOT_TOP, min_directories: int = MIN_HOTSPOT_DIRECTORIES) -> List[dict]:
+        """
+        Rank subtrees by their density of empty folders.
+        
+        Args:
+            top: Number of subtrees to report
+            min_directories: Leave out subtrees with fewer directories
+        
+        Returns:
+            Up to `top` dictionaries with path, depth, empty_folders,
+            total_folders and density (empty / total), densest first and,
+            at equal density, the most empty folders first. The root itself
+            is not ranked. Nested subtrees are ranked independently, so a
+            dense folder and its dense parent can both appear.
+        """
+        # Subtree totals, added up from the deepest level towards the root
+        totals = {path: [node[1], node[2]] for path, node in self._nodes.items()}
+        levels: List[List[str]] = [[] for _ in range(self.max_depth + 1)]
+        for path, node in self._nodes.items():
+            levels[node[0]].append(path)
+        for level in reversed(levels[1:]):
+            for path in level:
+                parent = totals[self._nearest_node(path[:path.rfind(os.sep)])]
+                parent[0] += totals[path][0]
+                parent[1] += totals[path][1]
+        
+        candidates = (
+            (empty / total, empty, path)
+            for path, (total, empty) in totals.items()
+            if total >= min_directories and path != self.root_path
+        )
+        return [
+            {
+                'path': path,
+                'depth': self._nodes[path][0],
+                'empty_folders': empty,
+                'total_folders': totals[path][0],
+                'density': density
+            }
+            for density, empty, path in heapq.nlargest(top, candidates)
+        ]
+    
+    def _nearest_node(self, path: str) -> str:
+        """Closest existing node at or above path; the root always exists."""
+        while path not in self._nodes:
+            cut = path.rfind(os.sep)
+            if cut <= self._prefix_length:
+                return self.root_path
+            path = path[:cut]
+        return path
@@ -0,0 +1,277 @@
+"""
+I/O Governor
+Rate, concurrency and latency limits for filesystem operations, with accounting.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+
+# Multiplicative decrease and additive increase of the adaptive limit
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.1
+MIN_THROTTLE = 0.05
+
+# Seconds between adaptive adjustments
+ADJUST_INTERVAL = 0.5
+
+# Weight of the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.2
+
+
+class IOGovernor:
+    """
+    Throttle filesystem operations shared by scans and deletions.
+    
+    Every operation takes a token from a token bucket (ops/sec limit) and a
+    slot under a concurrency cap before it runs. With a latency target set,
+    the governor backs off multiplicatively whenever the smoothed operation
+    latency exceeds it and recovers additively while latency stays below, in
+    the manner of TCP congestion control (AIMD); both the rate and the
+    concurrency cap scale with that factor.
+    
+    All operations are accounted per kind, along with time spent throttled
+    and the busiest one-second window, so adherence to an agreed I/O budget
+    can be shown after the fact.
+    """
+    
+    def __init__(
+        self,
+        max_ops_per_second: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        latency_target_ms: Optional[float] = None,
+        burst: Optional[float] = None
+    ):
+        """
+        Initialize the governor.
+        
+        Args:
+            max_ops_per_second: Operations allowed per second (None = unlimited)
+            max_concurrency: Operations allowed in flight (None = unlimited)
+            latency_target_ms: Back off when smoothed latency exceeds this
+                (None = fixed limits)
+            burst: Token bucket size (None = a tenth of a second of operations)
+        """
+        if max_ops_per_second is not None and max_ops_per_second <= 0:
+            raise ValueError("max_ops_per_second must be positive")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        self.logger = logging.getLogger(__name__)
+        self.max_ops_per_second = max_ops_per_second
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target_ms / 1000 if latency_target_ms else None
+        self.burst = burst if burst is not None else max(1.0, (max_ops_per_second or 0) * 0.1)
+        
+        self._lock = threading.Lock()
+        self._slot_available = threading.Condition(self._lock)
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._throttle = 1.0
+        self._last_adjust = self._last_refill
+        self._latency_avg: Optional[float] = None
+        
+        # Accounting
+        self._ops: Dict[str, list] = {}  # kind -> [count, errors, total_latency, max_latency]
+        self._throttled_time = 0.0
+        self._peak_in_flight = 0
+        self._backoffs = 0
+        self._window_start = int(self._last_refill)
+        self._window_ops = 0
+        self._peak_window_ops = 0
+    
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> Optional['IOGovernor']:
+        """
+        Build a governor from the 'io' configuration section.
+        
+        Returns:
+            An IOGovernor, or None when no limit is configured
+        """
+        config = config or {}
+        limits = {
+            'max_ops_per_second': config.get('max_ops_per_second'),
+            'max_concurrency': config.get('max_concurrency'),
+            'latency_target_ms': config.get('latency_target_ms')
+        }
+        if all(value is None for value in limits.values()):
+            return None
+        return cls(**limits)
+    
+    @property
+    def throttle(self) -> float:
+        """Current adaptive factor applied to the configured limits (1.0 = none)."""
+        return self._throttle
+    
+    @contextmanager
+    def operation(self, kind: str):
+        """
+        Run one governed filesystem operation.
+        
+        Usage:
+            with governor.operation('scandir'):
+                entries = list(os.scandir(path))
+        
+        Args:
+            kind: Name the operation is accounted under
+        """
+        self._acquire()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(kind, time.monotonic() - started, failed)
+    
+    def get_accounting(self) -> dict:
+        """
+        Get the operations performed so far and how the limits held.
+        
+        Returns:
+            Dictionary with configured limits, per-kind operation counts and
+            latencies, throttled time and observed peaks
+        """
+        with self._lock:
+            operations = {
+                kind: {
+                    'count': count,
+                    'errors': errors,
+                    'avg_latency_ms': total / count * 1000 if count else 0.0,
+                    'max_latency_ms': peak * 1000
+                }
+                for kind, (count, errors, total, peak) in self._ops.items()
+            }
+            return {
+                'limits': {
+                    'max_ops_per_second': self.max_ops_per_second,
+                    'max_concurrency': self.max_concurrency,
+                    'latency_target_ms': self.latency_target * 1000 if self.latency_target else None
+                },
+                'operations': operations,
+                'total_operations': sum(item['count'] for item in operations.values()),
+                'throttled_seconds': self._throttled_time,
+                'peak_in_flight': self._peak_in_flight,
+                'peak_ops_in_one_second': max(self._peak_window_ops, self._window_ops),
+                'backoffs': self._backoffs,
+                'throttle': self._throttle
+            }
+    
+    def _acquire(self):
+        """Wait for a token and a concurrency slot."""
+        waited = 0.0
+        
+        with self._lock:
+            while True:
+                limit = self._concurrency_limit()
+                if limit is not None and self._in_flight >= limit:
+                    began = time.monotonic()
+                    self._slot_available.wait()
+                    waited += time.monotonic() - began
+                    continue
+                
+                delay = self._take_token()
+                if delay <= 0:
+                    break
+                # Sleep without holding the lock, then re-check everything
+                self._lock.release()
+                try:
+                    time.sleep(delay)
+                finally:
+                    self._lock.acquire()
+                waited += delay
+            
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            self._throttled_time += waited
+            
+            second = int(time.monotonic())
+            if second != self._window_start:
+                self._peak_window_ops = max(self._peak_window_ops, self._window_ops)
+                self._window_start = second
+                self._window_ops = 0
+            self._window_ops += 1
+    
+    def _take_token(self) -> float:
+        """Take a token if one is available; otherwise return the wait for one (lock held)."""
+        if self.max_ops_per_second is None:
+            return 0.0
+        
+        rate = self.max_ops_per_second * self._throttle
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+        
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / rate
+    
+    def _concurrency_limit(self) -> Optional[int]:
+        """Concurrency cap after adaptive throttling (lock held)."""
+        if self.max_concurrency is None:
+            return None
+        return max(1, int(self.max_concurrency * self._throttle))
+    
+    def _release(self, kind: str, latency: float, failed: bool):
+        """Free the slot, account the operation and adapt the limits."""
+        with self._lock:
+            self._in_flight -= 1
+            
+            stats = self._ops.get(kind)
+            if stats is None:
+                stats = self._ops[kind] = [0, 0, 0.0, 0.0]
+            stats[0] += 1
+            stats[2] += latency
+            if latency > stats[3]:
+                stats[3] = latency
+            if failed:
+                stats[1] += 1
+            
+            if self.latency_target is not None:
+                self._adapt(latency)
+            
+            self._slot_available.notify()
+    
+    def _adapt(self, latency: float):
+        """AIMD adjustment of the throttle factor (lock held)."""
+        if self._latency_avg is None:
+            self._latency_avg = latency
+        else:
+            self._latency_avg += LATENCY_SMOOTHING * (latency - self._latency_avg)
+        
+        now = time.monotonic()
+        if now - self._last_adjust < ADJUST_INTERVAL:
+            return
+        self._last_adjust = now
+        
+        if self._latency_avg > self.latency_target:
+            throttle = max(MIN_THROTTLE, self._throttle * BACKOFF_FACTOR)
+            if throttle < self._throttle:
+                self._backoffs += 1
+                self.logger.info(
+                    f"I/O latency {self._latency_avg * 1000:.1f}ms above target, "
+                    f"throttling to {throttle:.0%}"
+                )
+            self._throttle = throttle
+        elif self._throttle < 1.0:
+            self._throttle = min(1.0, self._throttle + RECOVERY_STEP)
+            # A raised cap may admit waiting operations
+            self._slot_available.notify_all()
+
+
+def governed(governor: Optional[IOGovernor], kind: str):
+    """
+    Context for one filesystem operation under an optional governor.
+    
+    Args:
+        governor: Governor to go through, or None for no limits
+        kind: Name the operation is accounted under
+    """
+    return governor.operation(kind) if governor is not None else nullcontext()
@@ -0,0 +1,138 @@
+"""
+Permission Cache
+Persistent record of directories the scanner could not read.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class PermissionCache:
+    """
+    Negative cache of unreadable directories, stored as JSON.
+    
+    Each directory that raised PermissionError is remembered together with
+    its inode number, modification time and change time. A later scan skips
+    it without trying to open it as long as all three still match; any
+    change to the directory itself (including chmod, chown or ACL changes,
+    which update the change time) makes it be probed again. The cache
+    belongs to the user that wrote it and is ignored by anyone else.
+    """
+    
+    def __init__(self, cache_file: str):
+        self.logger = logging.getLogger(__name__)
+        self.cache_file = Path(cache_file)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[int]] = {}  # path -> [st_ino, st_mtime_ns, st_ctime_ns]
+        self._dirty = False
+        self.load()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def load(self):
+        """Load the cache from disk; a missing, corrupt or foreign file starts empty."""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Failed to load permission cache: {e}")
+            return
+        if data.get('uid') == _current_user():
+            self._entries = data.get('entries', {})
+    
+    def save(self):
+        """Write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({'uid': _current_user(), 'entries': self._entries})
+            self._dirty = False
+        # Replaced in one step, so a crash or a concurrent run never leaves a torn file
+        temp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to save permission cache: {e}")
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+    
+    def is_known_unreadable(self, path: str) -> bool:
+        """
+        Check whether a directory is known to be unreadable and unchanged.
+        
+        Costs a dictionary lookup for directories not in the cache and one
+        lstat (never an open) for those that are.
+        
+        Args:
+            path: Directory path
+        
+        Returns:
+            True if the directory can be skipped
+        """
+        with self._lock:
+            key = self._entries.get(path)
+        if key is None:
+            return False
+        
+        try:
+            # Not DirEntry.stat(): it reports no inode numbers on Windows
+            stat_result = os.lstat(path)
+        except OSError:
+            stat_result = None
+        if stat_result is not None and _stat_key(stat_result) == key:
+            return True
+        
+        # Gone or changed: probe it again
+        with self._lock:
+            self._entries.pop(path, None)
+            self._dirty = True
+        return False
+    
+    def add(self, paths: List[str]):
+        """
+        Remember directories that just raised PermissionError.
+        
+        Args:
+            paths: Directory paths to remember
+        """
+        added = {}
+        for path in paths:
+            try:
+                added[path] = _stat_key(os.lstat(path))
+            except OSError:
+                continue
+        if added:
+            with self._lock:
+                self._entries.update(added)
+                self._dirty = True
+    
+    def clear(self):
+        """Forget every directory, so the next scan probes them all again."""
+        with self._lock:
+            self._entries = {}
+            self._dirty = True
+        self.save()
+
+
+def _stat_key(stat_result: os.stat_result) -> List[int]:
+    """Identity and change markers of a directory."""
+    return [stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_ctime_ns]
+
+
+def _current_user() -> Optional[int]:
+    """Effective user id, where the platform has one."""
+    return os.geteuid() if hasattr(os, 'geteuid') else None
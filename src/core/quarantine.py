@@ -0,0 +1,345 @@
+"""
+Quarantine Manager
+Reversible cleanup: move folders aside with one rename each, purge or restore later.
+"""
+
+import os
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .folder_deleter import BulkDeleter, DEFAULT_DELETE_WORKERS
+from .io_governor import IOGovernor, governed
+
+
+# Name of the holding directory created on each filesystem; scans never enter it
+QUARANTINE_DIR_NAME = '.folderpulse_quarantine'
+
+
+class QuarantineManager:
+    """
+    Move folders into a per-filesystem holding directory instead of deleting them.
+    
+    A rename within one filesystem is a single metadata operation no matter
+    how large the tree, so quarantining is near-instant and fully reversible.
+    Holding directories never span filesystems, so renames never cross
+    devices: folders below a given root on the root's filesystem are held
+    directly below it, anything else below the topmost writable ancestor
+    on its own filesystem (st_dev).
+    
+    Every quarantined folder is recorded in an NDJSON index, written and
+    fsync'd before the renames happen, mapping its holding location back to
+    its original path. Purging and restoring work on whole batches in
+    parallel.
+    """
+    
+    def __init__(
+        self,
+        index_file: str,
+        workers: int = DEFAULT_DELETE_WORKERS,
+        governor: Optional[IOGovernor] = None
+    ):
+        """
+        Initialize the manager and load its index.
+        
+        Args:
+            index_file: NDJSON index of quarantined folders
+            workers: Parallel renames or removals
+            governor: I/O governor all operations go through
+        """
+        self.logger = logging.getLogger(__name__)
+        self.index_file = Path(index_file)
+        self.workers = max(1, workers)
+        self.governor = governor
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}  # id -> {'original', 'holding', 'batch', 'time'}
+        self._holding_dirs: Dict[int, Path] = {}  # st_dev -> holding directory
+        self._load()
+    
+    def quarantine(
+        self,
+        folders: List[Path],
+        root: Optional[Path] = None
+    ) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Move folders into quarantine as one batch.
+        
+        Nested folders are moved deepest first, so each one is renamed on its
+        own and can be restored on its own.
+        
+        Args:
+            folders: Folders to quarantine
+            root: Preferred place for the holding directory, used for the
+                folders below it on the same filesystem (None = always the
+                topmost writable ancestor)
+        
+        Returns:
+            Tuple of (quarantined_folders, failed_with_errors)
+        """
+        batch = str(time.time_ns())
+        planned: List[dict] = []
+        failed: List[Tuple[Path, str]] = []
+        
+        unique = list(dict.fromkeys(Path(folder) for folder in folders))
+        for number, folder in enumerate(sorted(unique, key=lambda path: len(path.parts), reverse=True)):
+            try:
+                holding = self._holding_dir(folder, root) / batch
+            except OSError as e:
+                failed.append((folder, str(e)))
+                continue
+            planned.append({
+                'id': f"{batch}/{number}",
+                'original': str(folder),
+                'holding': str(holding / str(number)),
+                'batch': batch,
+                'time': time.time()
+            })
+        
+        # Holding directories first, so the index never maps a folder that cannot move
+        unavailable: Dict[str, str] = {}
+        for batch_dir in {os.path.dirname(entry['holding']) for entry in planned}:
+            try:
+                os.makedirs(batch_dir, exist_ok=True)
+            except OSError as e:
+                unavailable[batch_dir] = str(e)
+        if unavailable:
+            for entry in planned:
+                error = unavailable.get(os.path.dirname(entry['holding']))
+                if error is not None:
+                    failed.append((Path(entry['original']), error))
+            planned = [entry for entry in planned if os.path.dirname(entry['holding']) not in unavailable]
+        
+        # Write-ahead: the mapping is durable before anything moves
+        self._append([dict(entry, op='quarantine') for entry in planned])
+        with self._lock:
+            for entry in planned:
+                self._entries[entry['id']] = entry
+        
+        quarantined: List[Path] = []
+        moved_ids = set()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="folderpulse-quarantine") as executor:
+            for wave in self._waves(planned, deepest_first=True):
+                for entry, error in zip(wave, executor.map(self._move_in, wave)):
+                    if error:
+                        failed.append((Path(entry['original']), error))
+                    else:
+                        quarantined.append(Path(entry['original']))
+                        moved_ids.add(entry['id'])
+        
+        # Forget what never moved
+        unmoved = [entry for entry in planned if entry['id'] not in moved_ids]
+        self._append([{'op': 'forget', 'id': entry['id']} for entry in unmoved])
+        with self._lock:
+            for entry in unmoved:
+                del self._entries[entry['id']]
+        
+        self.logger.info(f"Quarantined {len(quarantined)} folders (batch {batch}), {len(failed)} failed")
+        return quarantined, failed
+    
+    def restore(self, batch: Optional[str] = None) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Move quarantined folders back to where they came from.
+        
+        Args:
+            batch: Batch to restore (None = the most recent one)
+        
+        Returns:
+            Tuple of (restored_folders, failed_with_errors)
+        """
+        entries = self._batch_entries(batch)
+        restored: List[Path] = []
+        failed: List[Tuple[Path, str]] = []
+        done = []
+        
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="folderpulse-quarantine") as executor:
+            # Parents first, so nested folders find their original parent again
+            for wave in self._waves(entries, deepest_first=False):
+                for entry, error in zip(wave, executor.map(self._move_out, wave)):
+                    if error:
+                        failed.append((Path(entry['original']), error))
+                    else:
+                        restored.append(Path(entry['original']))
+                        done.append(entry)
+        
+        self._finish(done, 'restored')
+        self.logger.info(f"Restored {len(restored)} quarantined folders, {len(failed)} failed")
+        return restored, failed
+    
+    def purge(self, older_than: Optional[float] = None) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+        """
+        Permanently delete quarantined folders.
+        
+        Args:
+            older_than: Only purge folders quarantined at least this many
+                seconds ago (None = everything)
+        
+        Returns:
+            Tuple of (original_paths_purged, failed_with_errors)
+        """
+        cutoff = time.time() - older_than if older_than is not None else None
+        with self._lock:
+            entries = [
+                entry for entry in self._entries.values()
+                if cutoff is None or entry['time'] <= cutoff
+            ]
+        
+        by_holding = {Path(entry['holding']): entry for entry in entries}
+        deleter = BulkDeleter(workers=self.workers, governor=self.governor)
+        deleted, failed = deleter.delete(list(by_holding), dry_run=False)
+        
+        # Folders already gone count as purged
+        failed_paths = {folder for folder, _ in failed}
+        done = [entry for holding, entry in by_holding.items() if holding not in failed_paths]
+        self._finish(done, 'purged')
+        
+        # Drop batch directories that are now empty
+        for batch_dir in {Path(entry['holding']).parent for entry in done}:
+            try:
+                batch_dir.rmdir()
+            except OSError:
+                pass
+        
+        self.logger.info(f"Purged {len(done)} quarantined folders, {len(failed)} failed")
+        return (
+            [Path(entry['original']) for entry in done],
+            [(Path(by_holding[folder]['original']), error) for folder, error in failed]
+        )
+    
+    def list_batches(self) -> List[dict]:
+        """
+        Summarize the batches currently in quarantine.
+        
+        Returns:
+            List of {'batch', 'folders', 'time'} dictionaries, oldest first
+        """
+        batches: Dict[str, dict] = {}
+        with self._lock:
+            for entry in self._entries.values():
+                info = batches.setdefault(entry['batch'], {'batch': entry['batch'], 'folders': 0, 'time': entry['time']})
+                info['folders'] += 1
+        return sorted(batches.values(), key=lambda info: info['batch'])
+    
+    def _holding_dir(self, folder: Path, root: Optional[Path] = None) -> Path:
+        """Holding directory on the folder's filesystem (cached per device)."""
+        parent = folder.parent
+        device = os.lstat(parent).st_dev
+        if root is not None:
+            root = Path(os.path.abspath(root))
+            if root in Path(os.path.abspath(folder)).parents and os.lstat(root).st_dev == device:
+                return root / QUARANTINE_DIR_NAME
+        
+        with self._lock:
+            holding = self._holding_dirs.get(device)
+        if holding is not None:
+            return holding
+        
+        # Climb to the topmost writable ancestor on the same device
+        base = None
+        current = Path(os.path.abspath(parent))
+        while True:
+            if os.access(current, os.W_OK):
+                base = current
+            up = current.parent
+            if up == current:
+                break
+            try:
+                if os.lstat(up).st_dev != device:
+                    break
+            except OSError:
+                break
+            current = up
+        if base is None:
+            raise PermissionError(f"No writable directory on the filesystem of {folder}")
+        
+        holding = base / QUARANTINE_DIR_NAME
+        with self._lock:
+            return self._holding_dirs.setdefault(device, holding)
+    
+    @staticmethod
+    def _waves(entries: List[dict], deepest_first: bool) -> List[List[dict]]:
+        """Split entries into depth levels of their original paths."""
+        levels: Dict[int, List[dict]] = {}
+        for entry in entries:
+            levels.setdefault(len(Path(entry['original']).parts), []).append(entry)
+        return [levels[depth] for depth in sorted(levels, reverse=deepest_first)]
+    
+    def _move_in(self, entry: dict) -> Optional[str]:
+        """Rename one folder into its holding location."""
+        try:
+            with governed(self.governor, 'rename'):
+                os.rename(entry['original'], entry['holding'])
+        except OSError as e:
+            self.logger.debug(f"Failed to quarantine {entry['original']}: {e}")
+            return str(e)
+        return None
+    
+    def _move_out(self, entry: dict) -> Optional[str]:
+        """Rename one folder back; refuses to overwrite anything recreated meanwhile."""
+        original = entry['original']
+        try:
+            if os.path.lexists(original):
+                if not os.path.lexists(entry['holding']):
+                    return None  # Recorded ahead of a rename that never happened
+                raise FileExistsError(f"{original} exists again")
+            with governed(self.governor, 'rename'):
+                os.rename(entry['holding'], original)
+        except OSError as e:
+            self.logger.error(f"Failed to restore {original}: {e}")
+            return str(e)
+        return None
+    
+    def _batch_entries(self, batch: Optional[str]) -> List[dict]:
+        """Entries of a batch, or of the newest batch."""
+        with self._lock:
+            if batch is None:
+                if not self._entries:
+                    return []
+                batch = max(entry['batch'] for entry in self._entries.values())
+            return [entry for entry in self._entries.values() if entry['batch'] == batch]
+    
+    def _finish(self, entries: List[dict], op: str):
+        """Record that entries left the quarantine."""
+        self._append([{'op': op, 'id': entry['id']} for entry in entries])
+        with self._lock:
+            for entry in entries:
+                self._entries.pop(entry['id'], None)
+            if not self._entries:
+                # Nothing left to map back; start the index afresh
+                self.index_file.unlink(missing_ok=True)
+    
+    # Index persistence
+    
+    def _load(self):
+        """Replay the index."""
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write at the end
+                    if event.get('op') == 'quarantine':
+                        event.pop('op')
+                        self._entries[event['id']] = event
+                    else:
+                        self._entries.pop(event.get('id'), None)
+        except OSError as e:
+            self.logger.warning(f"Failed to load quarantine index: {e}")
+            return
+    
+    def _append(self, events: List[dict]):
+        """Append events to the index with a single fsync."""
+        if not events:
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(event) + '\n' for event in events))
+                f.flush()
+                os.fsync(f.fileno())
@@ -0,0 +1,243 @@
+"""
+Results Snapshot
+Versioned binary snapshot of scan results that is read through mmap.
+"""
+
+import os
+import json
+import mmap
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .exporters import ResultWriter, RECORD_BATCH_SIZE, WRITE_BUFFER_SIZE
+from .scan_session import FolderRecord
+
+
+SNAPSHOT_MAGIC = b'FPSNAP\r\n'
+SNAPSHOT_VERSION = 2
+
+# magic, version, reserved, record size, created (ns since the epoch),
+# record count, and offset of the record table, string pool and summary,
+# followed by the summary length
+HEADER = struct.Struct('<8sHHIqQQQQQ')
+
+# Fixed-size record: path offset in the pool, mtime_ns, ctime_ns, inode,
+# path length, depth and uid, padded to a multiple of 8 bytes
+RECORD = struct.Struct('<QqqQIiI4x')
+
+# Stand-ins for metadata that could not be read
+MISSING_MTIME = -2 ** 63
+MISSING_INODE = 2 ** 64 - 1
+MISSING_UID = 2 ** 32 - 1
+
+
+class SnapshotWriter(ResultWriter):
+    """
+    Write results as a snapshot that ResultsSnapshot can map and read lazily.
+    
+    Layout: header, a table of fixed-size records, a pool of UTF-8 paths
+    (undecodable names are kept with surrogateescape, as os.fsencode does)
+    and the summary as JSON. The record table goes straight into the file
+    while the paths are collected in a temporary spool, so the file is
+    written in one pass with constant memory. It is built under a
+    temporary name and moved into place when complete, so readers never
+    see a half-written snapshot.
+    """
+    
+    needs_metadata = True
+    
+    def open(self, summary: Optional[dict] = None):
+        """Start a snapshot next to its final location."""
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer so concurrent scans do not share a temporary file
+        self._temp_path = self.output_path.with_name(
+            f"{self.output_path.name}.{os.getpid()}-{threading.get_ident()}-{id(self)}.tmp"
+        )
+        self._file = open(self._temp_path, 'wb', buffering=WRITE_BUFFER_SIZE)
+        self._file.write(bytes(HEADER.size))
+        self._pool = tempfile.TemporaryFile(dir=str(self.output_path.parent), buffering=WRITE_BUFFER_SIZE)
+        self._table = bytearray()
+        self._paths: List[bytes] = []
+        self._pool_size = 0
+        self._summary = summary
+        self._summary_written = summary is not None
+    
+    def write(self, record: FolderRecord):
+        """Add one empty folder."""
+        path = os.fsencode(str(record.path))
+        self._table += RECORD.pack(
+            self._pool_size,
+            MISSING_MTIME if record.mtime_ns is None else record.mtime_ns,
+            MISSING_MTIME if record.ctime_ns is None else record.ctime_ns,
+            MISSING_INODE if record.inode is None else record.inode,
+            len(path),
+            record.depth,
+            MISSING_UID if record.uid is None else record.uid
+        )
+        self._paths.append(path)
+        self._pool_size += len(path)
+        if len(self._paths) >= RECORD_BATCH_SIZE:
+            self._write_batch()
+    
+    def close(self, summary: Optional[dict] = None):
+        """Append the paths and the summary, fill in the header and publish."""
+        if self._file is None:
+            return
+        try:
+            self._write_batch()
+            pool_offset = HEADER.size + self.records_written * RECORD.size
+            self._pool.seek(0)
+            shutil.copyfileobj(self._pool, self._file, WRITE_BUFFER_SIZE)
+            
+            summary_data = json.dumps(
+                self._summary if self._summary_written else summary, ensure_ascii=False, default=str
+            ).encode('utf-8')
+            self._file.write(summary_data)
+            self._file.seek(0)
+            self._file.write(HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, RECORD.size, time.time_ns(),
+                self.records_written, HEADER.size, pool_offset,
+                pool_offset + self._pool_size, len(summary_data)
+            ))
+            self._file.close()
+            os.replace(self._temp_path, self.output_path)
+        finally:
+            self._pool.close()
+            if not self._file.closed:
+                self._file.close()
+            self._file = None
+            if self._temp_path.exists():
+                self._temp_path.unlink()
+    
+    def discard(self):
+        """Drop the snapshot being written, leaving the published one in place."""
+        if self._file is None:
+            return
+        self._pool.close()
+        self._file.close()
+        self._file = None
+        if self._temp_path.exists():
+            self._temp_path.unlink()
+    
+    def _write_batch(self):
+        if self._paths:
+            self._file.write(self._table)
+            self._pool.write(b''.join(self._paths))
+            self.records_written += len(self._paths)
+            self.bytes_written += len(self._table) + sum(len(path) for path in self._paths)
+            self._table.clear()
+            self._paths.clear()
+
+
+class ResultsSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot written by SnapshotWriter.
+    
+    Opening only checks the header, so it takes the same few milliseconds
+    for ten results or ten million. Records are decoded one at a time when
+    they are asked for; the operating system pages the file in and out as
+    needed, so the process does not keep a copy of the results.
+    
+    Close the snapshot before a new one is written to the same path:
+    Windows does not replace a file that is still mapped.
+    
+    Usage:
+        with ResultsSnapshot('cache/last_scan.fpsnap') as snapshot:
+            first_page = list(snapshot.records(0, 500))
+    """
+    
+    def __init__(self, snapshot_file: str):
+        """
+        Map a snapshot.
+        
+        Args:
+            snapshot_file: Path of the snapshot
+        
+        Raises:
+            ValueError: If the file is not a snapshot this version can read
+        """
+        self.snapshot_path = Path(snapshot_file)
+        with open(self.snapshot_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"Not a FolderPulse snapshot: {snapshot_file}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            (magic, version, _, record_size, created_ns, self._count, self._table_offset,
+             self._pool_offset, self._summary_offset, self._summary_length) = HEADER.unpack_from(self._map)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a FolderPulse snapshot: {snapshot_file}")
+            if version != SNAPSHOT_VERSION or record_size != RECORD.size:
+                raise ValueError(f"Unsupported snapshot version {version}: {snapshot_file}")
+            if (self._table_offset + self._count * RECORD.size > self._pool_offset
+                    or self._summary_offset + self._summary_length > size):
+                raise ValueError(f"Truncated snapshot: {snapshot_file}")
+        except Exception:
+            self._map.close()
+            raise
+        
+        self.created = created_ns / 1e9
+        self._summary: Optional[dict] = None
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> FolderRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("snapshot index out of range")
+        return self._record(index)
+    
+    def __iter__(self) -> Iterator[FolderRecord]:
+        return self.records()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[FolderRecord]:
+        """
+        Yield the records in [start, stop), decoding them as they are consumed.
+        
+        Args:
+            start: Index of the first record
+            stop: Index after the last record (None = to the end)
+        """
+        stop = self._count if stop is None else min(stop, self._count)
+        for index in range(max(start, 0), stop):
+            yield self._record(index)
+    
+    @property
+    def summary(self) -> dict:
+        """Scan summary stored with the results, parsed on first use."""
+        if self._summary is None:
+            data = self._map[self._summary_offset:self._summary_offset + self._summary_length]
+            self._summary = json.loads(data.decode('utf-8')) if data else {}
+        return self._summary
+    
+    def close(self):
+        """Unmap the snapshot."""
+        self._map.close()
+    
+    def _record(self, index: int) -> FolderRecord:
+        offset, mtime_ns, ctime_ns, inode, length, depth, uid = RECORD.unpack_from(
+            self._map, self._table_offset + index * RECORD.size
+        )
+        start = self._pool_offset + offset
+        return FolderRecord(
+            Path(os.fsdecode(self._map[start:start + length])),
+            depth,
+            None if mtime_ns == MISSING_MTIME else mtime_ns,
+            None if uid == MISSING_UID else uid,
+            None if inode == MISSING_INODE else inode,
+            None if ctime_ns == MISSING_MTIME else ctime_ns
+        )
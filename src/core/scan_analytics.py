@@ -0,0 +1,251 @@
+"""
+Scan Analytics
+NumPy and pandas views of scan results, and vectorized reports over them.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.system_info import owner_name
+
+from .scan_session import ResultMetadata
+
+# Analytics need NumPy; DataFrames additionally need pandas. Both optional.
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+
+# Upper edges, in days, of the default age histogram buckets
+DEFAULT_AGE_BINS_DAYS = (1, 7, 30, 90, 365, 3 * 365)
+
+NS_PER_DAY = 86_400 * 10 ** 9
+
+# Largest span of owner ids that owner_rollup() counts with a direct table
+OWNER_TABLE_LIMIT = 1 << 20
+
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise ImportError("Scan analytics require numpy (pip install numpy)")
+
+
+def result_arrays(
+    metadata: ResultMetadata,
+    folders: Optional[Sequence[Path]] = None
+) -> Dict[str, 'np.ndarray']:
+    """
+    Expose result metadata as NumPy arrays.
+    
+    The numeric columns are views of the metadata's buffers, not copies,
+    so pass a ResultMetadata.copy() if the scan may still change it.
+    Missing times are NaT, missing owners -1 and missing inodes the
+    largest uint64.
+    
+    Args:
+        metadata: Columns recorded by a scan session
+        folders: Result paths, for a 'path' column of strings (None = no
+            path column; every other report works without it)
+    
+    Returns:
+        Dictionary of arrays: depth, mtime, ctime (datetime64[ns]), uid,
+        inode, parent_id and parents (parents[parent_id] is the parent
+        directory), plus path when folders are given
+    """
+    _require_numpy()
+    columns = {
+        'depth': np.frombuffer(metadata.depth, dtype=np.int32),
+        'mtime': np.frombuffer(metadata.mtime_ns, dtype='datetime64[ns]'),
+        'ctime': np.frombuffer(metadata.ctime_ns, dtype='datetime64[ns]'),
+        'uid': np.frombuffer(metadata.uid, dtype=np.int64),
+        'inode': np.frombuffer(metadata.inode, dtype=np.uint64),
+        'parent_id': np.frombuffer(metadata.parent, dtype=np.int32),
+        'parents': np.array(metadata.parents, dtype=object)
+    }
+    if folders is not None:
+        paths = np.array(folders[:len(metadata)], dtype=object)
+        columns['path'] = paths.astype(str) if len(paths) else np.array([], dtype=str)
+    return columns
+
+
+def result_dataframe(
+    metadata: ResultMetadata,
+    folders: Optional[Sequence[Path]] = None
+) -> 'pd.DataFrame':
+    """
+    Build a DataFrame of the results from their recorded metadata.
+    
+    Parents and owners are categorical (each distinct value is stored once)
+    and uid/inode are nullable integers, so missing metadata shows as NA.
+    
+    Args:
+        metadata: Columns recorded by a scan session
+        folders: Result paths, for a 'path' column (None = leave it out)
+    
+    Returns:
+        DataFrame with path (when folders are given), parent, depth, mtime,
+        ctime, uid, owner and inode columns
+    """
+    if not PANDAS_AVAILABLE:
+        raise ImportError("DataFrames require pandas (pip install pandas)")
+    columns = result_arrays(metadata, folders)
+    
+    uid = columns['uid']
+    inode = columns['inode']
+    # Names are looked up once per distinct owner, not per row
+    owners, owner_codes, _ = _owner_codes(uid)
+    names = np.array([owner_name(int(owner)) if owner >= 0 else '' for owner in owners], dtype=object)
+    categories, name_codes = np.unique(names, return_inverse=True)
+    owner_codes = np.where(uid < 0, -1, name_codes[owner_codes])
+    
+    data = {}
+    if 'path' in columns:
+        data['path'] = pd.array(columns['path'], dtype='string')
+    data.update({
+        'parent': pd.Categorical.from_codes(columns['parent_id'], categories=pd.Index(columns['parents'])),
+        'depth': columns['depth'],
+        'mtime': columns['mtime'],
+        'ctime': columns['ctime'],
+        'uid': pd.arrays.IntegerArray(uid, uid < 0),
+        'owner': pd.Categorical.from_codes(owner_codes, categories=pd.Index(categories, dtype=object)),
+        'inode': pd.arrays.IntegerArray(inode, inode == np.uint64(ResultMetadata.MISSING_INODE))
+    })
+    return pd.DataFrame(data)
+
+
+def _owner_codes(uid: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """Distinct owner ids in order, each row's index into them, and counts."""
+    if not len(uid):
+        return uid[:0], np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    low, high = int(uid.min()), int(uid.max())
+    if high - low >= OWNER_TABLE_LIMIT:
+        return np.unique(uid, return_inverse=True, return_counts=True)
+    # Owner ids are usually few and close together: index a table by id
+    # instead of sorting every row
+    counts = np.bincount(uid - low, minlength=high - low + 1)
+    owners = np.nonzero(counts)[0]
+    table = np.zeros(len(counts), dtype=np.intp)
+    table[owners] = np.arange(len(owners))
+    return owners + low, table[uid - low], counts[owners]
+
+
+def age_histogram(
+    columns: Dict[str, 'np.ndarray'],
+    bins_days: Sequence[float] = DEFAULT_AGE_BINS_DAYS,
+    now: Optional[float] = None
+) -> List[Tuple[str, int]]:
+    """
+    Count results by time since last modification.
+    
+    Args:
+        columns: Arrays from result_arrays()
+        bins_days: Increasing upper bucket edges in days; a final open
+            bucket catches everything older
+        now: Reference time in seconds since the epoch (None = now)
+    
+    Returns:
+        List of (bucket label, count), youngest first; results whose mtime
+        is unknown are left out
+    """
+    _require_numpy()
+    mtime = columns['mtime'].view(np.int64)
+    known = mtime[mtime != ResultMetadata.MISSING_TIME]
+    now_ns = int((time.time() if now is None else now) * 1e9)
+    ages = (now_ns - known) / NS_PER_DAY
+    
+    edges = np.array([-np.inf, *bins_days, np.inf])
+    counts = np.histogram(ages, bins=edges)[0]
+    
+    labels = [f"< {_days(bins_days[0])}"]
+    labels += [f"{_days(low)} - {_days(high)}" for low, high in zip(bins_days, bins_days[1:])]
+    labels.append(f">= {_days(bins_days[-1])}")
+    return list(zip(labels, counts.tolist()))
+
+
+def _days(days: float) -> str:
+    if days >= 365 and days % 365 == 0:
+        return f"{days // 365:g}y"
+    return f"{days:g}d"
+
+
+def counts_by_depth(columns: Dict[str, 'np.ndarray']) -> Dict[int, int]:
+    """
+    Count results at each depth below the scanned folder.
+    
+    Returns:
+        Dictionary of depth -> count, for depths that have results
+    """
+    _require_numpy()
+    counts = np.bincount(columns['depth'])
+    depths = np.nonzero(counts)[0]
+    return dict(zip(depths.tolist(), counts[depths].tolist()))
+
+
+def top_parents(columns: Dict[str, 'np.ndarray'], k: int = 10) -> List[Tuple[str, int]]:
+    """
+    Find the parent directories holding the most empty folders.
+    
+    Args:
+        columns: Arrays from result_arrays()
+        k: Number of parents to report
+    
+    Returns:
+        List of (parent path, empty child count), largest first
+    """
+    _require_numpy()
+    counts = np.bincount(columns['parent_id'], minlength=len(columns['parents']))
+    k = min(k, len(counts))
+    if k <= 0:
+        return []
+    # Partial selection is linear; only the k winners are sorted
+    top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(-counts[top], kind='stable')]
+    # Parents whose results were all dropped (e.g. by revalidation) stay numbered
+    return [(columns['parents'][index], int(counts[index])) for index in top if counts[index]]
+
+
+def owner_rollup(columns: Dict[str, 'np.ndarray']) -> List[dict]:
+    """
+    Summarize results per owner.
+    
+    Returns:
+        One dictionary per owner with uid, owner (name), count, oldest and
+        newest mtime (datetime64, NaT if unknown), most results first;
+        results with unknown owner are grouped under uid -1
+    """
+    _require_numpy()
+    uid = columns['uid']
+    if not len(uid):
+        return []
+    mtime = columns['mtime'].view(np.int64)
+    owners, codes, counts = _owner_codes(uid)
+    
+    # Missing times must not win the minimum or the maximum
+    known = mtime != ResultMetadata.MISSING_TIME
+    oldest = np.full(len(owners), np.iinfo(np.int64).max)
+    newest = np.full(len(owners), ResultMetadata.MISSING_TIME, dtype=np.int64)
+    np.minimum.at(oldest, codes[known], mtime[known])
+    np.maximum.at(newest, codes[known], mtime[known])
+    oldest[oldest == np.iinfo(np.int64).max] = ResultMetadata.MISSING_TIME
+    
+    rollup = [
+        {
+            'uid': int(owner),
+            'owner': owner_name(int(owner)) if owner >= 0 else '',
+            'count': int(count),
+            'oldest_mtime': np.datetime64(int(first), 'ns'),
+            'newest_mtime': np.datetime64(int(last), 'ns')
+        }
+        for owner, count, first, last in zip(owners, counts, oldest, newest)
+    ]
+    rollup.sort(key=lambda row: row['count'], reverse=True)
+    return rollup
@@ -0,0 +1,222 @@
+"""
+Scan Estimator
+Quick statistical estimates of directory and empty-folder counts on huge trees.
+"""
+
+import os
+import math
+import random
+import logging
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .io_governor import governed
+
+
+class ScanEstimator:
+    """
+    Estimate the size of a directory tree by sampling instead of scanning it.
+    
+    The top levels are enumerated exactly (stratification) until a level grows
+    too wide; below that, random-walk probes in the style of Knuth's tree-size
+    estimator are started from uniformly chosen frontier directories. Each probe
+    gives an unbiased estimate, so the mean over many probes converges on the
+    true counts and their spread yields a confidence interval.
+    """
+    
+    def __init__(
+        self,
+        scanner,
+        scan_hidden: bool = False,
+        ignore_patterns: Optional[List[str]] = None,
+        max_exact_nodes: int = 1000,
+        max_exact_depth: int = 3,
+        max_cache_entries: int = 100000,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the estimator.
+        
+        Args:
+            scanner: EmptyFolderScanner providing the emptiness logic
+            scan_hidden: Whether to include hidden files/folders in emptiness check
+            ignore_patterns: Patterns to ignore (same meaning as for scans)
+            max_exact_nodes: Widest level that is still enumerated exactly
+            max_exact_depth: Deepest level that is enumerated exactly
+            max_cache_entries: Listings remembered across probes
+            seed: Random seed for reproducible estimates
+        """
+        self.logger = logging.getLogger(__name__)
+        self.scanner = scanner
+        self.scan_hidden = scan_hidden
+        self.ignore_patterns = list(ignore_patterns) if ignore_patterns is not None else []
+        self.max_exact_nodes = max_exact_nodes
+        self.max_exact_depth = max_exact_depth
+        self.max_cache_entries = max_cache_entries
+        self.random = random.Random(seed)
+        self._cache: Dict[str, Optional[Tuple[bool, List[str]]]] = {}
+        self._listings = 0
+        self._listing_time = 0.0
+    
+    def estimate(
+        self,
+        root_path: str,
+        time_budget: float = 5.0,
+        confidence: float = 0.95,
+        max_probes: Optional[int] = None
+    ) -> dict:
+        """
+        Estimate total and empty folder counts below a root.
+        
+        Args:
+            root_path: Root directory to estimate
+            time_budget: Seconds to spend sampling
+            confidence: Confidence level of the reported intervals
+            max_probes: Stop after this many probes even if time remains
+        
+        Returns:
+            Dictionary with point estimates, confidence intervals and the
+            projected duration of a full serial scan
+        """
+        if not os.path.isdir(root_path):
+            raise NotADirectoryError(f"Path is not a directory: {root_path}")
+        
+        start_time = time.monotonic()
+        deadline = start_time + time_budget
+        
+        exact_total, exact_empty, frontier, exact_levels = self._enumerate_top_levels(root_path)
+        
+        total_samples: List[float] = []
+        empty_samples: List[float] = []
+        while frontier and time.monotonic() < deadline:
+            if max_probes is not None and len(total_samples) >= max_probes:
+                break
+            start = self.random.choice(frontier)
+            probe_total, probe_empty = self._probe(start)
+            total_samples.append(len(frontier) * probe_total)
+            empty_samples.append(len(frontier) * probe_empty)
+        
+        total = self._interval(exact_total, total_samples, confidence, bool(frontier))
+        empty = self._interval(exact_empty, empty_samples, confidence, bool(frontier))
+        
+        # Intervals can never go below what has actually been seen
+        observed_total = sum(1 for listing in self._cache.values() if listing is not None)
+        observed_empty = sum(1 for listing in self._cache.values() if listing is not None and listing[0])
+        total = (total[0], max(total[1], observed_total), total[2])
+        empty = (empty[0], max(empty[1], observed_empty), empty[2])
+        
+        seconds_per_listing = self._listing_time / self._listings if self._listings else 0.0
+        estimate = {
+            'estimated_total_folders': total[0],
+            'total_folders_ci': (total[1], total[2]),
+            'estimated_empty_folders': empty[0],
+            'empty_folders_ci': (empty[1], empty[2]),
+            'confidence': confidence,
+            'exact': not frontier,
+            'exact_levels': exact_levels,
+            'probes': len(total_samples),
+            'directories_listed': self._listings,
+            'sample_time': time.monotonic() - start_time,
+            'estimated_scan_time': total[0] * seconds_per_listing
+        }
+        
+        self.logger.info(
+            f"Estimated {estimate['estimated_total_folders']:.0f} folders "
+            f"({estimate['estimated_empty_folders']:.0f} empty) below {root_path} "
+            f"from {estimate['probes']} probes"
+        )
+        return estimate
+    
+    def _enumerate_top_levels(self, root_path: str) -> Tuple[int, int, List[str], int]:
+        """
+        Count the top levels exactly.
+        
+        Returns:
+            Tuple of (exact_total, exact_empty, frontier, levels_enumerated)
+        """
+        exact_total = 0
+        exact_empty = 0
+        level = [root_path]
+        depth = 0
+        
+        while level and depth <= self.max_exact_depth and len(level) <= self.max_exact_nodes:
+            next_level = []
+            for path in level:
+                listing = self._listing(path)
+                if listing is None:
+                    continue
+                is_empty, children = listing
+                exact_total += 1
+                if is_empty:
+                    exact_empty += 1
+                next_level.extend(children)
+            level = next_level
+            depth += 1
+        
+        return exact_total, exact_empty, level, depth
+    
+    def _probe(self, start: str) -> Tuple[float, float]:
+        """Random walk from start; returns unbiased (total, empty) estimates of its subtree."""
+        weight = 1.0
+        total = 0.0
+        empty = 0.0
+        path = start
+        
+        while True:
+            listing = self._listing(path)
+            if listing is None:
+                break
+            is_empty, children = listing
+            total += weight
+            if is_empty:
+                empty += weight
+            if not children:
+                break
+            weight *= len(children)
+            path = self.random.choice(children)
+        
+        return total, empty
+    
+    def _listing(self, path: str) -> Optional[Tuple[bool, List[str]]]:
+        """List a directory once and reuse the result across probes."""
+        if path in self._cache:
+            return self._cache[path]
+        
+        started = time.perf_counter()
+        try:
+            with governed(self.scanner.io_governor, 'scandir'), os.scandir(path) as it:
+                entries = list(it)
+            is_empty = self.scanner._is_listing_empty(entries, self.scan_hidden, self.ignore_patterns)
+            children = [entry.path for entry in self.scanner._subdirectories(entries, self.ignore_patterns)]
+            listing = (is_empty, children)
+        except OSError as e:
+            self.logger.debug(f"Cannot sample directory {path}: {e}")
+            listing = None
+        self._listing_time += time.perf_counter() - started
+        self._listings += 1
+        
+        if len(self._cache) < self.max_cache_entries:
+            self._cache[path] = listing
+        return listing
+    
+    @staticmethod
+    def _interval(
+        exact: int,
+        samples: List[float],
+        confidence: float,
+        sampled: bool
+    ) -> Tuple[float, float, float]:
+        """Point estimate with a normal-approximation confidence interval."""
+        if not sampled:
+            return float(exact), float(exact), float(exact)
+        if not samples:
+            return float(exact), float(exact), math.inf
+        
+        mean = statistics.fmean(samples)
+        if len(samples) < 2:
+            return exact + mean, float(exact), math.inf
+        
+        z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        margin = z * statistics.stdev(samples) / math.sqrt(len(samples))
+        return exact + mean, max(float(exact), exact + mean - margin), exact + mean + margin
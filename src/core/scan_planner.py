@@ -0,0 +1,181 @@
+"""
+Scan Planner
+Chooses a scan engine and concurrency from the target filesystem and history.
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.system_info import available_cpus, filesystem_type, inode_usage
+
+
+ENGINES = ('serial', 'threads')
+
+# Filesystems where each directory listing is a network round trip
+NETWORK_FILESYSTEMS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', '9p', 'ceph', 'glusterfs',
+    'lustre', 'gpfs', 'beegfs', 'fuse.sshfs', 'fuse.glusterfs', 'fuse.rclone'
+}
+
+# Below this many directories thread start-up costs more than it saves
+SMALL_TREE_DIRECTORIES = 2000
+
+# Rough share of inodes that are directories on a typical filesystem
+DIRECTORY_INODE_RATIO = 0.1
+
+MAX_LOCAL_WORKERS = 8
+MAX_NETWORK_WORKERS = 32
+
+
+@dataclass
+class ScanPlan:
+    """The engine chosen for one scan and why."""
+    
+    engine: str
+    workers: int
+    reasons: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> dict:
+        """Plain representation for scan summaries."""
+        return {'engine': self.engine, 'workers': self.workers, 'reasons': list(self.reasons)}
+
+
+class ScanHistory:
+    """Persistent per-root record of past scans, stored as JSON."""
+    
+    def __init__(self, history_file: str):
+        self.logger = logging.getLogger(__name__)
+        self.history_file = Path(history_file)
+        self._lock = threading.Lock()
+        self._roots: Dict[str, dict] = {}
+        self.load()
+    
+    def load(self):
+        """Load history from disk; a missing or corrupt file starts empty."""
+        if not self.history_file.exists():
+            return
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                self._roots = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Failed to load scan history: {e}")
+            self._roots = {}
+    
+    def save(self):
+        """Write history to disk."""
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                data = json.dumps(self._roots)
+            with open(self.history_file, 'w', encoding='utf-8') as f:
+                f.write(data)
+        except OSError as e:
+            self.logger.warning(f"Failed to save scan history: {e}")
+    
+    def get(self, root_path: str) -> Optional[dict]:
+        """Get the history entry of a root."""
+        with self._lock:
+            entry = self._roots.get(root_path)
+            return copy.deepcopy(entry)
+    
+    def record(self, root_path: str, summary: dict):
+        """Remember the outcome of a finished scan."""
+        engine = summary.get('engine')
+        visited = summary.get('directories_visited', 0)
+        scan_time = summary.get('scan_time', 0)
+        
+        with self._lock:
+            entry = self._roots.setdefault(root_path, {'throughput': {}})
+            entry['last_scan'] = time.time()
+            if summary.get('coverage') == 1.0:
+                entry['total_folders'] = summary.get('total_folders', 0)
+            if engine and visited and scan_time > 0:
+                # Exponentially weighted directories per second, per engine
+                rate = visited / scan_time
+                previous = entry['throughput'].get(engine)
+                entry['throughput'][engine] = rate if previous is None else 0.7 * previous + 0.3 * rate
+        
+        self.save()
+
+
+class ScanPlanner:
+    """
+    Pick a scan engine and worker count before each scan.
+    
+    Inputs are the filesystem type, its inode usage (as a size proxy when the
+    root has never been scanned), the CPUs available under cgroup quotas and
+    the throughput observed by earlier scans of the same root.
+    """
+    
+    def __init__(self, history: Optional[ScanHistory] = None):
+        self.logger = logging.getLogger(__name__)
+        self.history = history
+    
+    def plan(self, root_path: str) -> ScanPlan:
+        """
+        Choose an engine for scanning a root.
+        
+        Args:
+            root_path: Root directory about to be scanned
+        
+        Returns:
+            The chosen ScanPlan, including the reasoning
+        """
+        reasons = []
+        cpus = available_cpus()
+        fs_type = filesystem_type(root_path)
+        is_network = fs_type in NETWORK_FILESYSTEMS if fs_type else False
+        reasons.append(f"{cpus} usable CPU(s), filesystem {fs_type or 'unknown'}")
+        
+        past = self.history.get(root_path) if self.history else None
+        
+        # Size of the tree: history first, whole-filesystem inode count otherwise
+        estimated_dirs = None
+        if past and past.get('total_folders') is not None:
+            estimated_dirs = past['total_folders']
+            reasons.append(f"previous scan saw {estimated_dirs} folders")
+        else:
+            inodes = inode_usage(root_path)
+            if inodes is not None:
+                estimated_dirs = int(inodes * DIRECTORY_INODE_RATIO)
+                reasons.append(f"{inodes} inodes in use, assuming up to {estimated_dirs} folders")
+        
+        if is_network:
+            workers = min(MAX_NETWORK_WORKERS, max(8, cpus * 4))
+            plan = ScanPlan('threads', workers, reasons)
+            reasons.append("network filesystem is latency bound, overlapping listings")
+        elif estimated_dirs is not None and estimated_dirs < SMALL_TREE_DIRECTORIES:
+            plan = ScanPlan('serial', 1, reasons)
+            reasons.append("small tree, threads would not pay off")
+        elif cpus < 2:
+            plan = ScanPlan('serial', 1, reasons)
+            reasons.append("single CPU available")
+        else:
+            plan = ScanPlan('threads', min(MAX_LOCAL_WORKERS, cpus), reasons)
+            reasons.append("large local tree, listing in parallel")
+        
+        # Measured throughput beats heuristics
+        throughput = past.get('throughput', {}) if past else {}
+        if all(engine in throughput for engine in ENGINES):
+            best = max(ENGINES, key=lambda engine: throughput[engine])
+            if best != plan.engine:
+                reasons.append(
+                    f"history shows {best} is faster here "
+                    f"({throughput[best]:.0f} vs {throughput[plan.engine]:.0f} dirs/s)"
+                )
+                plan.engine = best
+                plan.workers = 1 if best == 'serial' else max(plan.workers, 2)
+        
+        self.logger.info(f"Scan plan for {root_path}: {plan.engine} x{plan.workers} ({'; '.join(reasons)})")
+        return plan
+    
+    def record(self, root_path: str, summary: dict):
+        """Feed a finished scan back into the history."""
+        if self.history is not None:
+            self.history.record(root_path, summary)
@@ -0,0 +1,855 @@
+"""
+Scan Session
+Independent scan state so one scanner can run several scans concurrently.
+"""
+
+import os
+import heapq
+import logging
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from utils.system_info import current_rss_bytes
+
+from .io_governor import governed
+from .hotspots import HotspotRollup, DEFAULT_HOTSPOT_TOP, DEFAULT_HOTSPOT_MAX_NODES
+
+
+DEFAULT_IGNORE_PATTERNS = ['.git', '__pycache__', '.vscode', 'node_modules']
+
+# How often (in directories) the comparatively expensive RSS probe runs
+MEMORY_CHECK_INTERVAL = 256
+
+TRAVERSAL_ORDERS = ('depth_first', 'breadth_first', 'priority')
+SCAN_ENGINES = ('serial', 'threads', 'auto')
+TOP_K_KEYS = ('oldest', 'newest', 'deepest', 'busiest_parent')
+
+# Parallel listings used by the 'threads' engine when no count is given
+DEFAULT_THREAD_WORKERS = 8
+
+
+class FolderRecord(NamedTuple):
+    """An empty folder as delivered to result listeners."""
+    
+    path: Path
+    depth: int
+    mtime_ns: Optional[int] = None
+    uid: Optional[int] = None
+    inode: Optional[int] = None
+    ctime_ns: Optional[int] = None  # Creation time on Windows, inode change time elsewhere
+
+
+def folder_record(path: Path, depth: int, entry=None) -> FolderRecord:
+    """
+    Build a record with the folder's metadata.
+    
+    Uses the DirEntry of the folder when there is one, so the lstat is
+    shared with any other check of the same entry (on Windows it comes
+    with the directory listing and costs nothing). Metadata that cannot be
+    read is left as None.
+    """
+    try:
+        if entry is None:
+            stat_result = os.lstat(path)
+            inode = stat_result.st_ino
+        else:
+            stat_result = entry.stat(follow_symlinks=False)
+            # DirEntry.inode() is right on every platform; its stat() has no inode on Windows
+            inode = entry.inode()
+        return FolderRecord(
+            path, depth, stat_result.st_mtime_ns, stat_result.st_uid, inode, stat_result.st_ctime_ns
+        )
+    except OSError:
+        return FolderRecord(path, depth)
+
+
+class ResultMetadata:
+    """
+    Metadata of a session's results, in typed columns parallel to its
+    empty_folders list.
+    
+    Each result costs 40 bytes here instead of a tuple and five int objects,
+    and the columns can be handed to array libraries as buffers. Metadata
+    that could not be read is stored as a sentinel and reported as None.
+    Parents are numbered as they are first seen (parents[parent[i]] is the
+    parent directory of result i), so results can be grouped by parent
+    without touching a path string.
+    """
+    
+    MISSING_TIME = -2 ** 63
+    MISSING_UID = -1
+    MISSING_INODE = 2 ** 64 - 1
+    
+    COLUMNS = ('depth', 'mtime_ns', 'ctime_ns', 'uid', 'inode', 'parent')
+    
+    def __init__(self):
+        self.depth = array('i')
+        self.mtime_ns = array('q')
+        self.ctime_ns = array('q')
+        self.uid = array('q')
+        self.inode = array('Q')
+        self.parent = array('i')
+        self.parents: List[str] = []
+        self._parent_ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.depth)
+    
+    def append(self, record: FolderRecord, parent: str):
+        """
+        Store the metadata of the next result.
+        
+        Args:
+            record: The result with its metadata
+            parent: Path of the result's parent directory
+        """
+        parent_id = self._parent_ids.get(parent)
+        if parent_id is None:
+            parent_id = self._parent_ids[parent] = len(self.parents)
+            self.parents.append(parent)
+        self.parent.append(parent_id)
+        self.depth.append(record.depth)
+        if record.mtime_ns is None:
+            self.mtime_ns.append(self.MISSING_TIME)
+            self.ctime_ns.append(self.MISSING_TIME)
+            self.uid.append(self.MISSING_UID)
+            self.inode.append(self.MISSING_INODE)
+        else:
+            self.mtime_ns.append(record.mtime_ns)
+            self.ctime_ns.append(self.MISSING_TIME if record.ctime_ns is None else record.ctime_ns)
+            self.uid.append(record.uid)
+            self.inode.append(record.inode)
+    
+    def record(self, index: int, path: Path) -> FolderRecord:
+        """Rebuild the record of one result."""
+        mtime_ns = self.mtime_ns[index]
+        if mtime_ns == self.MISSING_TIME:
+            return FolderRecord(path, self.depth[index])
+        ctime_ns = self.ctime_ns[index]
+        return FolderRecord(
+            path, self.depth[index], mtime_ns, self.uid[index], self.inode[index],
+            None if ctime_ns == self.MISSING_TIME else ctime_ns
+        )
+    
+    def copy(self) -> 'ResultMetadata':
+        """Independent copy of the columns."""
+        duplicate = ResultMetadata()
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(duplicate, name, array(column.typecode, column))
+        duplicate.parents = list(self.parents)
+        duplicate._parent_ids = dict(self._parent_ids)
+        return duplicate
+    
+    def keep(self, indices: List[int]):
+        """Keep only the given results, in the given order."""
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, [column[index] for index in indices]))
+
+
+@dataclass
+class ScanOptions:
+    """
+    Options controlling a single scan session.
+    
+    Budgets are optional; when one runs out the scan stops cleanly and keeps
+    the results of every directory it finished.
+    
+    Attributes:
+        include_subdirectories: Whether to scan subdirectories recursively
+        scan_hidden: Whether to include hidden files/folders in emptiness check
+        ignore_patterns: Name patterns whose directories are skipped entirely
+        max_scan_time: Wall-clock budget in seconds
+        max_directories: Maximum number of directories to visit
+        max_memory_mb: Resident memory ceiling of the process in megabytes
+        traversal_order: 'depth_first' (like os.walk), 'breadth_first' (shallow
+            folders first) or 'priority' (by depth, then smallest sibling fan-out)
+        max_frontier: Maximum pending directories kept in breadth-first or
+            priority order; overflow is drained depth-first to bound memory
+        count_only: Census mode; keep totals and histograms but no paths
+        engine: 'serial', 'threads' (parallel listings) or 'auto' (let the
+            scanner's planner choose engine and workers before the scan)
+        workers: Parallel listings for the 'threads' engine
+        hotspot_depth: Roll up empty folders per subtree down to this many
+            levels below the root and rank the densest (None = off)
+        hotspot_top: Number of subtrees the hotspot report ranks
+        hotspot_max_nodes: Bound on the subtrees the rollup keeps apart
+        top_k: Keep only this many results, chosen by top_k_by while
+            scanning, instead of every empty folder (None = keep all)
+        top_k_by: 'oldest' or 'newest' (by modification time), 'deepest',
+            or 'busiest_parent' (most entries in the parent directory)
+        track_cascade: Record the directories holding only subdirectories, so
+            a cascading delete can be previewed (ignored by top-K and census scans)
+    """
+    
+    include_subdirectories: bool = True
+    scan_hidden: bool = False
+    ignore_patterns: List[str] = field(default_factory=lambda: list(DEFAULT_IGNORE_PATTERNS))
+    max_scan_time: Optional[float] = None
+    max_directories: Optional[int] = None
+    max_memory_mb: Optional[float] = None
+    traversal_order: str = 'depth_first'
+    max_frontier: Optional[int] = None
+    count_only: bool = False
+    engine: str = 'serial'
+    workers: Optional[int] = None
+    hotspot_depth: Optional[int] = None
+    hotspot_top: int = DEFAULT_HOTSPOT_TOP
+    hotspot_max_nodes: int = DEFAULT_HOTSPOT_MAX_NODES
+    top_k: Optional[int] = None
+    top_k_by: str = 'oldest'
+    track_cascade: bool = False
+    
+    def __post_init__(self):
+        """Validate option values."""
+        if self.traversal_order not in TRAVERSAL_ORDERS:
+            raise ValueError(f"Unsupported traversal order: {self.traversal_order}")
+        if self.engine not in SCAN_ENGINES:
+            raise ValueError(f"Unsupported scan engine: {self.engine}")
+        if self.hotspot_depth is not None and self.hotspot_depth < 1:
+            raise ValueError(f"Hotspot depth must be at least 1: {self.hotspot_depth}")
+        if self.top_k_by not in TOP_K_KEYS:
+            raise ValueError(f"Unsupported top-K key: {self.top_k_by}")
+        if self.top_k is not None and (self.top_k < 1 or self.count_only):
+            raise ValueError("top_k must be at least 1 and needs a scan that records results")
+
+
+class ScanCensus:
+    """
+    Aggregate counters of a count-only scan.
+    
+    Memory depends only on the maximum depth and the number of fan-out
+    buckets, never on the number of directories scanned.
+    """
+    
+    def __init__(self):
+        self.by_depth: Dict[int, Dict[str, int]] = {}
+        self.fanout_histogram: Dict[int, int] = {}
+    
+    def add(self, depth: int, is_empty: bool, is_hidden: bool, fanout: int):
+        """Count one scanned directory."""
+        counts = self.by_depth.get(depth)
+        if counts is None:
+            counts = self.by_depth[depth] = {'total': 0, 'empty': 0, 'hidden': 0}
+        counts['total'] += 1
+        if is_empty:
+            counts['empty'] += 1
+        if is_hidden:
+            counts['hidden'] += 1
+        
+        # Power-of-two buckets: 0, 1, 2-3, 4-7, ...
+        bucket = fanout.bit_length()
+        self.fanout_histogram[bucket] = self.fanout_histogram.get(bucket, 0) + 1
+    
+    @staticmethod
+    def bucket_label(bucket: int) -> str:
+        """Human readable range of a fan-out bucket."""
+        if bucket == 0:
+            return '0'
+        low, high = 1 << (bucket - 1), (1 << bucket) - 1
+        return str(low) if low == high else f"{low}-{high}"
+    
+    def to_dict(self) -> dict:
+        """Histograms by depth and by subdirectory fan-out."""
+        return {
+            'by_depth': {depth: dict(self.by_depth[depth]) for depth in sorted(self.by_depth)},
+            'by_fanout': {
+                self.bucket_label(bucket): self.fanout_histogram[bucket]
+                for bucket in sorted(self.fanout_histogram)
+            }
+        }
+
+
+class TopResults:
+    """
+    The best k results of a scan by one key, kept in a min-heap.
+    
+    Memory is O(k) whatever the number of results: a result only enters
+    the heap by pushing out the current worst one, and nothing is sorted
+    until results() sorts the k survivors. Results whose key is unknown
+    (no modification time) are counted but not ranked.
+    """
+    
+    def __init__(self, k: int, key: str):
+        self.k = k
+        self.key = key
+        self.found = 0
+        self._heap = []
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def add(self, record: FolderRecord, parent_size: int = 0):
+        """
+        Offer one result.
+        
+        Args:
+            record: The empty folder with its metadata
+            parent_size: Entries in its parent directory ('busiest_parent')
+        """
+        self.found += 1
+        if self.key == 'deepest':
+            rank = record.depth
+        elif self.key == 'busiest_parent':
+            rank = parent_size
+        elif record.mtime_ns is None:
+            return
+        else:
+            rank = record.mtime_ns if self.key == 'newest' else -record.mtime_ns
+        
+        # Earlier results win ties, so the selection does not depend on heap order
+        item = (rank, -self.found, record)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+    
+    def results(self) -> List[FolderRecord]:
+        """The kept results, best first."""
+        return [item[2] for item in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+
+class _Frontier:
+    """
+    Pending directories in the configured traversal order.
+    
+    Items are (path, entry, depth) tuples. Breadth-first and priority orders
+    can hold a whole tree level in memory, so once max_size is reached new
+    items go to an overflow stack that is drained depth-first before the main
+    queue resumes. That keeps memory bounded by max_size plus depth x fan-out.
+    """
+    
+    def __init__(self, order: str, max_size: Optional[int] = None):
+        self.order = order
+        self.max_size = max_size
+        self._stack = []
+        self._queue = deque()
+        self._heap = []
+        self._overflow = []
+        self._sequence = 0
+    
+    def __len__(self) -> int:
+        """Number of pending directories."""
+        return len(self._stack) + len(self._queue) + len(self._heap) + len(self._overflow)
+    
+    def push_children(self, children: list, depth: int):
+        """Add the subdirectories of one directory, all at the given depth."""
+        if self.order == 'depth_first':
+            # Reversed so children pop in listing order, like os.walk
+            self._stack.extend((child.path, child, depth) for child in reversed(children))
+            return
+        
+        main_size = len(self._queue) + len(self._heap)
+        if self.max_size is not None and main_size + len(children) > self.max_size:
+            self._overflow.extend((child.path, child, depth) for child in reversed(children))
+            return
+        
+        if self.order == 'breadth_first':
+            self._queue.extend((child.path, child, depth) for child in children)
+        else:
+            fanout = len(children)
+            for child in children:
+                self._sequence += 1
+                heapq.heappush(self._heap, (depth, fanout, self._sequence, (child.path, child, depth)))
+    
+    def push_root(self, path: str, depth: int = 0):
+        """Add the scan root."""
+        if self.order == 'depth_first':
+            self._stack.append((path, None, depth))
+        elif self.order == 'breadth_first':
+            self._queue.append((path, None, depth))
+        else:
+            heapq.heappush(self._heap, (depth, 0, 0, (path, None, depth)))
+    
+    def pop(self) -> tuple:
+        """Remove and return the next directory to visit."""
+        if self._overflow:
+            return self._overflow.pop()
+        if self._stack:
+            return self._stack.pop()
+        if self._queue:
+            return self._queue.popleft()
+        return heapq.heappop(self._heap)[3]
+
+
+class ScanSession:
+    """
+    A single scan of one root directory.
+    
+    Each session owns its results, counters, options and lifecycle. The scanner
+    that created it only provides shared, stateless helpers, so any number of
+    sessions may run at the same time from different threads.
+    """
+    
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+    
+    def __init__(self, scanner, root_path: str, options: Optional[ScanOptions] = None):
+        self.logger = logging.getLogger(__name__)
+        self.scanner = scanner
+        self.root_path = root_path
+        self.options = options or ScanOptions()
+        self.status = self.PENDING
+        self.error: Optional[Exception] = None
+        self.empty_folders: List[Path] = []
+        self.metadata = ResultMetadata()  # Parallel to empty_folders
+        self.scan_results = {
+            'total_folders': 0,
+            'empty_folders': 0,
+            'hidden_folders': 0,
+            'scan_time': 0,
+            'status': self.PENDING,
+            'budget_exhausted': None,
+            'directories_visited': 0,
+            'directories_pending': 0,
+            'coverage': 0.0,
+            'traversal_order': self.options.traversal_order,
+            'time_to_first_result': None,
+            'engine': None,
+            'workers': None,
+            'plan': None,
+            'unreadable_directories': 0,
+            'unreadable_skipped': 0
+        }
+        self.census: Optional[ScanCensus] = ScanCensus() if self.options.count_only else None
+        self.hotspots: Optional[HotspotRollup] = None
+        if self.options.hotspot_depth is not None:
+            self.hotspots = HotspotRollup(
+                str(Path(root_path)), self.options.hotspot_depth, self.options.hotspot_max_nodes
+            )
+        self.top_results: Optional[TopResults] = None
+        # Listed directories -> [entries, subdirectories not yet visited], so
+        # a result can be ranked by the size of its parent
+        self._parent_sizes: Optional[Dict[str, List[int]]] = None
+        if self.options.top_k is not None:
+            self.top_results = TopResults(self.options.top_k, self.options.top_k_by)
+            if self.options.top_k_by == 'busiest_parent':
+                self._parent_sizes = {}
+        # Directories holding nothing but subdirectories -> entry count, so a
+        # cascading delete can be previewed without listing them again. Only
+        # kept on request, and never by top-K and census scans, whose memory
+        # must not grow with the tree
+        self.cascade_index: Optional[Dict[str, int]] = None
+        if self.options.track_cascade and self.options.top_k is None and not self.options.count_only:
+            self.cascade_index = {}
+        self._denied: List[str] = []  # Appended from listing threads
+        self._result_listeners: List[Callable[[FolderRecord], None]] = []
+        self._completion_listeners: List[Callable[['ScanSession'], None]] = []
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+    
+    def run(self) -> List[Path]:
+        """
+        Run the scan in the calling thread.
+        
+        Returns:
+            List of empty folder paths found by this session
+        """
+        if self.status != self.PENDING:
+            raise RuntimeError(f"Scan session already {self.status}: {self.root_path}")
+        
+        start_time = time.time()
+        self._started = time.monotonic()
+        self._deadline = None
+        if self.options.max_scan_time is not None:
+            self._deadline = time.monotonic() + self.options.max_scan_time
+        self._set_status(self.RUNNING)
+        self.logger.info(f"Starting empty folder scan: {self.root_path}")
+        
+        try:
+            root = Path(self.root_path)
+            if not root.exists():
+                raise FileNotFoundError(f"Directory does not exist: {self.root_path}")
+            
+            if not root.is_dir():
+                raise NotADirectoryError(f"Path is not a directory: {self.root_path}")
+            
+            self._choose_engine()
+            self._scan_tree(root)
+            self._report_unreadable()
+            if self.top_results is not None:
+                self._publish_top_results()
+            
+            self.scan_results['scan_time'] = time.time() - start_time
+            if self.census is not None:
+                self.scan_results['census'] = self.census.to_dict()
+            elif self.top_results is not None:
+                self.scan_results['empty_folders'] = self.top_results.found
+            else:
+                self.scan_results['empty_folders'] = len(self.empty_folders)
+            if self.hotspots is not None:
+                self.scan_results['hotspots'] = self.hotspots.report(self.options.hotspot_top)
+            if self.scanner.io_governor is not None:
+                self.scan_results['io'] = self.scanner.io_governor.get_accounting()
+            self._set_status(self.CANCELLED if self.is_cancelled() else self.COMPLETED)
+            
+            self.logger.info(f"Scan {self.status}. Found {self.scan_results['empty_folders']} empty folders")
+            if self.scan_results['time_to_first_result'] is not None:
+                self.logger.info(f"First result after {self.scan_results['time_to_first_result']:.3f}s")
+            if self.scan_results['budget_exhausted']:
+                self.logger.warning(
+                    f"Scan budget exhausted ({self.scan_results['budget_exhausted']}): "
+                    f"covered {self.scan_results['coverage']:.1%} of discovered directories"
+                )
+            
+            # Only a walk of the whole tree says how large and fast the tree is
+            if self.status == self.COMPLETED and self._is_full_scan():
+                self.scanner.planner.record(self.root_path, self.scan_results)
+            return self.empty_folders.copy()
+        
+        except Exception as e:
+            self.error = e
+            self.scan_results['scan_time'] = time.time() - start_time
+            self._set_status(self.FAILED)
+            self.logger.error(f"Error during scan: {e}")
+            raise
+        finally:
+            for callback in self._completion_listeners:
+                try:
+                    callback(self)
+                except Exception as e:
+                    self.logger.error(f"Completion listener failed: {e}")
+            self._done_event.set()
+    
+    def add_result_listener(self, callback: Callable[[FolderRecord], None]):
+        """
+        Register a callback invoked for every empty folder as soon as it is found.
+        
+        Callbacks run on the scanning thread and must be quick; hand the record
+        off to another thread (e.g. via a queue) for any heavy work. With
+        top_k the winners are only known at the end, so they are delivered
+        then, best first, instead of every result as it is found.
+        """
+        self._result_listeners.append(callback)
+    
+    def add_completion_listener(self, callback: Callable[['ScanSession'], None]):
+        """
+        Register a callback invoked with the session once it has finished.
+        
+        Callbacks run on the scanning thread after the final status and
+        summary are set, whether the scan completed, was cancelled or failed,
+        and before wait() returns.
+        """
+        self._completion_listeners.append(callback)
+    
+    def cancel(self):
+        """Ask a running scan to stop after the current directory."""
+        self._cancel_event.set()
+    
+    def is_cancelled(self) -> bool:
+        """Check whether cancellation was requested."""
+        return self._cancel_event.is_set()
+    
+    def is_finished(self) -> bool:
+        """Check whether the session has finished, successfully or not."""
+        return self._done_event.is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the session finishes. Returns False on timeout."""
+        return self._done_event.wait(timeout)
+    
+    def get_summary(self) -> dict:
+        """Get summary counters of this session."""
+        return self.scan_results.copy()
+    
+    def _set_status(self, status: str):
+        """Update the lifecycle state."""
+        self.status = status
+        self.scan_results['status'] = status
+    
+    def _is_full_scan(self) -> bool:
+        """
+        Check whether this is a plain recursive scan.
+        
+        Budget-limited scans still count: the history only takes folder
+        totals from scans that covered the whole tree.
+        """
+        options = self.options
+        return options.include_subdirectories and not options.count_only and options.top_k is None
+    
+    def _choose_engine(self):
+        """Resolve the engine and worker count, consulting the planner for 'auto'."""
+        engine = self.options.engine
+        workers = self.options.workers
+        
+        if engine == 'auto':
+            plan = self.scanner.planner.plan(self.root_path)
+            engine = plan.engine
+            workers = workers or plan.workers
+            self.scan_results['plan'] = plan.to_dict()
+        
+        if engine == 'threads':
+            workers = workers or DEFAULT_THREAD_WORKERS
+        else:
+            workers = 1
+        
+        self._workers = workers
+        self.scan_results['engine'] = engine
+        self.scan_results['workers'] = workers
+    
+    def _scan_tree(self, root: Path):
+        """
+        Walk the tree from an explicit frontier.
+        
+        Each directory is listed exactly once; the same listing decides its
+        emptiness and feeds its subdirectories to the frontier. Because all
+        pending work lives in the frontier, the scan can stop between any two
+        directories and still report consistent, partial results.
+        """
+        frontier = _Frontier(self.options.traversal_order, self.options.max_frontier)
+        
+        if self.options.include_subdirectories:
+            frontier.push_root(str(root))
+        else:
+            # Single level: only the direct subdirectories are evaluated
+            entries = self._list_directory(str(root))
+            children = self._subdirectories(entries or [])
+            if self._parent_sizes is not None and children:
+                self._parent_sizes[str(root)] = [len(entries), len(children)]
+            frontier.push_children(children, 1)
+        
+        if self._workers > 1:
+            visited = self._walk_parallel(frontier)
+        else:
+            visited = self._walk_serial(frontier)
+        
+        pending = len(frontier)
+        self.scan_results['directories_visited'] = visited
+        self.scan_results['directories_pending'] = pending
+        self.scan_results['coverage'] = visited / (visited + pending) if visited + pending else 1.0
+    
+    def _should_stop(self, visited: int) -> bool:
+        """Check cancellation and budgets before taking more work."""
+        if self.is_cancelled():
+            return True
+        
+        exhausted = self._check_budgets(visited)
+        if exhausted:
+            self.scan_results['budget_exhausted'] = exhausted
+            return True
+        
+        return False
+    
+    def _walk_serial(self, frontier: _Frontier) -> int:
+        """Visit directories one at a time in the calling thread."""
+        visited = 0
+        while frontier and not self._should_stop(visited):
+            path, entry, depth = frontier.pop()
+            if self._known_unreadable(path):
+                continue
+            visited += 1
+            self._visit(frontier, path, entry, depth, self._list_directory(path))
+        return visited
+    
+    def _walk_parallel(self, frontier: _Frontier) -> int:
+        """
+        List directories on the scanner's shared thread pool.
+        
+        Only the listing runs on worker threads (os.scandir releases the GIL);
+        all bookkeeping stays on this thread, so counters and listener calls
+        need no locking. At most `workers` listings are in flight at once.
+        """
+        executor = self.scanner._get_executor(self._workers)
+        in_flight = {}
+        visited = 0
+        stopping = False
+        
+        while frontier or in_flight:
+            while not stopping and frontier and len(in_flight) < self._workers:
+                if self._should_stop(visited):
+                    stopping = True
+                    break
+                item = frontier.pop()
+                if self._known_unreadable(item[0]):
+                    continue
+                visited += 1
+                in_flight[executor.submit(self._list_directory, item[0])] = item
+            
+            if not in_flight:
+                break
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, entry, depth = in_flight.pop(future)
+                self._visit(frontier, path, entry, depth, future.result())
+        
+        return visited
+    
+    def _visit(self, frontier: _Frontier, path: str, entry, depth: int, entries: Optional[list]):
+        """Record one listed directory and queue its subdirectories."""
+        parent_size = self._parent_size(path) if self._parent_sizes is not None else 0
+        if entries is None:
+            return
+        
+        recursive = self.options.include_subdirectories
+        if recursive or self.census is not None:
+            subdirs = self._subdirectories(entries)
+        
+        if self.census is not None:
+            self._count_directory(path, entry, depth, entries, len(subdirs))
+        else:
+            self._record_directory(path, entry, depth, entries, parent_size)
+        
+        if recursive:
+            if self._parent_sizes is not None and subdirs:
+                self._parent_sizes[path] = [len(entries), len(subdirs)]
+            frontier.push_children(subdirs, depth + 1)
+    
+    def _parent_size(self, path: str) -> int:
+        """Entry count of a visited directory's parent, forgotten after its last child."""
+        parent = os.path.dirname(path)
+        sizes = self._parent_sizes.get(parent)
+        if sizes is None:
+            return 0
+        sizes[1] -= 1
+        if sizes[1] <= 0:
+            del self._parent_sizes[parent]
+        return sizes[0]
+    
+    def _list_directory(self, path: str) -> Optional[list]:
+        """List a directory, returning None if it cannot be read."""
+        try:
+            with governed(self.scanner.io_governor, 'scandir'), os.scandir(path) as it:
+                return list(it)
+        except PermissionError as e:
+            self._denied.append(path)
+            self.logger.debug(f"Permission denied accessing: {path} - {e}")
+        except OSError as e:
+            self.logger.warning(f"Cannot read directory {path}: {e}")
+        return None
+    
+    def _known_unreadable(self, path: str) -> bool:
+        """Skip a directory that an earlier scan could not read and that has not changed since."""
+        cache = self.scanner.permission_cache
+        if cache is None or not cache.is_known_unreadable(path):
+            return False
+        if self._parent_sizes is not None:
+            self._parent_size(path)  # A skipped child is done with its parent too
+        self.scan_results['unreadable_skipped'] += 1
+        self.logger.debug(f"Skipping known unreadable directory: {path}")
+        return True
+    
+    def _report_unreadable(self):
+        """Remember newly denied directories and warn once about all of them."""
+        cache = self.scanner.permission_cache
+        if cache is not None and self._denied:
+            cache.add(self._denied)
+        if cache is not None:
+            cache.save()
+        
+        denied = len(self._denied)
+        skipped = self.scan_results['unreadable_skipped']
+        self.scan_results['unreadable_directories'] = denied + skipped
+        if denied or skipped:
+            self.logger.warning(
+                f"Could not read {denied + skipped} directories "
+                f"({skipped} known from earlier scans and skipped)"
+            )
+    
+    def _subdirectories(self, entries: list) -> list:
+        """Select the entries to descend into (real directories, not ignored)."""
+        return self.scanner._subdirectories(entries, self.options.ignore_patterns)
+    
+    def _record_directory(self, path: str, entry, depth: int, entries: list, parent_size: int = 0):
+        """Update counters and results for one scanned directory."""
+        scanner = self.scanner
+        is_empty = scanner._is_listing_empty(entries, self.options.scan_hidden, self.options.ignore_patterns)
+        if self.hotspots is not None:
+            self.hotspots.add(path, depth, is_empty)
+        
+        if is_empty:
+            folder = Path(path)
+            if self.scan_results['time_to_first_result'] is None:
+                self.scan_results['time_to_first_result'] = time.monotonic() - self._started
+            self.logger.debug(f"Found empty folder: {folder}")
+            
+            # The only stat of the result; everything downstream reuses it
+            record = folder_record(folder, depth, entry)
+            if self.top_results is not None:
+                self.top_results.add(record, parent_size)
+            else:
+                self.empty_folders.append(folder)
+                self.metadata.append(record, os.path.dirname(path))
+                if self._result_listeners:
+                    self._notify(record)
+        
+        elif self.cascade_index is not None and self._only_subdirectories(entries):
+            self.cascade_index[str(Path(path))] = len(entries)
+        
+        self.scan_results['total_folders'] += 1
+        
+        # Track hidden folders
+        if scanner._is_hidden(entry if entry is not None else Path(path)):
+            self.scan_results['hidden_folders'] += 1
+    
+    @staticmethod
+    def _only_subdirectories(entries: list) -> bool:
+        """Check whether every entry of a listing is a real directory."""
+        try:
+            return all(item.is_dir(follow_symlinks=False) for item in entries)
+        except OSError:
+            return False
+    
+    def _count_directory(self, path: str, entry, depth: int, entries: list, fanout: int):
+        """Census mode: update counters only, without creating any Path objects."""
+        scanner = self.scanner
+        is_empty = scanner._is_listing_empty(entries, self.options.scan_hidden, self.options.ignore_patterns)
+        is_hidden = bool(scanner._is_hidden(entry if entry is not None else Path(path)))
+        
+        self.scan_results['total_folders'] += 1
+        if is_empty:
+            self.scan_results['empty_folders'] += 1
+        if is_hidden:
+            self.scan_results['hidden_folders'] += 1
+        self.census.add(depth, is_empty, is_hidden, fanout)
+        if self.hotspots is not None:
+            self.hotspots.add(path, depth, is_empty)
+    
+    def _publish_top_results(self):
+        """Make the kept top-K results the session's results, best first."""
+        for record in self.top_results.results():
+            self.empty_folders.append(record.path)
+            self.metadata.append(record, os.path.dirname(str(record.path)))
+            if self._result_listeners:
+                self._notify(record)
+        self.scan_results['top_k'] = self.options.top_k
+        self.scan_results['top_k_by'] = self.options.top_k_by
+        self.logger.info(
+            f"Kept {len(self.top_results)} of {self.top_results.found} empty folders "
+            f"(top {self.options.top_k} by {self.options.top_k_by})"
+        )
+    
+    def _notify(self, record: FolderRecord):
+        """Deliver a result to the listeners without letting them break the scan."""
+        for callback in self._result_listeners:
+            try:
+                callback(record)
+            except Exception as e:
+                self.logger.error(f"Result listener failed for {record.path}: {e}")
+    
+    def _check_budgets(self, visited: int) -> Optional[str]:
+        """Return the name of the first exhausted budget, if any."""
+        options = self.options
+        
+        if options.max_directories is not None and visited >= options.max_directories:
+            return 'directories'
+        
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return 'time'
+        
+        if options.max_memory_mb is not None and visited % MEMORY_CHECK_INTERVAL == 0:
+            rss = current_rss_bytes()
+            if rss is not None and rss > options.max_memory_mb * 1024 * 1024:
+                return 'memory'
+        
+        return None
@@ -6,29 +6,57 @@ The primary user interface for the FolderPulse application.
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import logging
+import queue
 import threading
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Set
 from core.folder_scanner import EmptyFolderScanner
+from core.exporters import format_from_path
+from core.scan_session import FolderRecord
 
 
 class MainWindow:
     """Main application window."""
     
+    # How often, and how many, streamed scan results are moved into the tree
+    STREAM_INTERVAL_MS = 100
+    STREAM_BATCH_SIZE = 500
+    
+    # Rows of the last scan's snapshot added to the tree at a time
+    SNAPSHOT_PAGE_SIZE = 500
+    
+    # How often background deletion progress is refreshed
+    QUEUE_POLL_MS = 1000
+    
     def __init__(self, root: tk.Tk, app_manager):
         self.root = root
         self.app_manager = app_manager
         self.logger = logging.getLogger(__name__)
         
         # Initialize scanner
-        self.scanner = EmptyFolderScanner()
+        self.scanner = EmptyFolderScanner(
+            cache_dir=self.app_manager.get_config("paths.cache_directory", "cache"),
+            io_governor=self.app_manager.components.get('io_governor')
+        )
+        self.app_manager.components['scanner'] = self.scanner
+        self.current_session = None
+        self._queue_polling = False
+        self._queued_folders: Set[Path] = set()  # Submitted to the deletion queue, not yet finished
+        self._streamed_results = queue.SimpleQueue()
         self.scan_results = []
         self.selected_folders = []
+        self.snapshot = None
+        self._snapshot_rows_shown = 0
+        self._snapshot_page_pending = False
+        self._snapshot_stale: Set[Path] = set()  # Snapshot results a refresh found gone
         
         # Initialize UI components
         self.setup_ui()
         self.setup_menu()
         self.setup_events()
+        
+        # Show the previous scan's results until a new scan is started
+        self._open_last_snapshot()
     
     def setup_ui(self):
         """Set up the main user interface."""
@@ -351,7 +379,8 @@ class MainWindow:
         # Modern scrollbars
         v_scrollbar = ttk.Scrollbar(tree_container, orient=tk.VERTICAL, command=self.results_tree.yview)
         h_scrollbar = ttk.Scrollbar(tree_container, orient=tk.HORIZONTAL, command=self.results_tree.xview)
-        self.results_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.results_v_scrollbar = v_scrollbar
+        self.results_tree.configure(yscrollcommand=self._on_results_scroll, xscrollcommand=h_scrollbar.set)
         
         # Grid layout for better control
         self.results_tree.grid(row=0, column=0, sticky="nsew")
@@ -421,7 +450,36 @@ class MainWindow:
             command=self.delete_selected,
             style="Accent.TButton",
             width=15
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(
+            action_buttons,
+            text="⏳ Queue Delete",
+            command=self.queue_delete_selected,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(
+            action_buttons,
+            text="📦 Quarantine",
+            command=self.quarantine_selected,
+            width=15
+        ).pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(
+            action_buttons,
+            text="↩️ Undo Last Delete",
+            command=self.undo_last_delete,
+            width=18
         ).pack(side=tk.LEFT)
+        
+        self.cascade_delete_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            action_frame,
+            text="Also delete parent folders left empty",
+            variable=self.cascade_delete_var,
+            style="Modern.TCheckbutton"
+        ).pack(anchor=tk.W, pady=(8, 0))
     
     def create_settings_tab(self):
         """Create the settings tab."""
@@ -575,6 +633,14 @@ class MainWindow:
         scan_menu.add_command(label="Select All Results", command=self.select_all_results)
         scan_menu.add_command(label="Select None", command=self.select_none_results)
         
+        # Quarantine menu
+        quarantine_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Quarantine", menu=quarantine_menu)
+        quarantine_menu.add_command(label="Quarantine Selected", command=self.quarantine_selected)
+        quarantine_menu.add_command(label="Restore Last Quarantine", command=self.restore_last_quarantine)
+        quarantine_menu.add_separator()
+        quarantine_menu.add_command(label="Purge Quarantine...", command=self.purge_quarantine)
+        
         # View menu
         view_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="View", menu=view_menu)
@@ -626,32 +692,73 @@ class MainWindow:
         # Clear previous results
         self.clear_scan_results(update_summary=False)
         
+        # Each scan runs as its own session so it can be cancelled independently
+        self.current_session = self.scanner.create_session(
+            path,
+            include_subdirectories=self.include_subdirs_var.get(),
+            scan_hidden=self.scan_hidden_var.get(),
+            max_scan_time=self.app_manager.get_config("scanner.max_scan_time"),
+            max_directories=self.app_manager.get_config("scanner.max_directories"),
+            max_memory_mb=self.app_manager.get_config("scanner.max_memory_mb"),
+            traversal_order=self.app_manager.get_config("scanner.traversal_order", "breadth_first"),
+            max_frontier=self.app_manager.get_config("scanner.max_frontier", 100000),
+            engine=self.app_manager.get_config("scanner.engine", "auto"),
+            workers=self.app_manager.get_config("scanner.workers"),
+            track_cascade=True  # The results can be deleted with cascade
+        )
+        
+        # Stream results into the tree while the scan is running
+        self._streamed_results = queue.SimpleQueue()
+        self.current_session.add_result_listener(self._streamed_results.put)
+        self.root.after(
+            self.STREAM_INTERVAL_MS,
+            self._drain_streamed_results,
+            self.current_session,
+            self.STREAM_BATCH_SIZE
+        )
+        
         # Start scan in background thread
-        scan_thread = threading.Thread(target=self._perform_scan, args=(path,))
+        scan_thread = threading.Thread(target=self._perform_scan, args=(self.current_session,))
         scan_thread.daemon = True
         scan_thread.start()
     
-    def _perform_scan(self, path: str):
+    def _perform_scan(self, session):
         """Perform the actual scan in background thread."""
         try:
-            include_subdirs = self.include_subdirs_var.get()
-            scan_hidden = self.scan_hidden_var.get()
-            
             # Perform scan
-            empty_folders = self.scanner.scan_directory(
-                path,
-                include_subdirectories=include_subdirs,
-                scan_hidden=scan_hidden
-            )
+            empty_folders = self.scanner.run_session(session)
             
             # Update UI in main thread
-            self.root.after(0, self._scan_completed, empty_folders)
+            self.root.after(0, self._scan_completed, session, empty_folders)
             
         except Exception as e:
             self.root.after(0, self._scan_error, str(e))
     
-    def _scan_completed(self, empty_folders: List[Path]):
+    def _drain_streamed_results(self, session, limit: Optional[int] = None):
+        """Move results streamed by the scan thread into the tree."""
+        if session is not self.current_session:
+            return  # A newer scan has replaced this one
+        
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self._streamed_results.get_nowait())
+            except queue.Empty:
+                break
+        
+        if batch:
+            self._populate_results_tree(batch)
+        
+        if limit is not None and not session.is_finished():
+            found = len(self.results_tree.get_children())
+            self.summary_var.set(f"Scanning in progress... {found} empty folders so far")
+            self.root.after(self.STREAM_INTERVAL_MS, self._drain_streamed_results, session, limit)
+    
+    def _scan_completed(self, session, empty_folders: List[Path]):
         """Handle scan completion in main thread."""
+        if session is not self.current_session:
+            return  # A newer scan has replaced this one
+        
         self.scan_results = empty_folders
         
         # Update UI
@@ -660,16 +767,23 @@ class MainWindow:
         self.progress_bar.pack_forget()
         
         # Update summary
-        scan_summary = self.scanner.get_scan_summary()
+        scan_summary = session.get_summary()
         summary_text = (
             f"Found {len(empty_folders)} empty folders "
             f"(scanned {scan_summary['total_folders']} total folders in "
-            f"{scan_summary['scan_time']:.1f}s)"
+            f"{scan_summary['scan_time']:.1f}s, {scan_summary['engine']} x{scan_summary['workers']})"
         )
+        if scan_summary.get('budget_exhausted'):
+            summary_text += (
+                f" - partial: {scan_summary['budget_exhausted']} budget reached, "
+                f"{scan_summary['coverage']:.0%} covered"
+            )
+        if scan_summary.get('unreadable_directories'):
+            summary_text += f" - {scan_summary['unreadable_directories']} folders could not be read"
         self.summary_var.set(summary_text)
         
-        # Populate results tree
-        self._populate_results_tree(empty_folders)
+        # Add whatever the streaming updates have not shown yet
+        self._drain_streamed_results(session)
         
         self.status_var.set(f"Scan completed: {len(empty_folders)} empty folders found")
         
@@ -688,36 +802,77 @@ class MainWindow:
         messagebox.showerror("Scan Error", f"Failed to scan directory:\n{error_message}")
         self.status_var.set("Scan failed")
     
-    def _populate_results_tree(self, empty_folders: List[Path]):
+    def _populate_results_tree(self, records: List[FolderRecord]):
         """Populate the results tree with empty folders."""
         import datetime
-        import os
         
-        for folder in empty_folders:
-            try:
-                # Get folder stats
-                stats = folder.stat()
-                modified_time = datetime.datetime.fromtimestamp(stats.st_mtime)
-                modified_str = modified_time.strftime("%Y-%m-%d %H:%M")
-                
-                # Insert into tree
-                self.results_tree.insert(
-                    '',
-                    'end',
-                    text=str(folder),
-                    values=('0 bytes', modified_str)
-                )
-            except Exception as e:
-                # If we can't get stats, still show the folder
-                self.results_tree.insert(
-                    '',
-                    'end',
-                    text=str(folder),
-                    values=('Unknown', 'Unknown')
-                )
+        for record in records:
+            # The scan already read the folder's metadata; no stat on the Tk thread
+            if record.mtime_ns is not None:
+                modified_time = datetime.datetime.fromtimestamp(record.mtime_ns / 1e9)
+                values = ('0 bytes', modified_time.strftime("%Y-%m-%d %H:%M"))
+            else:
+                values = ('Unknown', 'Unknown')
+            self.results_tree.insert('', 'end', text=str(record.path), values=values)
+    
+    def _open_last_snapshot(self):
+        """Show the results saved by the last scan, one page at a time."""
+        import datetime
+        
+        snapshot = self.scanner.load_snapshot()
+        if snapshot is None:
+            return
+        if not len(snapshot):
+            snapshot.close()
+            return
+        
+        self.snapshot = snapshot
+        self._snapshot_rows_shown = 0
+        self._load_snapshot_page()
+        
+        created = datetime.datetime.fromtimestamp(snapshot.created).strftime("%Y-%m-%d %H:%M")
+        self.summary_var.set(
+            f"Last scan ({created}): {len(snapshot)} empty folders "
+            f"(scanned {snapshot.summary.get('total_folders', '?')} total folders)"
+        )
+        self.logger.info(f"Opened snapshot of the last scan with {len(snapshot)} results")
+    
+    def _on_results_scroll(self, first, last):
+        """Keep the scrollbar in step and load more snapshot rows near the end."""
+        self.results_v_scrollbar.set(first, last)
+        if (self.snapshot is not None and not self._snapshot_page_pending
+                and self._snapshot_rows_shown < len(self.snapshot) and float(last) > 0.9):
+            self._snapshot_page_pending = True
+            self.root.after_idle(self._load_snapshot_page)
+    
+    def _load_snapshot_page(self):
+        """Add the next page of snapshot rows to the tree."""
+        self._snapshot_page_pending = False
+        if self.snapshot is None:
+            return
+        
+        start = self._snapshot_rows_shown
+        page = list(self.snapshot.records(start, start + self.SNAPSHOT_PAGE_SIZE))
+        self._populate_results_tree([record for record in page if record.path not in self._snapshot_stale])
+        self._snapshot_rows_shown += len(page)
+        
+        self.status_var.set(
+            f"Showing {self._snapshot_rows_shown} of {len(self.snapshot)} results from the last scan"
+        )
+    
+    def _close_snapshot(self):
+        """Stop showing the last scan's snapshot and unmap it."""
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+            self._snapshot_rows_shown = 0
+            self._snapshot_stale = set()
     
     def clear_scan_results(self, update_summary: bool = True):
         """Clear the scan results."""
+        # The next scan replaces the snapshot file, which must not be mapped
+        self._close_snapshot()
+        
         # Clear tree view
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
@@ -759,11 +914,19 @@ class MainWindow:
             return
         
         # Perform dry run
-        deleted, failed = self.scanner.delete_empty_folders(selected_folders, dry_run=True)
+        deleted, failed = self.scanner.delete_empty_folders(
+            selected_folders,
+            dry_run=True,
+            workers=self.app_manager.get_config("deletion.workers", 8),
+            cascade=self.cascade_delete_var.get()
+        )
+        cascaded = self.scanner.get_deletion_summary().get('cascaded', 0)
         
         # Show preview dialog
         preview_text = f"Dry Run Results:\n\n"
         preview_text += f"Would delete {len(deleted)} folders:\n"
+        if cascaded:
+            preview_text += f"(including {cascaded} parent folders left empty)\n"
         for folder in deleted[:10]:  # Show first 10
             preview_text += f"  • {folder}\n"
         
@@ -788,7 +951,7 @@ class MainWindow:
         # Confirmation dialog
         confirm_text = (
             f"Are you sure you want to delete {len(selected_folders)} empty folders?\n\n"
-            "This action cannot be undone!"
+            "Deleted folders can be restored with \"Undo Last Delete\"."
         )
         
         if not messagebox.askyesno("Confirm Deletion", confirm_text):
@@ -796,11 +959,20 @@ class MainWindow:
         
         # Perform actual deletion
         try:
-            deleted, failed = self.scanner.delete_empty_folders(selected_folders, dry_run=False)
+            deleted, failed = self.scanner.delete_empty_folders(
+                selected_folders,
+                dry_run=False,
+                workers=self.app_manager.get_config("deletion.workers", 8),
+                cascade=self.cascade_delete_var.get()
+            )
+            stats = self.scanner.get_deletion_summary()
             
             # Show results
             result_text = f"Deletion completed:\n\n"
             result_text += f"Successfully deleted: {len(deleted)} folders\n"
+            if stats.get('cascaded'):
+                result_text += f"Including parent folders left empty: {stats['cascaded']}\n"
+            result_text += f"Time: {stats['elapsed']:.2f}s ({stats['folders_per_second']:.0f} folders/s)\n"
             
             if failed:
                 result_text += f"Failed to delete: {len(failed)} folders\n\n"
@@ -810,11 +982,13 @@ class MainWindow:
             
             messagebox.showinfo("Deletion Results", result_text)
             
-            # Remove deleted items from tree
+            # Remove deleted items from tree and results
+            deleted_set = set(deleted)
             for item in self.results_tree.selection():
                 folder_path = Path(self.results_tree.item(item, 'text'))
-                if folder_path in deleted:
+                if folder_path in deleted_set:
                     self.results_tree.delete(item)
+            self.scan_results = [folder for folder in self.scan_results if folder not in deleted_set]
             
             # Update summary
             remaining_count = len(self.results_tree.get_children())
@@ -824,9 +998,178 @@ class MainWindow:
         except Exception as e:
             messagebox.showerror("Deletion Error", f"Error during deletion:\n{e}")
     
+    def queue_delete_selected(self):
+        """Hand the selected folders to the background deletion queue."""
+        deletion_queue = self.app_manager.components.get('deletion_queue')
+        if deletion_queue is None:
+            messagebox.showwarning("Queue Unavailable", "The background deletion queue is not running.")
+            return
+        
+        selected_folders = self.get_selected_folders()
+        if not selected_folders:
+            messagebox.showwarning("No Selection", "Please select folders to delete.")
+            return
+        
+        confirm_text = (
+            f"Delete {len(selected_folders)} empty folders in the background?\n\n"
+            "Folders that are busy are retried automatically."
+        )
+        if not messagebox.askyesno("Confirm Queued Deletion", confirm_text):
+            return
+        
+        queued = deletion_queue.submit(selected_folders)
+        self._queued_folders.update(selected_folders)
+        self.results_tree.delete(*self.results_tree.selection())
+        self.summary_var.set(f"Remaining empty folders: {len(self.results_tree.get_children())}")
+        self.status_var.set(f"Queued {queued} folders for deletion")
+        
+        if not self._queue_polling:
+            self._queue_polling = True
+            self.root.after(self.QUEUE_POLL_MS, self._poll_deletion_queue)
+    
+    def _poll_deletion_queue(self):
+        """Show background deletion progress until the queue is drained."""
+        deletion_queue = self.app_manager.components.get('deletion_queue')
+        status = deletion_queue.get_status()
+        
+        if status['pending']:
+            self.status_var.set(
+                f"Deleting in background: {status['pending']} pending, "
+                f"{status['retrying']} retrying, {status['failed']} failed"
+            )
+            self.root.after(self.QUEUE_POLL_MS, self._poll_deletion_queue)
+            return
+        
+        self._queue_polling = False
+        self.status_var.set(
+            f"Background deletion finished: {status['completed']} deleted, {status['failed']} failed"
+        )
+        
+        # Everything queued is now either deleted or among the failures
+        failures = deletion_queue.get_failures() if status['failed'] else []
+        done = self._queued_folders.difference(folder for folder, _ in failures)
+        self._queued_folders = set()
+        self.scan_results = [folder for folder in self.scan_results if folder not in done]
+        
+        if failures:
+            failure_text = f"{len(failures)} folders could not be deleted:\n\n"
+            for folder, error in failures[:5]:
+                failure_text += f"  • {folder}: {error}\n"
+            messagebox.showwarning("Background Deletion", failure_text)
+            deletion_queue.clear_failures()
+    
+    def quarantine_selected(self):
+        """Move the selected folders into quarantine."""
+        selected_folders = self.get_selected_folders()
+        if not selected_folders:
+            messagebox.showwarning("No Selection", "Please select folders to quarantine.")
+            return
+        
+        try:
+            quarantined, failed = self.scanner.quarantine_folders(selected_folders)
+            
+            quarantined_set = set(quarantined)
+            for item in self.results_tree.selection():
+                if Path(self.results_tree.item(item, 'text')) in quarantined_set:
+                    self.results_tree.delete(item)
+            self.summary_var.set(f"Remaining empty folders: {len(self.results_tree.get_children())}")
+            self.status_var.set(f"Quarantined {len(quarantined)} folders")
+            
+            if failed:
+                failure_text = f"Failed to quarantine {len(failed)} folders:\n\n"
+                for folder, error in failed[:5]:
+                    failure_text += f"  • {folder}: {error}\n"
+                messagebox.showwarning("Quarantine Results", failure_text)
+            
+        except Exception as e:
+            messagebox.showerror("Quarantine Error", f"Error during quarantine:\n{e}")
+    
+    def restore_last_quarantine(self):
+        """Move the most recently quarantined folders back."""
+        try:
+            restored, failed = self.scanner.restore_quarantine()
+            
+            if not restored and not failed:
+                messagebox.showinfo("Restore Quarantine", "There is nothing in quarantine.")
+                return
+            
+            result_text = f"Restored {len(restored)} folders\n"
+            if failed:
+                result_text += f"\nFailed to restore {len(failed)} folders:\n"
+                for folder, error in failed[:5]:
+                    result_text += f"  • {folder}: {error}\n"
+            
+            messagebox.showinfo("Restore Results", result_text)
+            self.status_var.set(f"Restored {len(restored)} folders from quarantine")
+            
+        except Exception as e:
+            messagebox.showerror("Restore Error", f"Error while restoring quarantine:\n{e}")
+    
+    def purge_quarantine(self):
+        """Permanently delete everything in quarantine."""
+        try:
+            batches = self.scanner.quarantine.list_batches() if self.scanner.quarantine else []
+            total = sum(batch['folders'] for batch in batches)
+            if not total:
+                messagebox.showinfo("Purge Quarantine", "There is nothing in quarantine.")
+                return
+            
+            confirm_text = (
+                f"Permanently delete {total} quarantined folders?\n\n"
+                "Purged folders cannot be restored."
+            )
+            if not messagebox.askyesno("Confirm Purge", confirm_text):
+                return
+            
+            purged, failed = self.scanner.purge_quarantine()
+            
+            result_text = f"Purged {len(purged)} folders\n"
+            if failed:
+                result_text += f"\nFailed to purge {len(failed)} folders:\n"
+                for folder, error in failed[:5]:
+                    result_text += f"  • {folder}: {error}\n"
+            
+            messagebox.showinfo("Purge Results", result_text)
+            self.status_var.set(f"Purged {len(purged)} quarantined folders")
+            
+        except Exception as e:
+            messagebox.showerror("Purge Error", f"Error while purging quarantine:\n{e}")
+    
+    def undo_last_delete(self):
+        """Recreate the folders removed by the most recent deletion."""
+        if not messagebox.askyesno("Undo Deletion", "Recreate the folders removed by the last deletion?"):
+            return
+        
+        try:
+            # The queue's journal is still being appended to; close it so its
+            # deletions count as the last one
+            deletion_queue = self.app_manager.components.get('deletion_queue')
+            if deletion_queue is not None:
+                deletion_queue.rotate_journal()
+            
+            restored, failed = self.scanner.undo_last_deletion(
+                workers=self.app_manager.get_config("deletion.workers", 8)
+            )
+            
+            if not restored and not failed:
+                messagebox.showinfo("Undo Deletion", "There is no deletion to undo.")
+                return
+            
+            result_text = f"Restored {len(restored)} folders\n"
+            if failed:
+                result_text += f"\nFailed to restore {len(failed)} folders:\n"
+                for folder, error in failed[:5]:
+                    result_text += f"  • {folder}: {error}\n"
+            
+            messagebox.showinfo("Undo Results", result_text)
+            self.status_var.set(f"Restored {len(restored)} folders")
+            
+        except Exception as e:
+            messagebox.showerror("Undo Error", f"Error while undoing deletion:\n{e}")
+    
     def export_results(self):
         """Export scan results to file."""
-        if not self.scan_results:
+        if not self.scan_results and self.snapshot is None:
             messagebox.showwarning("No Results", "No scan results to export.")
             return
         
@@ -838,6 +1181,11 @@ class MainWindow:
                 ("Text files", "*.txt"),
                 ("CSV files", "*.csv"),
                 ("JSON files", "*.json"),
+                ("Parquet files", "*.parquet"),
+                ("SQLite databases", "*.sqlite"),
+                ("NDJSON, gzip compressed", "*.ndjson.gz"),
+                ("NDJSON, zstd compressed", "*.ndjson.zst"),
+                ("NDJSON files", "*.ndjson"),
                 ("All files", "*.*")
             ]
         )
@@ -845,12 +1193,21 @@ class MainWindow:
         if file_path:
             try:
                 # Determine format from extension
-                file_ext = Path(file_path).suffix.lower()
-                format_map = {'.txt': 'txt', '.csv': 'csv', '.json': 'json'}
-                format_type = format_map.get(file_ext, 'txt')
+                format_type = format_from_path(file_path)
                 
                 # Export results
-                if self.scanner.export_results(file_path, format_type):
+                if self.snapshot is not None:
+                    # Reopened results of the last scan, less any a refresh found gone
+                    snapshot = self.snapshot
+                    exported = self.scanner.export_results(
+                        file_path,
+                        format_type,
+                        records=(record for record in snapshot if record.path not in self._snapshot_stale),
+                        summary=dict(snapshot.summary, empty_folders=len(snapshot) - len(self._snapshot_stale))
+                    )
+                else:
+                    exported = self.scanner.export_results(file_path, format_type)
+                if exported:
                     messagebox.showinfo("Export Complete", f"Results exported to:\n{file_path}")
                     self.status_var.set("Results exported")
                 else:
@@ -892,9 +1249,80 @@ class MainWindow:
             messagebox.showinfo("Logs", "No log file found.")
     
     def refresh_view(self):
-        """Refresh the current view."""
-        self.status_var.set("View refreshed")
-        # Could add logic to refresh the current tab's content
+        """Refresh the results, dropping folders that are gone or no longer empty."""
+        if self.snapshot is not None:
+            self.status_var.set("Rechecking results of the last scan...")
+            refresh_thread = threading.Thread(target=self._perform_snapshot_revalidation, args=(self.snapshot,))
+            refresh_thread.daemon = True
+            refresh_thread.start()
+            return
+        
+        session = self.current_session
+        if not self.scan_results or session is None or not session.is_finished():
+            self.status_var.set("View refreshed")
+            return
+        
+        self.status_var.set("Rechecking results...")
+        refresh_thread = threading.Thread(target=self._perform_revalidation, args=(session,))
+        refresh_thread.daemon = True
+        refresh_thread.start()
+    
+    def _perform_revalidation(self, session):
+        """Revalidate scan results (runs in separate thread)."""
+        try:
+            counts = self.scanner.revalidate_results(
+                workers=self.app_manager.get_config("deletion.workers", 8)
+            )
+            self.root.after(0, self._revalidation_completed, session, counts)
+        except Exception as e:
+            self.root.after(0, self.status_var.set, f"Refresh failed: {e}")
+    
+    def _perform_snapshot_revalidation(self, snapshot):
+        """Revalidate the reopened snapshot's results (runs in separate thread)."""
+        try:
+            folders = [record.path for record in snapshot]
+            remaining = list(folders)
+            counts = self.scanner.revalidate_results(
+                remaining,
+                workers=self.app_manager.get_config("deletion.workers", 8)
+            )
+            stale = set(folders).difference(remaining)
+            self.root.after(0, self._snapshot_revalidation_completed, snapshot, stale, counts)
+        except Exception as e:
+            self.root.after(0, self.status_var.set, f"Refresh failed: {e}")
+    
+    def _snapshot_revalidation_completed(self, snapshot, stale: Set[Path], counts: dict):
+        """Hide snapshot rows that are gone or no longer empty (main thread)."""
+        if snapshot is not self.snapshot:
+            return  # A new scan has replaced the snapshot
+        
+        self._snapshot_stale = stale
+        for item in self.results_tree.get_children():
+            if Path(self.results_tree.item(item, 'text')) in stale:
+                self.results_tree.delete(item)
+        
+        self.summary_var.set(f"Remaining empty folders: {len(snapshot) - len(stale)}")
+        self.status_var.set(
+            f"Rechecked {counts['checked']} folders: {counts['disappeared']} disappeared, "
+            f"{counts['no_longer_empty']} no longer empty"
+        )
+    
+    def _revalidation_completed(self, session, counts: dict):
+        """Remove stale rows after revalidation (main thread)."""
+        if session is not self.current_session:
+            return  # A newer scan has replaced these results
+        
+        remaining = set(self.scanner.empty_folders)
+        self.scan_results = [folder for folder in self.scan_results if folder in remaining]
+        for item in self.results_tree.get_children():
+            if Path(self.results_tree.item(item, 'text')) not in remaining:
+                self.results_tree.delete(item)
+        
+        self.summary_var.set(f"Remaining empty folders: {len(self.results_tree.get_children())}")
+        self.status_var.set(
+            f"Rechecked {counts['checked']} folders: {counts['disappeared']} disappeared, "
+            f"{counts['no_longer_empty']} no longer empty"
+        )
     
     def show_about(self):
         """Show about dialog."""
@@ -914,5 +1342,8 @@ class MainWindow:
     def on_closing(self):
         """Handle window closing event."""
         if messagebox.askokcancel("Quit", "Do you want to quit?"):
+            if self.current_session is not None:
+                self.current_session.cancel()
+            self._close_snapshot()
             self.app_manager.cleanup()
             self.root.destroy()
@@ -15,6 +15,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from core.app_manager import AppManager
+from core.hotspots import DEFAULT_HOTSPOT_TOP
 from gui.main_window import MainWindow
 from gui.working_splash_screen import SplashScreen  # Using working splash from CodePulse
 from utils.logger import setup_logger
@@ -42,6 +43,12 @@ class FolderPulseApp:
             else:
                 self.root = tk.Tk()
             
+            # Load configuration and start shared components
+            if not self.app_manager.running:
+                if not self.app_manager.initialize():
+                    raise RuntimeError("Application manager failed to initialize")
+                self.app_manager.start_background_tasks()
+            
             # Configure main window
             self.setup_main_window()
             
@@ -50,7 +57,7 @@ class FolderPulseApp:
             
             self.logger.info("Application initialized successfully")
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to initialize application: {e}")
             messagebox.showerror("Error", f"Failed to initialize application:\n{e}")
@@ -134,7 +141,7 @@ class FolderPulseApp:
             print("[DEBUG] Showing splash screen...")
             self.splash.show(callback=self.start_main_application)
             print("[DEBUG] Splash show() called")
-            
+        
         except Exception as e:
             print(f"[DEBUG] Error creating splash screen: {e}")
             import traceback
@@ -154,7 +161,7 @@ class FolderPulseApp:
             else:
                 self.logger.error("Failed to start main application")
                 self.root.quit()
-                
+        
         except Exception as e:
             self.logger.error(f"Error starting main application: {e}")
             messagebox.showerror("Startup Error", f"Failed to start application:\n{e}")
@@ -198,6 +205,139 @@ class FolderPulseApp:
             self.logger.error(f"Error during cleanup: {e}")
 
 
+def run_headless_scan(args) -> int:
+    """
+    Scan from the command line without starting the GUI.
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        Process exit code
+    """
+    from core.folder_scanner import EmptyFolderScanner
+    from core.io_governor import IOGovernor
+    from core.exporters import StreamingExporter, create_writer, format_from_path
+    
+    logger = setup_logger(__name__)
+    app_manager = AppManager()
+    app_manager.load_config()
+    
+    io_config = dict(app_manager.get_config("io", {}))
+    if args.max_iops is not None:
+        io_config['max_ops_per_second'] = args.max_iops
+    
+    scanner = EmptyFolderScanner(
+        cache_dir=app_manager.get_config("paths.cache_directory", "cache"),
+        io_governor=IOGovernor.from_config(io_config)
+    )
+    try:
+        session = scanner.create_session(
+            args.scan,
+            scan_hidden=args.hidden,
+            ignore_patterns=app_manager.get_config("scanner.ignore_patterns"),
+            engine=args.engine,
+            workers=args.workers,
+            hotspot_depth=args.hotspots,
+            hotspot_top=args.hotspot_top,
+            top_k=args.top_k,
+            top_k_by=args.top_by
+        )
+        # Exports are written while the scan runs, all formats in one pass
+        exporter = None
+        if args.export:
+            writers = [
+                create_writer(
+                    path,
+                    args.format or format_from_path(path),
+                    max_rows=args.max_rows,
+                    max_bytes=args.max_bytes,
+                    subtree_root=args.scan if args.by_subtree else None
+                )
+                for path in args.export
+            ]
+            exporter = StreamingExporter(session, writers)
+        empty_folders = scanner.run_session(session)
+    except (OSError, ValueError, ImportError) as e:
+        logger.error(f"Scan failed: {e}")
+        return 1
+    finally:
+        scanner.cleanup()
+    
+    summary = scanner.get_scan_summary()
+    print(f"Empty folders: {summary['empty_folders']}")
+    if summary.get('top_k'):
+        print(f"Kept:          {len(empty_folders)} ({summary['top_k_by'].replace('_', ' ')} first)")
+    print(f"Total folders: {summary['total_folders']}")
+    print(f"Scan time:     {summary['scan_time']:.2f}s ({summary['engine']} x{summary['workers']})")
+    if summary.get('plan'):
+        print(f"Plan:          {'; '.join(summary['plan']['reasons'])}")
+    if summary.get('unreadable_directories'):
+        print(
+            f"Unreadable:    {summary['unreadable_directories']} directories "
+            f"({summary['unreadable_skipped']} skipped from cache)"
+        )
+    if summary.get('io'):
+        io = summary['io']
+        print(
+            f"I/O:           {io['total_operations']} operations, "
+            f"peak {io['peak_ops_in_one_second']}/s, throttled {io['throttled_seconds']:.2f}s"
+        )
+    if summary.get('hotspots'):
+        print("Hotspots (densest subtrees of empty folders):")
+        for hotspot in summary['hotspots']:
+            print(
+                f"  {hotspot['density']:6.1%}  {hotspot['empty_folders']:>9} / "
+                f"{hotspot['total_folders']:<9}  {hotspot['path']}"
+            )
+    
+    if exporter is not None:
+        if exporter.error is not None:
+            return 1
+        print(f"Exported to:   {', '.join(args.export)}")
+    
+    return 0
+
+
+def run_merge(args) -> int:
+    """
+    Merge exports from several scans into one sorted, deduplicated export.
+    
+    Args:
+        args: Parsed command line arguments
+    
+    Returns:
+        Process exit code
+    """
+    from core.export_merge import ExportMerger
+    
+    logger = setup_logger(__name__)
+    if not args.export or len(args.export) != 1:
+        logger.error("--merge needs exactly one --export file")
+        return 1
+    if args.by_subtree:
+        logger.error("--by-subtree needs --scan to know the scanned path")
+        return 1
+    
+    merger = ExportMerger()
+    try:
+        summary = merger.merge(
+            args.merge,
+            args.export[0],
+            args.format,
+            max_rows=args.max_rows,
+            max_bytes=args.max_bytes
+        )
+    except (OSError, ValueError, ImportError) as e:
+        logger.error(f"Merge failed: {e}")
+        return 1
+    
+    print(f"Merged:        {merger.stats['inputs']} exports, {merger.stats['records_read']} records")
+    print(f"Empty folders: {summary['empty_folders']} ({summary['duplicates_removed']} duplicates removed)")
+    print(f"Exported to:   {args.export[0]}")
+    return 0
+
+
 def main():
     """Main entry point."""
     import argparse
@@ -209,8 +349,95 @@ def main():
         action="store_true", 
         help="Skip splash screen and start directly"
     )
+    parser.add_argument(
+        "--scan",
+        metavar="PATH",
+        help="Scan PATH for empty folders without starting the GUI"
+    )
+    parser.add_argument(
+        "--hidden",
+        action="store_true",
+        help="Consider hidden files when checking whether folders are empty"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "serial", "threads"],
+        default="auto",
+        help="Scan engine (default: let the planner choose)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Parallel listings for the threads engine"
+    )
+    parser.add_argument(
+        "--max-iops",
+        type=float,
+        help="Limit filesystem operations per second (overrides io.max_ops_per_second)"
+    )
+    parser.add_argument(
+        "--hotspots",
+        metavar="DEPTH",
+        type=int,
+        help="Report the subtrees down to DEPTH levels with the highest share of empty folders"
+    )
+    parser.add_argument(
+        "--hotspot-top",
+        metavar="K",
+        type=int,
+        default=DEFAULT_HOTSPOT_TOP,
+        help=f"Number of subtrees in the hotspot report (default: {DEFAULT_HOTSPOT_TOP})"
+    )
+    parser.add_argument(
+        "--top-k",
+        metavar="K",
+        type=int,
+        help="Keep only the best K empty folders by --top-by instead of all of them"
+    )
+    parser.add_argument(
+        "--top-by",
+        choices=["oldest", "newest", "deepest", "busiest_parent"],
+        default="oldest",
+        help="Ranking for --top-k (default: oldest modification time)"
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        action="append",
+        help="Export scan results to FILE while scanning (repeat for several files)"
+    )
+    parser.add_argument(
+        "--format",
+        help="Export format (default: taken from the FILE extension)"
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        help="Split exports into shards of at most this many rows, with a manifest"
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        help="Split exports into shards of about this many bytes, with a manifest"
+    )
+    parser.add_argument(
+        "--by-subtree",
+        action="store_true",
+        help="Split exports into shards per top-level folder of the scanned path"
+    )
+    parser.add_argument(
+        "--merge",
+        metavar="FILE",
+        nargs="+",
+        help="Merge exports or shard manifests into one sorted, deduplicated --export file"
+    )
     args = parser.parse_args()
     
+    if args.merge:
+        sys.exit(run_merge(args))
+    if args.scan:
+        sys.exit(run_headless_scan(args))
+    
     # Create and run application
     app = FolderPulseApp()
     
@@ -0,0 +1,177 @@
+"""
+System Information Utilities
+Lightweight, dependency-free probes of the running process and host.
+"""
+
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Optional
+
+
+# Characters the kernel escapes in /proc/self/mounts: space, tab, newline, backslash
+_MOUNT_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Get the resident set size of the current process.
+    
+    Returns:
+        RSS in bytes, or None if it cannot be determined on this platform
+    """
+    # Linux: current RSS, cheap to read
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    # Other Unix: peak RSS is the best available approximation
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, AttributeError, OSError):
+        return None
+
+
+def available_cpus() -> int:
+    """
+    Get the number of CPUs this process may actually use.
+    
+    Honors CPU affinity and cgroup (v1 and v2) CPU quotas, so containers with
+    fractional limits are not mistaken for the whole host.
+    
+    Returns:
+        Number of usable CPUs (at least 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, int(quota + 0.5)))
+    
+    return max(1, cpus)
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """Read the cgroup CPU quota as a number of CPUs, if one is set."""
+    # cgroup v2: "max 100000" or "<quota> <period>"
+    try:
+        with open('/sys/fs/cgroup/cpu.max', 'r') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    
+    # cgroup v1
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', 'r') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us', 'r') as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    
+    return None
+
+
+def filesystem_type(path: str) -> Optional[str]:
+    """
+    Get the filesystem type (e.g. 'ext4', 'nfs4') that contains a path.
+    
+    Returns:
+        Filesystem type, or None if the mount table is unavailable
+    """
+    try:
+        # Decoded like os.path.realpath() decodes names, so the two compare equal
+        with open('/proc/self/mounts', 'r', encoding=sys.getfilesystemencoding(), errors='surrogateescape') as f:
+            mounts = f.readlines()
+    except OSError:
+        return None
+    
+    target = os.path.realpath(path)
+    best_mount, best_type = '', None
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        mount_point = unescape_mount_point(fields[1])
+        inside = target == mount_point or target.startswith(mount_point.rstrip('/') + '/')
+        if inside and len(mount_point) >= len(best_mount):
+            best_mount, best_type = mount_point, fields[2]
+    
+    return best_type
+
+
+def unescape_mount_point(field: str) -> str:
+    """
+    Undo the octal escapes (e.g. \\040 for a space) of a mount table field.
+    
+    Only the escapes are decoded; any other character, including non-ASCII
+    ones, is kept as it is.
+    """
+    return _MOUNT_ESCAPE.sub(lambda match: chr(int(match.group(1), 8)), field)
+
+
+def inode_usage(path: str) -> Optional[int]:
+    """
+    Get the number of inodes in use on the filesystem containing a path.
+    
+    Returns:
+        Used inode count, or None if the filesystem does not report inodes
+    """
+    try:
+        stats = os.statvfs(path)
+    except (AttributeError, OSError):
+        return None
+    
+    if stats.f_files <= 0:
+        return None
+    return stats.f_files - stats.f_ffree
+
+
+@lru_cache(maxsize=1024)
+def owner_name(uid: Optional[int]) -> str:
+    """
+    Get the user name for a numeric owner id, looked up once per id.
+    
+    Returns:
+        User name, the id itself if it has no name (or on Windows, which
+        has no numeric owners), or '' when the owner is unknown
+    """
+    if uid is None:
+        return ''
+    try:
+        import pwd
+        return pwd.getpwuid(uid).pw_name
+    except (ImportError, KeyError):
+        return str(uid)
+
+
+@lru_cache(maxsize=1024)
+def owner_uid(name: str) -> Optional[int]:
+    """
+    Get the numeric owner id for a name written by owner_name().
+    
+    Returns:
+        The id, or None when the name is empty or unknown on this host
+    """
+    if not name:
+        return None
+    if name.isdigit():
+        return int(name)
+    try:
+        import pwd
+        return pwd.getpwnam(name).pw_uid
+    except (ImportError, KeyError):
+        return None
@@ -0,0 +1,98 @@
+"""
+Tests for the deletion journal and bulk undo.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.deletion_journal import DeletionJournal, read_journal, latest_journal
+
+
+class TestDeletionJournal:
+    """Test cases for DeletionJournal and JournalUndo."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_journal_"))
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="folderpulse_journal_cache_"))
+        self.scan_dir = self.test_dir / "scan"
+        
+        self.folders = []
+        for parent in range(3):
+            for child in range(10):
+                folder = self.scan_dir / f"parent_{parent}" / f"empty_{child}"
+                folder.mkdir(parents=True)
+                self.folders.append(folder)
+        (self.scan_dir / "parent_0" / "file.txt").write_text("content")
+        
+        os.chmod(self.folders[0], 0o700)
+        os.utime(self.folders[0], ns=(1_000_000_000_000_000_000, 1_100_000_000_000_000_000))
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def test_group_commit(self):
+        """Records are committed in batches, not one by one."""
+        journal = DeletionJournal.create(str(self.cache_dir), batch_size=10)
+        for folder in self.folders:
+            journal.record(folder, os.lstat(folder))
+        journal.close()
+        
+        # Header plus three full batches
+        assert journal.commits == 4
+        records = read_journal(str(journal.journal_file))
+        assert [record['path'] for record in records] == [str(folder) for folder in self.folders]
+    
+    def test_torn_line_is_ignored(self):
+        """A partially written last line does not break reading."""
+        journal = DeletionJournal.create(str(self.cache_dir))
+        journal.record(self.folders[0], os.lstat(self.folders[0]))
+        journal.close()
+        with open(journal.journal_file, 'a', encoding='utf-8') as f:
+            f.write('{"path": "/tr')
+        
+        assert len(read_journal(str(journal.journal_file))) == 1
+    
+    def test_delete_and_undo_restores_metadata(self):
+        """Undo recreates cascaded folders top-down with their metadata."""
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        empty = scanner.scan_directory(str(self.scan_dir))
+        deleted, failed = scanner.delete_empty_folders(empty, dry_run=False, cascade=True)
+        
+        assert failed == []
+        assert not (self.scan_dir / "parent_1").exists()
+        assert scanner.get_deletion_summary()['journal']
+        
+        restored, failed = scanner.undo_last_deletion()
+        
+        assert failed == []
+        assert set(restored) == set(deleted)
+        assert all(folder.is_dir() for folder in self.folders)
+        info = os.stat(self.folders[0])
+        assert info.st_mode & 0o7777 == 0o700
+        assert info.st_mtime_ns == 1_100_000_000_000_000_000
+    
+    def test_undo_only_once(self):
+        """An undone journal is not picked up again."""
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        scanner.delete_empty_folders(self.folders[10:], dry_run=False)
+        scanner.undo_last_deletion()
+        
+        assert latest_journal(str(scanner.journal_dir)) is None
+        assert scanner.undo_last_deletion() == ([], [])
+    
+    def test_dry_run_is_not_journaled(self):
+        """Simulated deletions leave no journal behind."""
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        scanner.delete_empty_folders(self.folders, dry_run=True)
+        
+        assert latest_journal(str(scanner.journal_dir)) is None
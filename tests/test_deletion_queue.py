@@ -0,0 +1,169 @@
+"""
+Tests for the background deletion queue.
+"""
+
+import sys
+import errno
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.deletion_journal import latest_journal, read_journal
+from core.deletion_queue import DeletionQueue
+
+
+def wait_drained(deletion_queue: DeletionQueue, timeout: float = 10.0):
+    """Wait until the queue has nothing pending, including scheduled retries."""
+    deadline = time.monotonic() + timeout
+    while deletion_queue.get_status()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestDeletionQueue:
+    """Test cases for DeletionQueue."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_queue_"))
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="folderpulse_queue_cache_"))
+        self.queue_file = self.cache_dir / "queue.ndjson"
+        self.folders = []
+        for index in range(50):
+            folder = self.test_dir / f"parent_{index % 5}" / f"empty_{index}"
+            folder.mkdir(parents=True)
+            self.folders.append(folder)
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def make_queue(self, **options) -> DeletionQueue:
+        """Create a queue with fast retries."""
+        options.setdefault('base_delay', 0.01)
+        options.setdefault('max_delay', 0.05)
+        return DeletionQueue(str(self.queue_file), **options)
+    
+    def test_submit_returns_and_drains(self):
+        """Submitted folders are deleted in the background."""
+        deletion_queue = self.make_queue()
+        deletion_queue.start()
+        assert deletion_queue.submit(self.folders) == 50
+        
+        assert deletion_queue.wait_idle(10)
+        deletion_queue.stop()
+        
+        assert not any(folder.exists() for folder in self.folders)
+        status = deletion_queue.get_status()
+        assert status['completed'] == 50
+        assert status['pending'] == 0
+    
+    def test_live_journal_is_not_undone(self):
+        """The journal the queue is appending to is only offered once rotated."""
+        journal_dir = self.cache_dir / "journals"
+        deletion_queue = self.make_queue(journal_dir=str(journal_dir))
+        deletion_queue.start()
+        deletion_queue.submit(self.folders)
+        assert deletion_queue.wait_idle(10)
+        
+        assert list(journal_dir.glob("deletions-*"))
+        assert latest_journal(str(journal_dir)) is None
+        
+        deletion_queue.rotate_journal()
+        journal = latest_journal(str(journal_dir))
+        assert len(read_journal(str(journal))) == 50
+        deletion_queue.stop()
+    
+    def test_transient_failure_is_retried(self):
+        """A folder that is briefly not empty is deleted once it empties."""
+        blocker = self.folders[0] / "temp.txt"
+        blocker.write_text("in use")
+        
+        deletion_queue = self.make_queue(max_attempts=50)
+        deletion_queue.submit([self.folders[0]])
+        deletion_queue.start()
+        assert deletion_queue.wait_idle(10)
+        assert deletion_queue.get_status()['retrying'] == 1
+        
+        blocker.unlink()
+        wait_drained(deletion_queue)
+        deletion_queue.stop()
+        
+        assert not self.folders[0].exists()
+        assert deletion_queue.get_status()['completed'] == 1
+    
+    def test_retries_are_bounded(self):
+        """Transient failures become final after max_attempts."""
+        (self.folders[0] / "file.txt").write_text("content")
+        
+        deletion_queue = self.make_queue(max_attempts=3)
+        deletion_queue.submit([self.folders[0]])
+        deletion_queue.start()
+        wait_drained(deletion_queue)
+        deletion_queue.stop()
+        
+        failures = deletion_queue.get_failures()
+        assert len(failures) == 1
+        assert "retries exhausted" in failures[0][1]
+    
+    def test_permanent_failure_is_not_retried(self):
+        """Errors that cannot clear up fail on the first attempt."""
+        not_a_folder = self.test_dir / "file.txt"
+        not_a_folder.write_text("content")
+        
+        deletion_queue = self.make_queue()
+        deletion_queue.start()
+        deletion_queue.submit([not_a_folder])
+        assert deletion_queue.wait_idle(10)
+        deletion_queue.stop()
+        
+        failures = deletion_queue._failed
+        assert failures[str(not_a_folder)]['errno'] == errno.ENOTDIR
+        assert failures[str(not_a_folder)]['attempts'] == 1
+    
+    def test_pending_work_survives_restart(self):
+        """Folders submitted before a stop are deleted after the next start."""
+        deletion_queue = self.make_queue()
+        deletion_queue.submit(self.folders)
+        deletion_queue.stop()
+        
+        restarted = self.make_queue()
+        assert restarted.get_status()['pending'] == 50
+        restarted.start()
+        assert restarted.wait_idle(10)
+        restarted.stop()
+        
+        assert not any(folder.exists() for folder in self.folders)
+        assert self.make_queue().get_status()['pending'] == 0
+    
+    def test_log_is_compacted(self):
+        """Finished work does not make the queue file grow forever."""
+        deletion_queue = self.make_queue(batch_size=10)
+        deletion_queue.start()
+        deletion_queue.submit(self.folders)
+        assert deletion_queue.wait_idle(10)
+        deletion_queue.stop()
+        
+        with open(self.queue_file, 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) < 100
+    
+    def test_failures_keep_attempts_through_compaction(self):
+        """A replayed failure still knows how often it was tried."""
+        not_a_folder = self.test_dir / "file.txt"
+        not_a_folder.write_text("content")
+        
+        deletion_queue = self.make_queue(batch_size=10)
+        deletion_queue.start()
+        deletion_queue.submit([not_a_folder])
+        assert deletion_queue.wait_idle(10)
+        deletion_queue.submit(self.folders)
+        assert deletion_queue.wait_idle(10)
+        deletion_queue.stop()
+        
+        with open(self.queue_file, 'r', encoding='utf-8') as f:
+            assert len(f.readlines()) < 50
+        assert self.make_queue()._failed[str(not_a_folder)]['attempts'] == 1
@@ -0,0 +1,143 @@
+"""
+Tests for merging exports.
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import core.export_merge as export_merge
+from core.export_merge import ExportMerger, ExportReader
+from core.exporters import create_writer
+from core.scan_session import FolderRecord
+
+import pytest
+
+
+class TestExportMerge:
+    """Test cases for ExportReader and ExportMerger."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_merge_"))
+        self.summary = {'total_folders': 10, 'empty_folders': 0, 'hidden_folders': 1, 'scan_time': 0.5}
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def write_export(self, name, records, fmt=None, **partitioning):
+        """Write records to an export the way a scan would."""
+        output_file = str(self.test_dir / name)
+        writer = create_writer(output_file, fmt or name.split('.', 1)[1], **partitioning)
+        writer.open()
+        for record in records:
+            writer.write(record)
+        writer.close(dict(self.summary, empty_folders=len(records)))
+        return output_file
+    
+    @staticmethod
+    def records(paths, metadata=True):
+        return [
+            FolderRecord(Path(path), 2, 1_000 + number, 1000, number) if metadata
+            else FolderRecord(Path(path), 2)
+            for number, path in enumerate(paths)
+        ]
+    
+    @pytest.mark.parametrize("fmt", ['txt', 'csv', 'json', 'ndjson', 'ndjson.gz', 'ndjson.zst', 'parquet', 'sqlite'])
+    def test_read_back(self, fmt):
+        """Test that every export format can be read back."""
+        if fmt == 'ndjson.zst':
+            pytest.importorskip("zstandard")
+        if fmt == 'parquet':
+            pytest.importorskip("pyarrow")
+        paths = [f"/host/a/dir, \"{n}\"" for n in range(50)]
+        reader = ExportReader(self.write_export(f"results.{fmt}", self.records(paths)))
+        
+        records = list(reader)
+        
+        assert [str(record.path) for record in records] == paths
+        if fmt in ('ndjson', 'ndjson.gz', 'ndjson.zst', 'parquet', 'sqlite'):
+            assert records[3] == FolderRecord(Path(paths[3]), 2, 1_003, 1000, 3)
+        if fmt != 'csv':
+            assert reader.summary['total_folders'] == 10
+    
+    def test_read_csv_metadata(self):
+        """Test that CSV depth, times and owner come back, times to the second."""
+        uid = os.getuid() if hasattr(os, 'getuid') else 0
+        record = FolderRecord(Path("/host/a"), 3, 1_700_000_000_123_456_789, uid, 42, 1_600_000_000_987_654_321)
+        reader = ExportReader(self.write_export("results.csv", [record]))
+        
+        assert list(reader) == [
+            FolderRecord(Path("/host/a"), 3, 1_700_000_000_000_000_000, uid, None, 1_600_000_000_000_000_000)
+        ]
+    
+    def test_read_legacy_indented_json(self):
+        """Test that the folder array is found after other keys, indented."""
+        input_file = self.test_dir / "legacy.json"
+        input_file.write_text(json.dumps({
+            'scan_summary': {'empty_folders': 2, 'total_folders': 5},
+            'empty_folders': ['/x/1', '/x/2']
+        }, indent=2), encoding='utf-8')
+        reader = ExportReader(str(input_file))
+        
+        assert [str(record.path) for record in reader] == ['/x/1', '/x/2']
+        assert reader.summary['total_folders'] == 5
+    
+    def test_merge_sorts_and_deduplicates(self):
+        """Test that overlapping exports merge into one sorted list."""
+        first = self.write_export("a.json", self.records(['/v/c', '/v/a', '/v/b'], metadata=False))
+        second = self.write_export("b.ndjson", self.records(['/v/b', '/v/d', '/v/a']))
+        output_file = str(self.test_dir / "merged.ndjson")
+        
+        summary = ExportMerger(run_size=2).merge([first, second], output_file)
+        
+        records = list(ExportReader(output_file))
+        assert [str(record.path) for record in records] == ['/v/a', '/v/b', '/v/c', '/v/d']
+        # The duplicate with metadata wins over the path-only one
+        assert records[0].mtime_ns is not None
+        assert summary['empty_folders'] == 4
+        assert summary['duplicates_removed'] == 2
+        assert summary['merged_exports'] == 2
+        assert summary['total_folders'] == 20
+    
+    def test_merge_passes_bound_open_runs(self, monkeypatch):
+        """Test that many runs are merged in several passes."""
+        monkeypatch.setattr(export_merge, 'MAX_MERGE_FANIN', 3)
+        inputs = [
+            self.write_export(f"node{n}.ndjson", self.records([f"/n/{(n * 7 + i) % 40:02d}" for i in range(10)]))
+            for n in range(8)
+        ]
+        merger = ExportMerger(run_size=4)
+        
+        merger.merge(inputs, str(self.test_dir / "merged.txt"))
+        
+        records = list(ExportReader(str(self.test_dir / "merged.txt")))
+        expected = sorted({f"/n/{(n * 7 + i) % 40:02d}" for n in range(8) for i in range(10)})
+        assert [str(record.path) for record in records] == expected
+        assert merger.stats['records_read'] == 80
+        assert merger.stats['runs'] <= 3
+    
+    def test_merge_expands_manifests(self):
+        """Test that a manifest stands for all of its shards."""
+        paths = [f"/s/{n:03d}" for n in range(25)]
+        self.write_export("sharded.ndjson", self.records(paths), max_rows=10)
+        output_file = str(self.test_dir / "merged.sqlite")
+        
+        summary = ExportMerger().merge([str(self.test_dir / "sharded.manifest.json")], output_file)
+        
+        assert [str(record.path) for record in ExportReader(output_file)] == paths
+        assert summary['merged_exports'] == 3
+        assert summary['total_folders'] == 10
+        assert not list(self.test_dir.glob("folderpulse_merge_*"))
+    
+    def test_unknown_format(self):
+        """Test that inputs of unknown format are rejected."""
+        with pytest.raises(ValueError):
+            ExportReader(str(self.test_dir / "results.xml"))
@@ -0,0 +1,356 @@
+"""
+Tests for the streaming exporters.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.exporters import StreamingExporter, create_writer, format_from_path
+from core.scan_session import FolderRecord
+
+import pytest
+
+
+class TestExporters:
+    """Test cases for the result writers and StreamingExporter."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_export_"))
+        self.scan_dir = self.test_dir / "scan"
+        self.out_dir = self.test_dir / "out"
+        
+        self.expected = set()
+        for parent in range(5):
+            for child in range(20):
+                folder = self.scan_dir / f"parent_{parent}" / f"empty, \"{child}\""
+                folder.mkdir(parents=True)
+                self.expected.add(folder)
+        (self.scan_dir / "parent_0" / "file.txt").write_text("content")
+        
+        self.scanner = EmptyFolderScanner()
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        self.scanner.cleanup()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def stream_scan(self, *formats):
+        """Scan while streaming to one file per format."""
+        writers = [create_writer(str(self.out_dir / f"results.{fmt}"), fmt) for fmt in formats]
+        session = self.scanner.create_session(str(self.scan_dir))
+        exporter = StreamingExporter(session, writers)
+        self.scanner.run_session(session)
+        return exporter
+    
+    def test_fan_out_in_one_pass(self):
+        """Test that one scan fills every format."""
+        exporter = self.stream_scan('txt', 'csv', 'json')
+        
+        assert exporter.error is None
+        assert all(writer.records_written == len(self.expected) for writer in exporter.writers)
+        
+        with open(self.out_dir / "results.csv", newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ['Path', 'Type', 'Size', 'Depth', 'Modified', 'Changed', 'Owner']
+        assert {Path(row[0]) for row in rows[1:]} == self.expected
+        assert all(row[3] == '2' and row[4] and row[5] and row[6] for row in rows[1:])
+        
+        with open(self.out_dir / "results.json", encoding='utf-8') as f:
+            data = json.load(f)
+        assert {Path(path) for path in data['empty_folders']} == self.expected
+        assert data['scan_summary']['empty_folders'] == len(self.expected)
+        assert data['scan_summary']['status'] == 'completed'
+        
+        text = (self.out_dir / "results.txt").read_text(encoding='utf-8')
+        assert f"Empty folders found: {len(self.expected)}" in text
+        assert str(next(iter(self.expected))) in text
+    
+    def test_empty_result_is_valid_json(self):
+        """Test that a scan without results still produces a complete document."""
+        shutil.rmtree(self.scan_dir)
+        (self.scan_dir / "data").mkdir(parents=True)
+        (self.scan_dir / "data" / "file.txt").write_text("content")
+        
+        self.stream_scan('json')
+        
+        with open(self.out_dir / "results.json", encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['empty_folders'] == []
+    
+    def test_export_after_scan(self):
+        """Test that export_results writes the same formats from finished results."""
+        self.scanner.scan_directory(str(self.scan_dir))
+        
+        for fmt in ('txt', 'csv', 'json'):
+            assert self.scanner.export_results(str(self.out_dir / f"after.{fmt}"), fmt)
+        
+        text = (self.out_dir / "after.txt").read_text(encoding='utf-8')
+        assert text.index("SCAN SUMMARY:") < text.index("EMPTY FOLDERS:")
+        with open(self.out_dir / "after.json", encoding='utf-8') as f:
+            data = json.load(f)
+        assert {Path(path) for path in data['empty_folders']} == self.expected
+        assert data['scan_summary']['total_folders'] == self.scanner.get_scan_summary()['total_folders']
+    
+    def test_export_reuses_scan_metadata(self, monkeypatch):
+        """Test that exporting after the scan does not stat the results again."""
+        self.scanner.scan_directory(str(self.scan_dir))
+        
+        def no_stat(*args, **kwargs):
+            raise AssertionError("results must not be stat'ed again")
+        monkeypatch.setattr(os, 'stat', no_stat)
+        monkeypatch.setattr(os, 'lstat', no_stat)
+        
+        assert self.scanner.export_results(str(self.out_dir / "after.ndjson"), 'ndjson')
+        monkeypatch.undo()
+        
+        with open(self.out_dir / "after.ndjson", encoding='utf-8') as f:
+            rows = [row for row in map(json.loads, f) if 'path' in row]
+        assert {Path(row['path']) for row in rows} == self.expected
+        stat_result = Path(rows[0]['path']).stat()
+        assert rows[0]['mtime_ns'] == stat_result.st_mtime_ns
+        assert rows[0]['ctime_ns'] == stat_result.st_ctime_ns
+        assert rows[0]['uid'] == stat_result.st_uid
+    
+    def test_unsupported_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            create_writer(str(self.out_dir / "results.xml"), 'xml')
+        
+        assert not self.scanner.export_results(str(self.out_dir / "results.xml"), 'xml')
+    
+    def test_batches_are_flushed(self):
+        """Test that records beyond one batch all reach the file."""
+        writer = create_writer(str(self.out_dir / "many.json"), 'json')
+        writer.open()
+        for number in range(10000):
+            writer.write(FolderRecord(Path(f"/folder/{number}"), 1))
+        writer.close({'empty_folders': 10000})
+        
+        with open(self.out_dir / "many.json", encoding='utf-8') as f:
+            data = json.load(f)
+        assert len(data['empty_folders']) == 10000
+        assert data['empty_folders'][-1] == str(Path("/folder/9999"))
+
+    def test_parquet_export(self):
+        """Test typed Parquet output, streamed and after the scan."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        
+        exporter = self.stream_scan('parquet')
+        self.scanner.export_results(str(self.out_dir / "after.parquet"), 'parquet')
+        
+        assert exporter.error is None
+        for name in ("results.parquet", "after.parquet"):
+            parquet_file = pq.ParquetFile(self.out_dir / name)
+            table = parquet_file.read()
+            rows = table.drop(['mtime', 'ctime']).to_pylist()
+            
+            assert {Path(row['path']) for row in rows} == self.expected
+            assert str(table.schema.field('parent').type) == 'dictionary<values=string, indices=int32, ordered=0>'
+            assert all(row['depth'] == 2 for row in rows)
+            assert all(row['parent'] == str(Path(row['path']).parent) for row in rows)
+            
+            folder = Path(rows[0]['path'])
+            assert rows[0]['inode'] == folder.stat().st_ino
+            assert table.column('mtime').cast('int64')[0].as_py() == folder.stat().st_mtime_ns
+            assert table.column('ctime').cast('int64')[0].as_py() == folder.stat().st_ctime_ns
+            
+            summary = json.loads(parquet_file.metadata.metadata[b'folderpulse.scan_summary'])
+            assert summary['empty_folders'] == len(self.expected)
+    
+    def test_parquet_row_groups(self, monkeypatch):
+        """Test that rows are written in several row groups, with missing metadata as nulls."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        import core.exporters as exporters
+        monkeypatch.setattr(exporters, 'PARQUET_ROW_GROUP_SIZE', 1000)
+        
+        writer = create_writer(str(self.out_dir / "many.parquet"), 'parquet')
+        writer.open()
+        for number in range(2500):
+            if number % 100:
+                writer.write(FolderRecord(Path(f"/root/dir_{number % 7}/folder_{number}"), 2, number, 1000, number))
+            else:
+                writer.write(FolderRecord(Path(f"/root/dir_{number % 7}/folder_{number}"), 2))
+        writer.close({'empty_folders': 2500})
+        
+        parquet_file = pq.ParquetFile(self.out_dir / "many.parquet")
+        table = parquet_file.read()
+        
+        assert parquet_file.num_row_groups == 3
+        assert table.num_rows == 2500
+        assert table.column('inode').null_count == 25
+        assert table.column('inode')[1].as_py() == 1
+        assert table.column('parent')[8].as_py() == str(Path("/root/dir_1"))
+
+    def read_ndjson(self, path):
+        """Decompress as needed and split an NDJSON export into records and summaries."""
+        data = path.read_bytes()
+        if path.suffix == '.gz':
+            data = gzip.decompress(data)
+        elif path.suffix == '.zst':
+            zstandard = pytest.importorskip("zstandard")
+            data = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True).read()
+        lines = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+        return [line for line in lines if 'path' in line], [line for line in lines if 'scan_summary' in line]
+    
+    @pytest.mark.parametrize("fmt", ['ndjson', 'ndjson.gz', 'ndjson.zst'])
+    def test_ndjson_export(self, fmt):
+        """Test streamed and post-scan NDJSON, plain and compressed."""
+        if fmt == 'ndjson.zst':
+            pytest.importorskip("zstandard")
+        
+        exporter = self.stream_scan(fmt)
+        assert self.scanner.export_results(str(self.out_dir / f"after.{fmt}"), fmt)
+        
+        assert exporter.error is None
+        for name in (f"results.{fmt}", f"after.{fmt}"):
+            records, summaries = self.read_ndjson(self.out_dir / name)
+            assert {Path(record['path']) for record in records} == self.expected
+            assert all(record['depth'] == 2 and 'inode' in record for record in records)
+            assert len(summaries) == 1
+            assert summaries[0]['scan_summary']['empty_folders'] == len(self.expected)
+    
+    def test_compressed_blocks_concatenate(self, monkeypatch):
+        """Test that many independent blocks, and whole files, concatenate into valid gzip."""
+        import core.exporters as exporters
+        monkeypatch.setattr(exporters, 'RECORD_BATCH_SIZE', 100)
+        
+        for shard in range(2):
+            writer = create_writer(str(self.out_dir / f"shard_{shard}.ndjson.gz"), 'ndjson.gz')
+            writer.open()
+            for number in range(1000):
+                writer.write(FolderRecord(Path(f"/shard_{shard}/folder_{number}"), 1))
+            writer.close({'empty_folders': 1000})
+            assert writer.records_written == 1000
+        
+        merged = self.out_dir / "merged.ndjson.gz"
+        merged.write_bytes(b''.join((self.out_dir / f"shard_{shard}.ndjson.gz").read_bytes() for shard in range(2)))
+        records, summaries = self.read_ndjson(merged)
+        
+        assert [record['path'] for record in records[:2]] == [str(Path("/shard_0/folder_0")), str(Path("/shard_0/folder_1"))]
+        assert len(records) == 2000
+        assert len(summaries) == 2
+    
+    def test_format_from_path(self):
+        """Test format detection from file names."""
+        assert format_from_path("results.ndjson.gz") == 'ndjson.gz'
+        assert format_from_path("results.ndjson.zst") == 'ndjson.zst'
+        assert format_from_path("scan.2024.json") == 'json'
+        assert format_from_path("results.CSV") == 'csv'
+        assert format_from_path("results") == 'txt'
+
+    def test_sqlite_export(self, monkeypatch):
+        """Test the indexed SQLite export, streamed across several transactions."""
+        import core.exporters as exporters
+        monkeypatch.setattr(exporters, 'RECORD_BATCH_SIZE', 10)
+        monkeypatch.setattr(exporters, 'SQLITE_TRANSACTION_ROWS', 30)
+        
+        exporter = self.stream_scan('sqlite')
+        assert exporter.error is None
+        
+        with sqlite3.connect(self.out_dir / "results.sqlite") as db:
+            paths = {Path(path) for (path,) in db.execute("SELECT path FROM folders")}
+            parent = str(self.scan_dir / "parent_1")
+            in_parent = db.execute("SELECT count(*) FROM folders WHERE parent = ?", (parent,)).fetchone()[0]
+            plan = db.execute("EXPLAIN QUERY PLAN SELECT path FROM folders WHERE parent = ?", (parent,)).fetchall()
+            indexes = {name for (name,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            summary = dict(db.execute("SELECT key, value FROM scan_summary"))
+            oldest = db.execute("SELECT min(mtime_ns) FROM folders").fetchone()[0]
+        
+        assert paths == self.expected
+        assert in_parent == 20
+        assert 'folders_parent' in str(plan)
+        assert {'folders_parent', 'folders_depth', 'folders_mtime_ns'} <= indexes
+        assert json.loads(summary['empty_folders']) == len(self.expected)
+        assert oldest == min(folder.stat().st_mtime_ns for folder in self.expected)
+    
+    def test_sqlite_export_overwrites(self):
+        """Test that exporting again replaces the previous database."""
+        self.scanner.scan_directory(str(self.scan_dir))
+        output = str(self.out_dir / "after.sqlite")
+        
+        assert self.scanner.export_results(output, 'sqlite')
+        assert self.scanner.export_results(output, 'sqlite')
+        
+        with sqlite3.connect(output) as db:
+            assert db.execute("SELECT count(*) FROM folders").fetchone()[0] == len(self.expected)
+
+    def load_manifest(self, name):
+        """Read a manifest and check every shard against it."""
+        with open(self.out_dir / name, encoding='utf-8') as f:
+            manifest = json.load(f)
+        for shard in manifest['shards']:
+            data = (self.out_dir / shard['file']).read_bytes()
+            assert len(data) == shard['bytes']
+            assert hashlib.sha256(data).hexdigest() == shard['sha256']
+        return manifest
+    
+    def test_partition_by_rows(self):
+        """Test row-count shards streamed during a scan."""
+        writers = [create_writer(str(self.out_dir / "results.csv"), 'csv', max_rows=30)]
+        session = self.scanner.create_session(str(self.scan_dir))
+        StreamingExporter(session, writers)
+        self.scanner.run_session(session)
+        
+        manifest = self.load_manifest("results.manifest.json")
+        
+        assert manifest['complete']
+        assert manifest['scan_summary']['empty_folders'] == len(self.expected)
+        assert [shard['rows'] for shard in manifest['shards']] == [30, 30, 30, 10]
+        assert manifest['shards'][0]['file'] == "results.part-00000.csv"
+        
+        paths = set()
+        for shard in manifest['shards']:
+            with open(self.out_dir / shard['file'], newline='', encoding='utf-8') as f:
+                rows = list(csv.reader(f))[1:]
+            assert len(rows) == shard['rows']
+            paths.update(Path(row[0]) for row in rows)
+        assert paths == self.expected
+    
+    def test_partition_by_bytes(self, monkeypatch):
+        """Test size-limited shards."""
+        import core.exporters as exporters
+        monkeypatch.setattr(exporters, 'RECORD_BATCH_SIZE', 5)
+        self.scanner.scan_directory(str(self.scan_dir))
+        
+        assert self.scanner.export_results(str(self.out_dir / "after.ndjson"), 'ndjson', max_bytes=2000)
+        manifest = self.load_manifest("after.manifest.json")
+        
+        assert len(manifest['shards']) > 1
+        assert sum(shard['rows'] for shard in manifest['shards']) == len(self.expected)
+        assert manifest['scan_summary']['empty_folders'] == len(self.expected)
+    
+    def test_partitioned_writer_creates_nothing_until_opened(self):
+        """Test that a partitioned writer takes needs_metadata from the shard format."""
+        for fmt, needs_metadata in (('txt', False), ('csv', True), ('sqlite', True), ('ndjson.gz', True)):
+            writer = create_writer(str(self.out_dir / f"lazy.{fmt}"), fmt, max_rows=10)
+            assert writer.needs_metadata is needs_metadata
+        assert not self.out_dir.exists() or not any(self.out_dir.iterdir())
+    
+    def test_partition_by_subtree(self):
+        """Test one shard per top-level folder, each complete on its own."""
+        self.scanner.scan_directory(str(self.scan_dir))
+        
+        assert self.scanner.export_results(str(self.out_dir / "after.json"), 'json', by_subtree=True)
+        manifest = self.load_manifest("after.manifest.json")
+        
+        assert sorted(shard['subtree'] for shard in manifest['shards']) == [f"parent_{n}" for n in range(5)]
+        for shard in manifest['shards']:
+            with open(self.out_dir / shard['file'], encoding='utf-8') as f:
+                data = json.load(f)
+            assert len(data['empty_folders']) == shard['rows'] == 20
+            assert all(Path(path).parent.name == shard['subtree'] for path in data['empty_folders'])
+            assert shard['file'] == f"after.{shard['subtree']}.part-00000.json"
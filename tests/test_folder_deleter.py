@@ -0,0 +1,228 @@
+"""
+Tests for the parallel bulk deleter and result revalidation.
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.folder_deleter import BulkDeleter
+
+
+class TestBulkDeleter:
+    """Test cases for BulkDeleter."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_delete_"))
+        self.folders = []
+        for parent in range(5):
+            for child in range(20):
+                folder = self.test_dir / f"parent_{parent}" / f"empty_{child}"
+                folder.mkdir(parents=True)
+                self.folders.append(folder)
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_delete_many_in_order(self):
+        """All folders are removed and reported in the order given."""
+        deleter = BulkDeleter(workers=4)
+        deleted, failed = deleter.delete(self.folders, dry_run=False)
+        
+        assert deleted == self.folders
+        assert failed == []
+        assert not any(folder.exists() for folder in self.folders)
+        assert deleter.stats['deleted'] == 100
+        assert deleter.stats['parent_groups'] == 5
+    
+    def test_dry_run_keeps_folders(self):
+        """A dry run reports folders without removing them."""
+        deleted, failed = BulkDeleter().delete(self.folders, dry_run=True)
+        
+        assert len(deleted) == 100
+        assert failed == []
+        assert all(folder.exists() for folder in self.folders)
+    
+    def test_missing_folders_are_skipped(self):
+        """Folders that vanished are neither deleted nor failed."""
+        self.folders[0].rmdir()
+        deleter = BulkDeleter()
+        deleted, failed = deleter.delete(self.folders, dry_run=False)
+        
+        assert self.folders[0] not in deleted
+        assert failed == []
+        assert deleter.stats['missing'] == 1
+    
+    def test_non_empty_folder_fails(self):
+        """Non-empty folders are reported as failures."""
+        (self.folders[0] / "file.txt").write_text("content")
+        deleted, failed = BulkDeleter().delete(self.folders, dry_run=False)
+        
+        assert [folder for folder, _ in failed] == [self.folders[0]]
+        assert len(deleted) == 99
+    
+    def test_nested_targets_deleted_deepest_first(self):
+        """A parent listed before its children is still removed."""
+        parents = [self.test_dir / f"parent_{parent}" for parent in range(5)]
+        deleted, failed = BulkDeleter(workers=8).delete(parents + self.folders, dry_run=False)
+        
+        assert failed == []
+        assert deleted[:5] == parents
+        assert not any(parent.exists() for parent in parents)
+    
+    def test_scanner_deletion_stats(self):
+        """The scanner keeps throughput statistics of the last run."""
+        scanner = EmptyFolderScanner()
+        deleted, failed = scanner.delete_empty_folders(self.folders, dry_run=False, workers=2)
+        stats = scanner.get_deletion_summary()
+        
+        assert len(deleted) == 100
+        assert stats['workers'] == 2
+        assert stats['elapsed'] >= 0
+        assert stats['folders_per_second'] >= 0
+
+
+class TestCascadeDeletion:
+    """Test cases for cascading bottom-up deletion."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_cascade_"))
+        
+        # a/b/c/leaf: the whole chain empties once the leaf is gone
+        self.chain = self.test_dir / "a" / "b" / "c"
+        (self.chain / "leaf").mkdir(parents=True)
+        
+        # keep/leaf1, keep/leaf2 plus a file: keep must survive
+        (self.test_dir / "keep" / "leaf1").mkdir(parents=True)
+        (self.test_dir / "keep" / "leaf2").mkdir()
+        (self.test_dir / "keep" / "file.txt").write_text("content")
+        
+        # pair/x, pair/y: pair empties only when both leaves go
+        (self.test_dir / "pair" / "x").mkdir(parents=True)
+        (self.test_dir / "pair" / "y").mkdir()
+        
+        self.scanner = EmptyFolderScanner()
+        self.empty = self.scanner.scan_directory(str(self.test_dir), track_cascade=True)
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_cascade_removes_emptied_parents(self):
+        """Parents left empty are removed up to, but excluding, the scan root."""
+        deleted, failed = self.scanner.delete_empty_folders(self.empty, dry_run=False, cascade=True)
+        
+        assert failed == []
+        assert not (self.test_dir / "a").exists()
+        assert not (self.test_dir / "pair").exists()
+        assert (self.test_dir / "keep").exists()
+        assert self.test_dir.exists()
+        assert self.scanner.get_deletion_summary()['cascaded'] == 4
+        assert deleted[-1] in (self.test_dir / "a", self.test_dir / "pair")
+    
+    def test_preview_matches_real_cascade(self):
+        """The dry-run cascade predicts exactly what the real one removes."""
+        preview, _ = self.scanner.delete_empty_folders(self.empty, dry_run=True, cascade=True)
+        
+        assert all(folder.exists() for folder in preview)
+        
+        deleted, _ = self.scanner.delete_empty_folders(self.empty, dry_run=False, cascade=True)
+        assert set(preview) == set(deleted)
+    
+    def test_preview_needs_cascade_tracking(self):
+        """A scan without track_cascade keeps no index and previews no parents."""
+        scanner = EmptyFolderScanner()
+        empty = scanner.scan_directory(str(self.test_dir))
+        preview, _ = scanner.delete_empty_folders(empty, dry_run=True, cascade=True)
+        
+        assert scanner.last_session.cascade_index is None
+        assert set(preview) == set(empty)
+    
+    def test_partial_selection_does_not_cascade(self):
+        """A parent keeps existing while one of its subdirectories remains."""
+        selection = [self.test_dir / "pair" / "x"]
+        preview, _ = self.scanner.delete_empty_folders(selection, dry_run=True, cascade=True)
+        deleted, _ = self.scanner.delete_empty_folders(selection, dry_run=False, cascade=True)
+        
+        assert preview == deleted == selection
+        assert (self.test_dir / "pair").exists()
+    
+    def test_stop_at_limits_cascade(self):
+        """The cascade never removes stop_at itself."""
+        leaf = self.chain / "leaf"
+        deleted, _ = self.scanner.delete_empty_folders(
+            [leaf], dry_run=False, cascade=True, stop_at=str(self.test_dir / "a")
+        )
+        
+        assert deleted == [leaf, self.chain, self.test_dir / "a" / "b"]
+        assert (self.test_dir / "a").exists()
+    
+    def test_cascade_without_scan_needs_stop_at(self):
+        """Without a scan there is no default directory to stop at."""
+        with pytest.raises(ValueError):
+            EmptyFolderScanner().delete_empty_folders([self.chain / "leaf"], cascade=True)
+
+
+class TestRevalidation:
+    """Test cases for revalidating existing scan results."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_revalidate_"))
+        for parent in range(4):
+            for child in range(25):
+                (self.test_dir / f"parent_{parent}" / f"empty_{child}").mkdir(parents=True)
+        
+        self.scanner = EmptyFolderScanner()
+        self.scanner.scan_directory(str(self.test_dir))
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_unchanged_results_survive(self):
+        """Nothing changes when the disk did not change."""
+        before = list(self.scanner.empty_folders)
+        counts = self.scanner.revalidate_results(workers=4)
+        
+        assert counts == {'checked': 100, 'still_empty': 100, 'disappeared': 0, 'no_longer_empty': 0}
+        assert self.scanner.empty_folders == before
+    
+    def test_stale_results_are_dropped_in_place(self):
+        """Vanished and filled folders are removed from the same list object."""
+        results = self.scanner.empty_folders
+        (self.test_dir / "parent_0" / "empty_0").rmdir()
+        (self.test_dir / "parent_1" / "empty_1" / "file.txt").write_text("content")
+        shutil.rmtree(self.test_dir / "parent_2")
+        
+        counts = self.scanner.revalidate_results()
+        
+        assert counts['disappeared'] == 26
+        assert counts['no_longer_empty'] == 1
+        assert counts['still_empty'] == 73
+        assert self.scanner.empty_folders is results
+        assert len(results) == 73
+        assert self.scanner.get_scan_summary()['empty_folders'] == 73
+        # The metadata recorded during the scan stays aligned with the results
+        records = list(self.scanner.iter_results())
+        assert [record.path for record in records] == results
+        assert all(record.inode == record.path.stat().st_ino for record in records)
+    
+    def test_dry_run_skips_vanished_folders(self):
+        """The dry run confirms existence from the parent listing."""
+        (self.test_dir / "parent_3" / "empty_3").rmdir()
+        deleted, failed = self.scanner.delete_empty_folders(dry_run=True)
+        
+        assert len(deleted) == 99
+        assert self.test_dir / "parent_3" / "empty_3" not in deleted
+        assert self.scanner.get_deletion_summary()['missing'] == 1
@@ -0,0 +1,94 @@
+"""
+Tests for the hotspot rollup of empty folders.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.hotspots import HotspotRollup
+
+import pytest
+
+
+class TestHotspotRollup:
+    """Test cases for HotspotRollup and the scan's hotspot report."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_hotspots_"))
+        # app/cache: 12 empty folders, two levels down
+        for n in range(12):
+            (self.test_dir / "app" / "cache" / f"tmp_{n // 4}" / f"session_{n}").mkdir(parents=True)
+        # docs: 20 folders with a file each, 2 empty ones
+        for n in range(20):
+            folder = self.test_dir / "docs" / f"chapter_{n}"
+            folder.mkdir(parents=True)
+            (folder / "index.md").write_text("content")
+        for n in range(2):
+            (self.test_dir / "docs" / f"draft_{n}").mkdir()
+        self.scanner = EmptyFolderScanner()
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        self.scanner.cleanup()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_scan_reports_densest_subtrees(self):
+        """Test that the scan ranks subtrees by their share of empty folders."""
+        self.scanner.scan_directory(str(self.test_dir), hotspot_depth=2, hotspot_top=3)
+        
+        hotspots = self.scanner.get_scan_summary()['hotspots']
+        
+        assert len(hotspots) == 3
+        # app/cache holds its 3 tmp_ folders and 12 empty sessions
+        assert hotspots[0]['path'] == str(self.test_dir / "app" / "cache")
+        assert hotspots[0]['empty_folders'] == 12
+        assert hotspots[0]['total_folders'] == 16
+        assert hotspots[1]['path'] == str(self.test_dir / "app")
+        assert hotspots[2]['path'] == str(self.test_dir / "docs")
+        assert hotspots[2]['density'] == pytest.approx(2 / 23)
+    
+    def test_census_scan_reports_hotspots(self):
+        """Test that count-only scans roll up hotspots too."""
+        census = self.scanner.census_directories([str(self.test_dir)], hotspot_depth=1)
+        
+        hotspots = census[str(self.test_dir)]['hotspots']
+        assert [hotspot['path'] for hotspot in hotspots] == [
+            str(self.test_dir / "app"), str(self.test_dir / "docs")
+        ]
+    
+    def test_memory_bound_keeps_totals_exact(self):
+        """Test that a full trie folds directories into their ancestors."""
+        root = os.path.join(os.sep, "data")
+        rollup = HotspotRollup(root, max_depth=3, max_nodes=3)
+        rollup.add(root, 0, False)
+        rollup.add(os.path.join(root, "a"), 1, False)
+        rollup.add(os.path.join(root, "a", "b"), 2, False)
+        for n in range(10):
+            rollup.add(os.path.join(root, "a", "b", f"c{n}"), 3, True)
+            rollup.add(os.path.join(root, "a", "b", f"c{n}", "d", "e"), 5, True)
+        
+        report = rollup.report(min_directories=1)
+        
+        assert len(rollup) == 3
+        assert rollup.folded == 20
+        assert report[0] == {
+            'path': os.path.join(root, "a", "b"),
+            'depth': 2,
+            'empty_folders': 20,
+            'total_folders': 21,
+            'density': 20 / 21
+        }
+        assert report[1]['total_folders'] == 22
+    
+    def test_rejects_invalid_depth(self):
+        """Test that the rollup needs at least one level."""
+        with pytest.raises(ValueError):
+            self.scanner.scan_directory(str(self.test_dir), hotspot_depth=0)
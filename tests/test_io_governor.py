@@ -0,0 +1,125 @@
+"""
+Tests for the I/O governor.
+"""
+
+import sys
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import io_governor
+from core.folder_scanner import EmptyFolderScanner
+from core.io_governor import IOGovernor
+
+
+class TestIOGovernor:
+    """Test cases for IOGovernor."""
+    
+    def test_unconfigured_is_none(self):
+        """No limits means no governor at all."""
+        assert IOGovernor.from_config({}) is None
+        assert IOGovernor.from_config({'max_ops_per_second': None}) is None
+        assert IOGovernor.from_config({'max_ops_per_second': 10}) is not None
+    
+    def test_rate_limit(self):
+        """Operations never outrun the token bucket."""
+        governor = IOGovernor(max_ops_per_second=200, burst=1)
+        
+        started = time.monotonic()
+        for _ in range(41):
+            with governor.operation('stat'):
+                pass
+        elapsed = time.monotonic() - started
+        
+        assert elapsed >= 0.19
+        accounting = governor.get_accounting()
+        assert accounting['operations']['stat']['count'] == 41
+        assert accounting['throttled_seconds'] > 0
+    
+    def test_concurrency_cap(self):
+        """No more than max_concurrency operations run at once."""
+        governor = IOGovernor(max_concurrency=2)
+        
+        def work():
+            for _ in range(5):
+                with governor.operation('scandir'):
+                    time.sleep(0.005)
+        
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        accounting = governor.get_accounting()
+        assert accounting['peak_in_flight'] == 2
+        assert accounting['total_operations'] == 30
+    
+    def test_errors_are_accounted(self):
+        """Failing operations are counted and still release their slot."""
+        governor = IOGovernor(max_concurrency=1)
+        
+        with pytest.raises(OSError):
+            with governor.operation('rmdir'):
+                raise OSError("busy")
+        with governor.operation('rmdir'):
+            pass
+        
+        assert governor.get_accounting()['operations']['rmdir'] == {
+            'count': 2,
+            'errors': 1,
+            'avg_latency_ms': pytest.approx(0, abs=5),
+            'max_latency_ms': pytest.approx(0, abs=5)
+        }
+    
+    def test_backs_off_and_recovers(self, monkeypatch):
+        """Slow operations shrink the limits; fast ones restore them."""
+        monkeypatch.setattr(io_governor, 'ADJUST_INTERVAL', 0.0)
+        governor = IOGovernor(max_ops_per_second=10000, max_concurrency=8, latency_target_ms=1)
+        
+        for _ in range(3):
+            with governor.operation('scandir'):
+                time.sleep(0.01)
+        assert governor.throttle < 1.0
+        assert governor.get_accounting()['backoffs'] >= 1
+        
+        for _ in range(200):
+            with governor.operation('scandir'):
+                pass
+        assert governor.throttle == 1.0
+
+
+class TestGovernedScanner:
+    """Test cases for scans and deletions going through a governor."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_governor_"))
+        for index in range(20):
+            (self.test_dir / f"empty_{index}").mkdir()
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_scan_and_delete_are_accounted(self):
+        """Every listing and rmdir is accounted by the shared governor."""
+        governor = IOGovernor(max_ops_per_second=100000, max_concurrency=4)
+        scanner = EmptyFolderScanner(io_governor=governor)
+        
+        empty = scanner.scan_directory(str(self.test_dir), engine='threads', workers=4)
+        io = scanner.get_scan_summary()['io']
+        assert io['operations']['scandir']['count'] == 21
+        assert io['peak_in_flight'] <= 4
+        
+        scanner.delete_empty_folders(empty, dry_run=False)
+        io = scanner.get_deletion_summary()['io']
+        assert io['operations']['rmdir']['count'] == 20
+        scanner.cleanup()
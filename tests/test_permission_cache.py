@@ -0,0 +1,109 @@
+"""
+Tests for the unreadable directory cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.permission_cache import PermissionCache
+
+import pytest
+
+
+class TestPermissionCache:
+    """Test cases for PermissionCache and how scans use it."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_permissions_"))
+        self.cache_dir = self.test_dir / "cache"
+        self.scan_dir = self.test_dir / "scan"
+        
+        self.locked = self.scan_dir / "locked"
+        (self.locked / "empty_inside").mkdir(parents=True)
+        (self.scan_dir / "empty").mkdir()
+        
+        self.cache_file = self.cache_dir / "unreadable_dirs.json"
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        os.chmod(self.locked, 0o755)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_known_directory_is_skipped(self):
+        """Test that a cached, unchanged directory is reported as unreadable."""
+        cache = PermissionCache(str(self.cache_file))
+        cache.add([str(self.locked)])
+        
+        assert cache.is_known_unreadable(str(self.locked))
+        assert not cache.is_known_unreadable(str(self.scan_dir / "empty"))
+    
+    def test_changed_directory_is_probed_again(self):
+        """Test that a permission change invalidates the entry."""
+        cache = PermissionCache(str(self.cache_file))
+        cache.add([str(self.locked)])
+        
+        os.chmod(self.locked, 0o700)
+        
+        assert not cache.is_known_unreadable(str(self.locked))
+        assert len(cache) == 0
+    
+    def test_cache_persists(self):
+        """Test that entries survive a reload."""
+        cache = PermissionCache(str(self.cache_file))
+        cache.add([str(self.locked)])
+        cache.save()
+        
+        assert PermissionCache(str(self.cache_file)).is_known_unreadable(str(self.locked))
+        assert not list(self.cache_dir.glob("*.tmp"))
+    
+    def test_scan_skips_cached_directories(self):
+        """Test that scans do not descend into cached directories and count them."""
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        scanner.permission_cache.add([str(self.locked)])
+        
+        empty_folders = scanner.scan_directory(str(self.scan_dir))
+        summary = scanner.get_scan_summary()
+        
+        assert self.locked / "empty_inside" not in empty_folders
+        assert self.scan_dir / "empty" in empty_folders
+        assert summary['unreadable_skipped'] == 1
+        assert summary['unreadable_directories'] == 1
+    
+    def test_skipped_directories_release_parent_sizes(self):
+        """Test that ranking by parent size forgets parents of skipped directories."""
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        scanner.permission_cache.add([str(self.locked)])
+        session = scanner.create_session(str(self.scan_dir), top_k=5, top_k_by='busiest_parent')
+        
+        scanner.run_session(session)
+        
+        assert session.scan_results['unreadable_skipped'] == 1
+        assert session._parent_sizes == {}
+    
+    @pytest.mark.skipif(
+        not hasattr(os, 'geteuid') or os.geteuid() == 0,
+        reason="needs a user that permissions apply to"
+    )
+    def test_denied_directory_is_remembered(self):
+        """Test that a directory denied in one scan is skipped by the next."""
+        os.chmod(self.locked, 0)
+        
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        scanner.scan_directory(str(self.scan_dir))
+        first = scanner.get_scan_summary()
+        
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        scanner.scan_directory(str(self.scan_dir))
+        second = scanner.get_scan_summary()
+        
+        assert first['unreadable_directories'] == 1
+        assert first['unreadable_skipped'] == 0
+        assert second['unreadable_skipped'] == 1
@@ -0,0 +1,163 @@
+"""
+Tests for quarantine mode.
+"""
+
+import sys
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.quarantine import QuarantineManager, QUARANTINE_DIR_NAME
+
+import pytest
+
+
+class TestQuarantine:
+    """Test cases for QuarantineManager and the scanner's quarantine methods."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_quarantine_"))
+        self.cache_dir = self.test_dir / "cache"
+        self.scan_dir = self.test_dir / "scan"
+        
+        self.folders = []
+        for parent in range(3):
+            for child in range(5):
+                folder = self.scan_dir / f"parent_{parent}" / f"empty_{child}"
+                folder.mkdir(parents=True)
+                self.folders.append(folder)
+        (self.scan_dir / "parent_0" / "file.txt").write_text("content")
+        
+        self.index_file = self.cache_dir / "quarantine_index.ndjson"
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_quarantine_and_restore(self):
+        """Test that quarantined folders vanish and come back on restore."""
+        manager = QuarantineManager(str(self.index_file))
+        quarantined, failed = manager.quarantine(self.folders, root=self.scan_dir)
+        
+        assert failed == []
+        assert set(quarantined) == set(self.folders)
+        assert not any(folder.exists() for folder in self.folders)
+        assert (self.scan_dir / QUARANTINE_DIR_NAME).is_dir()
+        assert manager.list_batches()[0]['folders'] == len(self.folders)
+        
+        restored, failed = manager.restore()
+        
+        assert failed == []
+        assert set(restored) == set(self.folders)
+        assert all(folder.is_dir() for folder in self.folders)
+        assert manager.list_batches() == []
+    
+    def test_nested_folders(self):
+        """Test that a folder and its parent are quarantined and restored separately."""
+        parent = self.scan_dir / "parent_1"
+        for folder in self.folders[5:10]:
+            folder.rmdir()
+        child = parent / "empty_0"
+        child.mkdir()
+        
+        manager = QuarantineManager(str(self.index_file))
+        quarantined, failed = manager.quarantine([parent, child], root=self.scan_dir)
+        
+        assert failed == []
+        assert not parent.exists()
+        
+        restored, failed = manager.restore()
+        
+        assert failed == []
+        assert child.is_dir()
+    
+    def test_restore_refuses_to_overwrite(self):
+        """Test that a folder recreated meanwhile is not overwritten."""
+        manager = QuarantineManager(str(self.index_file))
+        manager.quarantine(self.folders[:1], root=self.scan_dir)
+        self.folders[0].mkdir()
+        
+        restored, failed = manager.restore()
+        
+        assert restored == []
+        assert [folder for folder, _ in failed] == [self.folders[0]]
+        assert len(manager.list_batches()) == 1
+    
+    def test_purge(self):
+        """Test that purging deletes the held folders and their batch directory."""
+        manager = QuarantineManager(str(self.index_file))
+        manager.quarantine(self.folders, root=self.scan_dir)
+        
+        purged, failed = manager.purge()
+        
+        assert failed == []
+        assert set(purged) == set(self.folders)
+        assert list((self.scan_dir / QUARANTINE_DIR_NAME).iterdir()) == []
+        assert manager.list_batches() == []
+        assert manager.restore() == ([], [])
+    
+    def test_purge_older_than(self):
+        """Test that only sufficiently old batches are purged."""
+        manager = QuarantineManager(str(self.index_file))
+        manager.quarantine(self.folders[:5], root=self.scan_dir)
+        
+        purged, failed = manager.purge(older_than=3600)
+        
+        assert purged == [] and failed == []
+        assert manager.list_batches()[0]['folders'] == 5
+    
+    def test_index_survives_restart(self):
+        """Test that a new manager restores what an earlier one quarantined."""
+        QuarantineManager(str(self.index_file)).quarantine(self.folders[:5], root=self.scan_dir)
+        time.sleep(0.01)
+        QuarantineManager(str(self.index_file)).quarantine(self.folders[5:], root=self.scan_dir)
+        
+        manager = QuarantineManager(str(self.index_file))
+        assert [batch['folders'] for batch in manager.list_batches()] == [5, 10]
+        
+        restored, _ = manager.restore()
+        assert set(restored) == set(self.folders[5:])
+        
+        restored, _ = QuarantineManager(str(self.index_file)).restore()
+        assert set(restored) == set(self.folders[:5])
+    
+    def test_unavailable_holding_directory(self):
+        """Test that folders whose holding directory cannot be created fail cleanly."""
+        (self.scan_dir / QUARANTINE_DIR_NAME).write_text("not a directory")
+        manager = QuarantineManager(str(self.index_file))
+        quarantined, failed = manager.quarantine(self.folders, root=self.scan_dir)
+        
+        assert quarantined == []
+        assert {folder for folder, _ in failed} == set(self.folders)
+        assert all(folder.exists() for folder in self.folders)
+        assert manager.list_batches() == []
+        assert QuarantineManager(str(self.index_file)).list_batches() == []
+    
+    def test_scanner_quarantine_skips_holding_directory(self):
+        """Test the scanner integration and that scans never enter the holding directory."""
+        scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+        empty_folders = scanner.scan_directory(str(self.scan_dir))
+        
+        quarantined, failed = scanner.quarantine_folders(empty_folders[:5])
+        
+        assert failed == []
+        assert len(quarantined) == 5
+        rescanned = scanner.scan_directory(str(self.scan_dir), scan_hidden=True)
+        assert not any(QUARANTINE_DIR_NAME in folder.parts for folder in rescanned)
+        
+        restored, failed = scanner.restore_quarantine()
+        assert set(restored) == set(quarantined)
+        scanner.cleanup()
+    
+    def test_scanner_without_cache_dir(self):
+        """Test that quarantine needs a cache directory."""
+        scanner = EmptyFolderScanner()
+        
+        with pytest.raises(RuntimeError):
+            scanner.quarantine_folders(self.folders)
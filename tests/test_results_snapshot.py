@@ -0,0 +1,150 @@
+"""
+Tests for the memory-mapped results snapshot.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.results_snapshot import HEADER, ResultsSnapshot, SnapshotWriter
+from core.scan_session import FolderRecord
+
+import pytest
+
+
+class TestResultsSnapshot:
+    """Test cases for SnapshotWriter and ResultsSnapshot."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_snapshot_"))
+        self.snapshot_file = self.test_dir / "results.fpsnap"
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def write_snapshot(self, records, summary=None):
+        writer = SnapshotWriter(str(self.snapshot_file))
+        writer.open()
+        for record in records:
+            writer.write(record)
+        writer.close(summary)
+        return writer
+    
+    def test_round_trip(self):
+        """Test that records and summary come back as written."""
+        records = [
+            FolderRecord(Path(f"/data/folder_{n}/ünïcode"), n % 7, 1_700_000_000_000_000_000 + n, 1000, n)
+            for n in range(10_000)
+        ]
+        records.append(FolderRecord(Path("/data/no metadata"), 2))
+        self.write_snapshot(records, {'total_folders': 20_000, 'empty_folders': len(records)})
+        
+        with ResultsSnapshot(str(self.snapshot_file)) as snapshot:
+            assert len(snapshot) == len(records)
+            assert snapshot[0] == records[0]
+            assert snapshot[-1] == records[-1]
+            assert list(snapshot.records(5000, 5003)) == records[5000:5003]
+            assert list(snapshot) == records
+            assert snapshot.summary['total_folders'] == 20_000
+            with pytest.raises(IndexError):
+                snapshot[len(records)]
+    
+    @pytest.mark.skipif(os.name == 'nt', reason="Windows file names are always valid Unicode")
+    def test_undecodable_names(self):
+        """Test that names which are not valid UTF-8 survive the round trip."""
+        record = FolderRecord(Path(os.fsdecode(b"/data/caf\xe9")), 1)
+        self.write_snapshot([record])
+        
+        with ResultsSnapshot(str(self.snapshot_file)) as snapshot:
+            assert os.fsencode(str(snapshot[0].path)) == b"/data/caf\xe9"
+    
+    def test_rejects_other_files(self):
+        """Test that foreign and truncated files are refused."""
+        self.snapshot_file.write_bytes(b"not a snapshot" * 10)
+        with pytest.raises(ValueError):
+            ResultsSnapshot(str(self.snapshot_file))
+        
+        self.write_snapshot([FolderRecord(Path("/data/a"), 1)] * 100, {'total_folders': 1})
+        data = self.snapshot_file.read_bytes()
+        self.snapshot_file.write_bytes(data[:HEADER.size + 50])
+        with pytest.raises(ValueError):
+            ResultsSnapshot(str(self.snapshot_file))
+    
+    def test_scanner_saves_and_loads_snapshot(self):
+        """Test that a scan leaves a snapshot the next scanner can open."""
+        scan_dir = self.test_dir / "scan"
+        expected = set()
+        for n in range(30):
+            folder = scan_dir / f"parent_{n % 3}" / f"empty_{n}"
+            folder.mkdir(parents=True)
+            expected.add(folder)
+        cache_dir = self.test_dir / "cache"
+        
+        scanner = EmptyFolderScanner(cache_dir=str(cache_dir))
+        scanner.run_session(scanner.create_session(str(scan_dir)))
+        scanner.cleanup()
+        
+        snapshot = EmptyFolderScanner(cache_dir=str(cache_dir)).load_snapshot()
+        try:
+            assert {record.path for record in snapshot} == expected
+            assert all(record.mtime_ns is not None for record in snapshot)
+            assert snapshot.summary['empty_folders'] == len(expected)
+        finally:
+            snapshot.close()
+        assert not list(cache_dir.glob("*.tmp"))
+    
+    def test_incomplete_scans_keep_last_snapshot(self):
+        """Test that failed and budget-limited scans do not replace the snapshot."""
+        scan_dir = self.test_dir / "scan"
+        for n in range(4):
+            (scan_dir / f"parent_{n}" / "empty").mkdir(parents=True)
+        cache_dir = self.test_dir / "cache"
+        scanner = EmptyFolderScanner(cache_dir=str(cache_dir))
+        scanner.run_session(scanner.create_session(str(scan_dir)))
+        
+        with pytest.raises(FileNotFoundError):
+            scanner.run_session(scanner.create_session(str(self.test_dir / "missing")))
+        scanner.run_session(scanner.create_session(str(scan_dir), max_directories=1))
+        scanner.cleanup()
+        
+        snapshot = EmptyFolderScanner(cache_dir=str(cache_dir)).load_snapshot()
+        try:
+            assert len(snapshot) == 4
+        finally:
+            snapshot.close()
+        assert not list(cache_dir.glob("*.tmp"))
+    
+    def test_export_reopened_snapshot(self):
+        """Test that a reopened snapshot can be exported without a new scan."""
+        scan_dir = self.test_dir / "scan"
+        for n in range(5):
+            (scan_dir / f"empty_{n}").mkdir(parents=True)
+        cache_dir = self.test_dir / "cache"
+        scanner = EmptyFolderScanner(cache_dir=str(cache_dir))
+        scanner.run_session(scanner.create_session(str(scan_dir)))
+        scanner.cleanup()
+        output_file = self.test_dir / "export.csv"
+        
+        scanner = EmptyFolderScanner(cache_dir=str(cache_dir))
+        snapshot = scanner.load_snapshot()
+        try:
+            assert scanner.export_results(str(output_file), 'csv', records=snapshot, summary=snapshot.summary)
+        finally:
+            snapshot.close()
+        
+        content = output_file.read_text(encoding='utf-8')
+        assert len(content.splitlines()) == 6
+        assert all(str(scan_dir / f"empty_{n}") in content for n in range(5))
+    
+    def test_no_snapshot_without_cache(self):
+        """Test that nothing is loaded when there is nothing to load."""
+        assert EmptyFolderScanner().load_snapshot() is None
+        assert EmptyFolderScanner(cache_dir=str(self.test_dir)).load_snapshot() is None
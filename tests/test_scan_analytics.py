@@ -0,0 +1,101 @@
+"""
+Tests for the NumPy/pandas analytics over scan results.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.scan_analytics import age_histogram, counts_by_depth, owner_rollup, top_parents
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+DAY = 86_400
+
+
+class TestScanAnalytics:
+    """Test cases for EmptyFolderScanner.to_numpy/to_dataframe and the reports."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_analytics_"))
+        self.now = time.time()
+        # parent_0 holds 30 empty folders, parent_1 20 and parent_2 10
+        for parent, children in enumerate((30, 20, 10)):
+            for child in range(children):
+                folder = self.test_dir / f"parent_{parent}" / f"empty_{child}"
+                folder.mkdir(parents=True)
+                age = (0.5, 10, 400)[parent] * DAY
+                os.utime(folder, (self.now - age, self.now - age))
+        (self.test_dir / "parent_2" / "deep" / "deeper").mkdir(parents=True)
+        
+        self.scanner = EmptyFolderScanner()
+        self.scanner.scan_directory(str(self.test_dir))
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        self.scanner.cleanup()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_to_numpy(self):
+        """Test that the arrays line up with the results."""
+        columns = self.scanner.to_numpy(include_paths=True)
+        
+        assert len(columns['depth']) == 61
+        assert columns['mtime'].dtype == np.dtype('datetime64[ns]')
+        index = list(columns['path']).index(str(self.test_dir / "parent_1" / "empty_3"))
+        stat_result = (self.test_dir / "parent_1" / "empty_3").stat()
+        assert columns['mtime'][index].astype(np.int64) == stat_result.st_mtime_ns
+        assert columns['inode'][index] == stat_result.st_ino
+        assert columns['parents'][columns['parent_id'][index]] == str(self.test_dir / "parent_1")
+        assert 'path' not in self.scanner.to_numpy()
+    
+    def test_reports(self):
+        """Test depth counts, top parents, age buckets and owner rollup."""
+        columns = self.scanner.to_numpy()
+        
+        assert counts_by_depth(columns) == {2: 60, 3: 1}
+        assert top_parents(columns, k=2) == [
+            (str(self.test_dir / "parent_0"), 30),
+            (str(self.test_dir / "parent_1"), 20)
+        ]
+        histogram = dict(age_histogram(columns, now=self.now))
+        # parent_0's folders and the freshly created parent_2/deep/deeper
+        assert histogram['< 1d'] == 31
+        assert histogram['7d - 30d'] == 20
+        assert histogram['1y - 3y'] == 10
+        assert sum(histogram.values()) == 61
+        
+        rollup = owner_rollup(columns)
+        assert rollup[0]['uid'] == os.stat(self.test_dir).st_uid
+        assert sum(row['count'] for row in rollup) == 61
+    
+    def test_empty_results(self):
+        """Test that reports over no results are empty, not errors."""
+        columns = EmptyFolderScanner().to_numpy()
+        
+        assert counts_by_depth(columns) == {}
+        assert top_parents(columns) == []
+        assert owner_rollup(columns) == []
+        assert sum(count for _, count in age_histogram(columns)) == 0
+    
+    def test_to_dataframe(self):
+        """Test the DataFrame columns and their types."""
+        pytest.importorskip("pandas")
+        frame = self.scanner.to_dataframe()
+        
+        assert len(frame) == 61
+        assert str(frame['parent'].dtype) == 'category'
+        assert frame['parent'].value_counts().iloc[0] == 30
+        assert frame.groupby('depth').size().to_dict() == {2: 60, 3: 1}
+        assert frame['owner'].notna().all()
+        assert set(frame['path']) == {str(path) for path in self.scanner.empty_folders}
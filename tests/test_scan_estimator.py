@@ -0,0 +1,64 @@
+"""
+Tests for the sampling scan estimator.
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.scan_estimator import ScanEstimator
+
+
+class TestScanEstimator:
+    """Test cases for ScanEstimator."""
+    
+    def setup_method(self):
+        """Create a regular tree: 6 x 5 x 4 directories, leaves empty."""
+        self.scanner = EmptyFolderScanner()
+        self.root = Path(tempfile.mkdtemp(prefix="folderpulse_estimate_"))
+        for a in range(6):
+            for b in range(5):
+                for c in range(4):
+                    (self.root / f"a{a}" / f"b{b}" / f"c{c}").mkdir(parents=True)
+        # 1 + 6 + 30 + 120 directories, 120 of them empty
+        self.total = 157
+        self.empty = 120
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def test_small_tree_is_counted_exactly(self):
+        """Trees that fit the exact levels need no sampling."""
+        estimate = self.scanner.estimate_directory(str(self.root), time_budget=1.0)
+        
+        assert estimate['exact'] is True
+        assert estimate['estimated_total_folders'] == self.total
+        assert estimate['estimated_empty_folders'] == self.empty
+        assert estimate['total_folders_ci'] == (self.total, self.total)
+    
+    def test_sampled_estimate(self):
+        """Random-walk probes estimate a uniform tree without error."""
+        estimator = ScanEstimator(self.scanner, max_exact_depth=0, seed=42)
+        estimate = estimator.estimate(str(self.root), time_budget=5.0, max_probes=50)
+        
+        assert estimate['exact'] is False
+        assert estimate['probes'] == 50
+        # Every probe of a perfectly regular tree returns the true counts
+        assert round(estimate['estimated_total_folders']) == self.total
+        assert round(estimate['estimated_empty_folders']) == self.empty
+        low, high = estimate['empty_folders_ci']
+        assert low <= self.empty <= high
+    
+    def test_estimate_respects_time_budget(self):
+        """A zero budget returns immediately with an open interval."""
+        estimator = ScanEstimator(self.scanner, max_exact_depth=0)
+        estimate = estimator.estimate(str(self.root), time_budget=0)
+        
+        assert estimate['probes'] == 0
+        assert estimate['total_folders_ci'][1] == float('inf')
@@ -0,0 +1,135 @@
+"""
+Tests for the scan planner and the threaded scan engine.
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.scan_planner import ScanPlanner, ScanHistory
+from utils.system_info import available_cpus, unescape_mount_point
+
+
+class TestScanPlanner:
+    """Test cases for ScanPlanner and ScanHistory."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.test_dir = Path(tempfile.mkdtemp(prefix="folderpulse_planner_"))
+        self.history = ScanHistory(str(self.test_dir / "history.json"))
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def test_plan_has_reasons(self):
+        """Every plan explains itself."""
+        plan = ScanPlanner().plan(str(self.test_dir))
+        
+        assert plan.engine in ('serial', 'threads')
+        assert plan.workers >= 1
+        assert plan.reasons
+    
+    def test_small_tree_from_history_is_serial(self):
+        """A root known to be small is scanned serially."""
+        self.history.record(str(self.test_dir), {'total_folders': 10, 'coverage': 1.0})
+        plan = ScanPlanner(self.history).plan(str(self.test_dir))
+        
+        assert plan.engine == 'serial'
+        assert any("previous scan saw 10 folders" in reason for reason in plan.reasons)
+    
+    def test_measured_throughput_wins(self):
+        """History of both engines overrides the heuristics."""
+        root = str(self.test_dir)
+        self.history.record(root, {'engine': 'serial', 'directories_visited': 100, 'scan_time': 1.0})
+        self.history.record(root, {'engine': 'threads', 'directories_visited': 900, 'scan_time': 1.0})
+        
+        plan = ScanPlanner(self.history).plan(root)
+        assert plan.engine == 'threads'
+        assert plan.workers >= 2
+    
+    def test_history_persists(self):
+        """History survives reloading from disk."""
+        self.history.record("/data", {'total_folders': 5, 'coverage': 1.0})
+        reloaded = ScanHistory(str(self.test_dir / "history.json"))
+        
+        assert reloaded.get("/data")['total_folders'] == 5
+    
+    def test_available_cpus(self):
+        """CPU detection always yields a usable count."""
+        assert available_cpus() >= 1
+    
+    def test_unescape_mount_point(self):
+        """Octal escapes are decoded and non-ASCII names kept intact."""
+        assert unescape_mount_point("/mnt/données\\040backup") == "/mnt/données backup"
+        assert unescape_mount_point("/mnt/a\\134b\\011c") == "/mnt/a\\b\tc"
+
+
+class TestScanEngines:
+    """Test cases for serial, threaded and planned scans."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.root = Path(tempfile.mkdtemp(prefix="folderpulse_engine_"))
+        for a in range(5):
+            for b in range(5):
+                (self.root / f"a{a}" / f"b{b}").mkdir(parents=True)
+            (self.root / f"a{a}" / "file.txt").write_text("content")
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="folderpulse_cache_"))
+        self.scanner = EmptyFolderScanner(cache_dir=str(self.cache_dir))
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        self.scanner.cleanup()
+        shutil.rmtree(self.root, ignore_errors=True)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def test_threads_match_serial(self):
+        """The threaded engine finds exactly what the serial engine finds."""
+        serial = self.scanner.scan_directory(str(self.root), engine='serial')
+        serial_summary = self.scanner.get_scan_summary()
+        threaded = self.scanner.scan_directory(str(self.root), engine='threads', workers=4)
+        threaded_summary = self.scanner.get_scan_summary()
+        
+        assert sorted(serial) == sorted(threaded)
+        assert len(threaded) == 25
+        assert threaded_summary['total_folders'] == serial_summary['total_folders']
+        assert threaded_summary['engine'] == 'threads'
+        assert threaded_summary['workers'] == 4
+    
+    def test_threads_respect_directory_budget(self):
+        """Budgets still hold exactly with parallel listings."""
+        self.scanner.scan_directory(str(self.root), engine='threads', workers=4, max_directories=7)
+        summary = self.scanner.get_scan_summary()
+        
+        assert summary['directories_visited'] == 7
+        assert summary['budget_exhausted'] == 'directories'
+    
+    def test_auto_engine_records_plan_and_history(self):
+        """Planned scans report their plan and feed the history."""
+        self.scanner.scan_directory(str(self.root), engine='auto')
+        summary = self.scanner.get_scan_summary()
+        
+        assert summary['plan']['engine'] == summary['engine']
+        assert summary['plan']['reasons']
+        assert self.scanner.planner.history.get(str(self.root))['total_folders'] == 31
+    
+    def test_partial_scan_modes_do_not_feed_history(self):
+        """Single-level, count-only and top-K scans leave the history alone."""
+        self.scanner.scan_directory(str(self.root), include_subdirectories=False)
+        self.scanner.census_directories([str(self.root)])
+        self.scanner.scan_directory(str(self.root), top_k=1)
+        
+        assert self.scanner.planner.history.get(str(self.root)) is None
+    
+    def test_invalid_engine(self):
+        """Unknown engines are rejected."""
+        with pytest.raises(ValueError):
+            self.scanner.create_session(str(self.root), engine='processes')
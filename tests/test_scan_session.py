@@ -0,0 +1,340 @@
+"""
+Tests for independent scan sessions.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.folder_scanner import EmptyFolderScanner
+from core.scan_session import ScanSession
+
+
+def make_tree(empty_count: int, full_count: int) -> Path:
+    """Create a temporary tree with a known number of empty folders."""
+    root = Path(tempfile.mkdtemp(prefix="folderpulse_session_"))
+    for i in range(empty_count):
+        (root / f"empty_{i}").mkdir()
+    for i in range(full_count):
+        folder = root / f"full_{i}"
+        folder.mkdir()
+        (folder / "file.txt").write_text("content")
+    return root
+
+
+class TestScanSession:
+    """Test cases for ScanSession."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.scanner = EmptyFolderScanner()
+        self.roots = []
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        for root in self.roots:
+            shutil.rmtree(root, ignore_errors=True)
+    
+    def test_counters_reset_between_scans(self):
+        """Repeated scans must not accumulate total_folders."""
+        root = make_tree(2, 1)
+        self.roots.append(root)
+        
+        self.scanner.scan_directory(str(root))
+        first = self.scanner.get_scan_summary()
+        self.scanner.scan_directory(str(root))
+        second = self.scanner.get_scan_summary()
+        
+        assert first['total_folders'] == second['total_folders'] == 4
+        assert second['status'] == ScanSession.COMPLETED
+    
+    def test_concurrent_sessions_are_independent(self):
+        """Sessions running in parallel keep their own results."""
+        roots = [make_tree(n, 2) for n in (1, 3, 5, 7)]
+        self.roots.extend(roots)
+        sessions = [self.scanner.create_session(str(root)) for root in roots]
+        
+        threads = [threading.Thread(target=self.scanner.run_session, args=(s,)) for s in sessions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for session, expected in zip(sessions, (1, 3, 5, 7)):
+            assert session.status == ScanSession.COMPLETED
+            assert len(session.empty_folders) == expected
+            assert session.get_summary()['total_folders'] == expected + 3
+            assert all(f.parent == Path(session.root_path) for f in session.empty_folders)
+    
+    def test_session_runs_once(self):
+        """A session cannot be reused for a second scan."""
+        root = make_tree(1, 0)
+        self.roots.append(root)
+        session = self.scanner.create_session(str(root))
+        session.run()
+        
+        assert session.is_finished()
+        with pytest.raises(RuntimeError):
+            session.run()
+    
+    def test_failed_session(self):
+        """Scanning a missing directory marks the session failed."""
+        session = self.scanner.create_session("/nonexistent/folderpulse/path")
+        
+        with pytest.raises(FileNotFoundError):
+            session.run()
+        assert session.status == ScanSession.FAILED
+        assert self.scanner.last_session is None
+    
+    def test_cancelled_session(self):
+        """A cancelled session stops and reports its state."""
+        root = make_tree(3, 0)
+        self.roots.append(root)
+        session = self.scanner.create_session(str(root))
+        session.cancel()
+        
+        assert self.scanner.run_session(session) == []
+        assert session.status == ScanSession.CANCELLED
+    
+    
+    def test_ignored_directories_are_pruned(self):
+        """Folders below an ignored directory are not scanned."""
+        root = make_tree(1, 0)
+        self.roots.append(root)
+        (root / "node_modules" / "pkg" / "empty").mkdir(parents=True)
+        
+        results = self.scanner.scan_directory(str(root))
+        
+        assert [f.name for f in results] == ["empty_0"]
+        assert self.scanner.get_scan_summary()['total_folders'] == 2
+
+
+class TestScanBudgets:
+    """Test cases for scan resource guardrails."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.scanner = EmptyFolderScanner()
+        self.root = make_tree(20, 5)
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def test_unlimited_scan_reports_full_coverage(self):
+        """Without budgets the scan covers the whole tree."""
+        self.scanner.scan_directory(str(self.root))
+        summary = self.scanner.get_scan_summary()
+        
+        assert summary['budget_exhausted'] is None
+        assert summary['coverage'] == 1.0
+        assert summary['directories_pending'] == 0
+    
+    def test_directory_budget(self):
+        """The directory budget stops the scan with consistent partial results."""
+        results = self.scanner.scan_directory(str(self.root), max_directories=10)
+        summary = self.scanner.get_scan_summary()
+        
+        assert summary['budget_exhausted'] == 'directories'
+        assert summary['directories_visited'] == 10
+        assert summary['total_folders'] == 10
+        assert summary['empty_folders'] == len(results) < 20
+        assert summary['directories_pending'] == 26 - 10
+        assert 0 < summary['coverage'] < 1
+    
+    def test_time_budget(self):
+        """An exhausted time budget stops before scanning anything."""
+        results = self.scanner.scan_directory(str(self.root), max_scan_time=0)
+        summary = self.scanner.get_scan_summary()
+        
+        assert results == []
+        assert summary['budget_exhausted'] == 'time'
+        assert summary['coverage'] == 0.0
+    
+    @pytest.mark.skipif(not Path("/proc/self/statm").exists(), reason="needs /proc RSS")
+    def test_memory_budget(self):
+        """A memory ceiling below the current RSS stops the scan."""
+        self.scanner.scan_directory(str(self.root), max_memory_mb=1)
+        
+        assert self.scanner.get_scan_summary()['budget_exhausted'] == 'memory'
+
+
+class TestTraversalOrder:
+    """Test cases for traversal orders and result streaming."""
+    
+    def setup_method(self):
+        """Create a deep branch next to a shallow empty folder."""
+        self.scanner = EmptyFolderScanner()
+        self.root = Path(tempfile.mkdtemp(prefix="folderpulse_order_"))
+        deep = self.root / "a_deep"
+        for level in range(6):
+            deep = deep / f"level_{level}"
+        deep.mkdir(parents=True)
+        (self.root / "a_deep" / "marker.txt").write_text("content")
+        (self.root / "z_shallow").mkdir()
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def scan_names(self, order: str, **options) -> list:
+        """Scan and return result names in discovery order."""
+        results = self.scanner.scan_directory(str(self.root), traversal_order=order, **options)
+        return [f.name for f in results]
+    
+    @pytest.mark.parametrize("order", ["breadth_first", "priority"])
+    def test_shallow_results_first(self, order):
+        """Shallow-first orders report the top-level empty folder first."""
+        for index in range(3):
+            (self.root / f"b_deep_{index}" / "x" / "y").mkdir(parents=True)
+        
+        session = self.scanner.create_session(str(self.root), traversal_order=order)
+        depths = []
+        session.add_result_listener(lambda record: depths.append(record.depth))
+        self.scanner.run_session(session)
+        
+        assert depths == [1, 3, 3, 3, 7]
+    
+    @pytest.mark.parametrize("order", ["depth_first", "breadth_first", "priority"])
+    def test_orders_find_same_results(self, order):
+        """Every order finds the same folders, even with a tiny frontier."""
+        assert sorted(self.scan_names(order, max_frontier=1)) == ["level_5", "z_shallow"]
+        assert self.scanner.get_scan_summary()['total_folders'] == 9
+    
+    def test_invalid_order(self):
+        """Unknown traversal orders are rejected."""
+        with pytest.raises(ValueError):
+            self.scanner.create_session(str(self.root), traversal_order="random")
+    
+    def test_result_listener_and_first_result_time(self):
+        """Listeners receive each result with its depth as it is found."""
+        session = self.scanner.create_session(str(self.root), traversal_order="breadth_first")
+        received = []
+        session.add_result_listener(received.append)
+        self.scanner.run_session(session)
+        
+        assert [(r.path.name, r.depth) for r in received] == [("z_shallow", 1), ("level_5", 7)]
+        assert session.get_summary()['time_to_first_result'] is not None
+
+
+class TestCensusMode:
+    """Test cases for count-only scans."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.scanner = EmptyFolderScanner()
+        self.root = make_tree(3, 2)
+        (self.root / ".hidden" / "inner").mkdir(parents=True)
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def test_census_matches_full_scan_without_paths(self):
+        """Census counters equal those of a full scan, but no paths are kept."""
+        self.scanner.scan_directory(str(self.root))
+        full = self.scanner.get_scan_summary()
+        
+        session = self.scanner.create_session(str(self.root), count_only=True)
+        assert self.scanner.run_session(session) == []
+        census = session.get_summary()
+        
+        for key in ('total_folders', 'empty_folders', 'hidden_folders'):
+            assert census[key] == full[key]
+        assert session.empty_folders == []
+    
+    def test_histograms(self):
+        """Depth and fan-out histograms describe the tree shape."""
+        result = self.scanner.census_directories([str(self.root)])
+        histograms = result[str(self.root)]['census']
+        
+        assert histograms['by_depth'] == {
+            0: {'total': 1, 'empty': 0, 'hidden': 0},
+            1: {'total': 6, 'empty': 3, 'hidden': 1},
+            2: {'total': 1, 'empty': 1, 'hidden': 0},
+        }
+        # Root has 6 subdirectories, .hidden has 1, the rest none
+        assert histograms['by_fanout'] == {'0': 6, '1': 1, '4-7': 1}
+
+
+class TestTopResults:
+    """Test cases for bounded top-K scans."""
+    
+    def setup_method(self):
+        """Set up test environment for each test."""
+        self.scanner = EmptyFolderScanner()
+        self.root = Path(tempfile.mkdtemp(prefix="folderpulse_topk_"))
+        # crowded/ holds 8 empty folders, quiet/ 2, and deep/ one 4 levels down
+        for n in range(8):
+            (self.root / "crowded" / f"empty_{n}").mkdir(parents=True)
+        for n in range(2):
+            (self.root / "quiet" / f"empty_{n}").mkdir(parents=True)
+        (self.root / "deep" / "a" / "b" / "c").mkdir(parents=True)
+        self.ages = {}
+        for age, folder in enumerate(sorted(self.root.glob("*/empty_*")), start=1):
+            os.utime(folder, (1_000_000_000 - age * 3600, 1_000_000_000 - age * 3600))
+            self.ages[folder] = age
+    
+    def teardown_method(self):
+        """Clean up after each test."""
+        shutil.rmtree(self.root, ignore_errors=True)
+    
+    def test_oldest_and_newest(self):
+        """Only the k oldest (or newest) results are kept, in order."""
+        oldest = self.scanner.scan_directory(str(self.root), top_k=3, top_k_by='oldest')
+        summary = self.scanner.get_scan_summary()
+        
+        by_age = sorted(self.ages, key=self.ages.get, reverse=True)
+        assert oldest == by_age[:3]
+        assert summary['empty_folders'] == 11
+        assert summary['top_k'] == 3
+        
+        # deep/a/b/c keeps its current modification time
+        newest = self.scanner.scan_directory(str(self.root), top_k=2, top_k_by='newest')
+        assert newest == [self.root / "deep" / "a" / "b" / "c", by_age[-1]]
+    
+    def test_deepest_and_busiest_parent(self):
+        """Depth and parent size rank results; metadata follows the kept results."""
+        deepest = self.scanner.scan_directory(str(self.root), top_k=1, top_k_by='deepest')
+        assert deepest == [self.root / "deep" / "a" / "b" / "c"]
+        
+        busiest = self.scanner.scan_directory(
+            str(self.root), top_k=8, top_k_by='busiest_parent', traversal_order='breadth_first'
+        )
+        assert {folder.parent for folder in busiest} == {self.root / "crowded"}
+        records = list(self.scanner.iter_results())
+        assert [record.path for record in records] == busiest
+        assert all(record.mtime_ns is not None for record in records)
+    
+    def test_listeners_receive_only_kept_results(self):
+        """Streamed results are the kept ones, delivered when the scan ends."""
+        session = self.scanner.create_session(str(self.root), top_k=4, top_k_by='oldest')
+        streamed = []
+        session.add_result_listener(lambda record: streamed.append(record.path))
+        
+        results = self.scanner.run_session(session)
+        
+        assert streamed == results
+        assert len(results) == 4
+    
+    def test_no_cascade_index(self):
+        """Top-K scans keep no per-directory cascade bookkeeping."""
+        session = self.scanner.create_session(str(self.root), top_k=2, track_cascade=True)
+        self.scanner.run_session(session)
+        
+        assert session.cascade_index is None
+        assert self.scanner.create_session(str(self.root), track_cascade=True).cascade_index == {}
+    
+    def test_invalid_options(self):
+        """Unknown keys, k < 1 and count-only scans are rejected."""
+        for options in ({'top_k': 5, 'top_k_by': 'largest'}, {'top_k': 0}, {'top_k': 5, 'count_only': True}):
+            with pytest.raises(ValueError):
+                self.scanner.create_session(str(self.root), **options)